@@ -0,0 +1,200 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import FastAPI, HTTPException, Path, Response, status
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from talent_match.api.jobs import CapacityExceeded, EvaluationJobs
+from talent_match.api.schemas import (
+    BulkEvaluationRequest,
+    BulkEvaluationResponse,
+    EvaluationRequest,
+    EvaluationStatus,
+    ScreenedOutItem,
+)
+from talent_match.config.settings import get_settings
+from talent_match.services.client_registry import get_client_registry
+from talent_match.services.log_writer import get_log_writer
+from talent_match.services.metrics import get_metrics
+from talent_match.services.openai_service import OpenAIService
+from talent_match.services.screening_index import ScreeningIndex, load_synonyms
+
+settings = get_settings()
+
+# Session ids as generated by CVLoggingService.start_session
+SESSION_ID_PATTERN = r"^\d{8}_\d{6}_[0-9a-f]{8}$"
+
+
+def _too_busy(error: CapacityExceeded) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=str(error),
+        headers={"Retry-After": "5"}
+    )
+
+
+def _screen_items(request: BulkEvaluationRequest):
+    """Items of a bulk request that pass screening, and the ones that don't"""
+    options = request.screening
+    synonyms = load_synonyms() if options.synonyms else None
+    index, cv_ids = ScreeningIndex(), {}
+    for item in request.items:
+        if item.cv_text not in cv_ids:
+            cv_ids[item.cv_text] = str(len(cv_ids))
+            index.add(cv_ids[item.cv_text], item.cv_text)
+
+    scores, shortlists = {}, {}
+    for job_title in {item.job_title for item in request.items}:
+        # Only the CVs submitted for this job title compete for its shortlist
+        ranked = index.search(job_title, synonyms=synonyms, candidates={
+            cv_ids[item.cv_text] for item in request.items if item.job_title == job_title
+        })
+        scores[job_title] = dict(ranked)
+        shortlists[job_title] = {
+            cv_id for cv_id, score in ranked[:options.top_k]
+            if options.min_score is None or score >= options.min_score
+        }
+
+    kept, screened_out = [], []
+    for position, item in enumerate(request.items):
+        cv_id = cv_ids[item.cv_text]
+        if cv_id in shortlists[item.job_title]:
+            kept.append(item)
+        else:
+            screened_out.append(ScreenedOutItem(
+                index=position,
+                job_title=item.job_title,
+                score=scores[item.job_title].get(cv_id, 0.0)
+            ))
+    return kept, screened_out
+
+
+def create_app(service: Optional[OpenAIService] = None) -> FastAPI:
+    """
+    Build the evaluation API
+
+    Args:
+        service: Service used for the analyses (default: one built from settings)
+
+    Returns:
+        ASGI application; run several workers behind a load balancer
+        sharing the log directory, e.g.
+        `uvicorn talent_match.api.app:app --workers 4`
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        app.state.jobs = EvaluationJobs(service)
+        yield
+        await app.state.jobs.close()
+        if settings.LOG_ASYNC_WRITES:
+            await asyncio.to_thread(get_log_writer().flush)
+        await get_client_registry().aclose_loop_clients()
+
+    app = FastAPI(title=f"{settings.APP_NAME} API", lifespan=lifespan)
+
+    @app.post(
+        "/evaluations",
+        response_model=EvaluationStatus,
+        responses={202: {"model": EvaluationStatus}}
+    )
+    async def create_evaluation(request: EvaluationRequest, response: Response):
+        """
+        Evaluate a CV. In sync mode the evaluation is returned when it
+        finishes within API_SYNC_TIMEOUT; otherwise (or in async mode) a 202
+        with the id to poll is returned.
+        """
+        jobs: EvaluationJobs = app.state.jobs
+        try:
+            session_id = await jobs.submit(request)
+        except CapacityExceeded as e:
+            raise _too_busy(e)
+
+        response.headers["Location"] = f"/evaluations/{session_id}"
+        if request.mode == "sync" and await jobs.wait(session_id, settings.API_SYNC_TIMEOUT):
+            result = await jobs.status(session_id)
+            if result.status == "failed":
+                return JSONResponse(
+                    status_code=status.HTTP_502_BAD_GATEWAY,
+                    content=result.model_dump(mode="json"),
+                    headers={"Location": response.headers["Location"]}
+                )
+            return result
+
+        response.status_code = status.HTTP_202_ACCEPTED
+        return await jobs.status(session_id)
+
+    @app.post(
+        "/evaluations/bulk",
+        response_model=BulkEvaluationResponse,
+        status_code=status.HTTP_202_ACCEPTED
+    )
+    async def create_evaluations(request: BulkEvaluationRequest):
+        """
+        Start several evaluations; all are admitted or none is. With
+        screening, only the items whose CV ranks in the BM25 shortlist of
+        its job title (among the CVs of the request) are evaluated.
+        """
+        jobs: EvaluationJobs = app.state.jobs
+        items, screened_out = request.items, []
+        if request.screening is not None:
+            items, screened_out = await asyncio.to_thread(_screen_items, request)
+        try:
+            session_ids = await jobs.submit_many(items) if items else []
+        except CapacityExceeded as e:
+            raise _too_busy(e)
+        return BulkEvaluationResponse(
+            evaluations=await asyncio.gather(
+                *(jobs.status(session_id) for session_id in session_ids)),
+            screened_out=screened_out
+        )
+
+    @app.get("/evaluations/{evaluation_id}", response_model=EvaluationStatus)
+    async def get_evaluation(evaluation_id: str = Path(pattern=SESSION_ID_PATTERN)):
+        try:
+            return await app.state.jobs.status(evaluation_id)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Evaluation {evaluation_id} not found"
+            )
+
+    @app.get("/health")
+    async def health():
+        """Liveness: the process is serving requests"""
+        return {"status": "ok"}
+
+    @app.get("/ready")
+    async def ready():
+        """Readiness: the worker can take more evaluations"""
+        jobs: EvaluationJobs = app.state.jobs
+        checks = {
+            "api_key": bool(jobs.service.api_key),
+            "log_dir": os.access(jobs.logging_service.base_log_dir, os.W_OK),
+            "capacity": jobs.has_capacity(),
+        }
+        content = {
+            "status": "ready" if all(checks.values()) else "unavailable",
+            "checks": checks,
+            "running": jobs.running,
+            "admitted": jobs.admitted,
+            "max_pending": jobs.max_pending,
+        }
+        return JSONResponse(
+            status_code=status.HTTP_200_OK if all(checks.values())
+            else status.HTTP_503_SERVICE_UNAVAILABLE,
+            content=content
+        )
+
+    @app.get("/metrics")
+    async def metrics():
+        """Prometheus scrape endpoint (metrics of this worker)"""
+        return PlainTextResponse(
+            get_metrics().render(), media_type="text/plain; version=0.0.4")
+
+    return app
+
+
+app = create_app()
@@ -0,0 +1,160 @@
+import asyncio
+from typing import Dict, List, Optional
+
+from talent_match.api.schemas import EvaluationInput, EvaluationStatus
+from talent_match.config.settings import get_settings
+from talent_match.models.evaluation import CompleteEvaluation
+from talent_match.services.logging_service import CVLoggingService
+from talent_match.services.openai_service import OpenAIService
+
+settings = get_settings()
+
+
+class CapacityExceeded(Exception):
+    """Raised when a worker cannot admit more evaluations"""
+
+
+class EvaluationJobs:
+    """
+    Runs the evaluations of one API worker.
+
+    Every evaluation is a logging session, so its id is the session_id and
+    any worker sharing the log directory can report its state. At most
+    `max_concurrent` analyses run at once; up to `max_pending` may be
+    admitted (running or waiting), beyond that submissions are rejected so
+    the load balancer can send them elsewhere.
+    """
+
+    def __init__(self,
+                 service: Optional[OpenAIService] = None,
+                 max_concurrent: int = settings.API_MAX_CONCURRENT_EVALUATIONS,
+                 max_pending: int = settings.API_MAX_PENDING_EVALUATIONS):
+        self.service = service or OpenAIService()
+        self.logging_service: CVLoggingService = self.service.logging_service
+        self.max_pending = max_pending
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._running: set = set()
+        self._admitted = 0
+        self._closing = False
+
+    @property
+    def admitted(self) -> int:
+        """Evaluations running or waiting for a slot"""
+        return self._admitted
+
+    @property
+    def running(self) -> int:
+        return len(self._running)
+
+    def has_capacity(self, count: int = 1) -> bool:
+        return not self._closing and self._admitted + count <= self.max_pending
+
+    async def submit_many(self, items: List[EvaluationInput]) -> List[str]:
+        """
+        Start evaluations in the background
+
+        Args:
+            items: CVs and job titles to evaluate
+
+        Returns:
+            The evaluation ids, in the order of the items
+
+        Raises:
+            CapacityExceeded: if the worker cannot admit every item
+        """
+        if not self.has_capacity(len(items)):
+            raise CapacityExceeded(
+                f"{self._admitted} evaluations in progress, limit is {self.max_pending}")
+        # Reserve the slots before awaiting so concurrent requests can't overshoot
+        self._admitted += len(items)
+        started = 0
+        try:
+            ids = []
+            for item in items:
+                session_id = await asyncio.to_thread(
+                    self.logging_service.start_session, item.job_title, item.cv_text)
+                task = asyncio.create_task(self._run(session_id, item))
+                self._tasks[session_id] = task
+                task.add_done_callback(
+                    lambda _, session_id=session_id: self._tasks.pop(session_id, None))
+                started += 1
+                ids.append(session_id)
+            return ids
+        finally:
+            # Slots of items that never started are released here; the
+            # others are released when their task ends
+            self._admitted -= len(items) - started
+
+    async def submit(self, item: EvaluationInput) -> str:
+        return (await self.submit_many([item]))[0]
+
+    async def wait(self, session_id: str, timeout: float) -> bool:
+        """
+        Wait for a local evaluation to finish
+
+        Returns:
+            False if it was still running after `timeout` seconds
+        """
+        task = self._tasks.get(session_id)
+        if task is None:
+            return True
+        done, _ = await asyncio.wait({task}, timeout=timeout)
+        return bool(done)
+
+    async def _run(self, session_id: str,
+                   item: EvaluationInput) -> Optional[CompleteEvaluation]:
+        # Failures are reported through the session log, not the task
+        try:
+            async with self._semaphore:
+                self._running.add(session_id)
+                try:
+                    return await self.service.analyze_cv(
+                        item.cv_text,
+                        item.job_title,
+                        extraction_mode=item.extraction_mode,
+                        started_session_id=session_id
+                    )
+                finally:
+                    self._running.discard(session_id)
+        except Exception as e:
+            await asyncio.to_thread(
+                self.logging_service.log_error, str(e), session_id=session_id)
+            return None
+        finally:
+            self._admitted -= 1
+
+    async def status(self, session_id: str) -> EvaluationStatus:
+        """
+        Current state of an evaluation
+
+        Raises:
+            ValueError: if no session exists with this id
+        """
+        task = self._tasks.get(session_id)
+        if task is not None and not task.done():
+            # Still in this worker: avoid reading the logs
+            return EvaluationStatus(
+                id=session_id,
+                status="running" if session_id in self._running else "pending"
+            )
+
+        state = await asyncio.to_thread(
+            self.logging_service.load_session_status, session_id)
+        error = state.get("error")
+        return EvaluationStatus(
+            id=session_id,
+            status=state["status"],
+            job_title=state["job_title"],
+            created_at=state["timestamp"],
+            evaluation=state.get("final_evaluation"),
+            error=error.get("error") if error else None
+        )
+
+    async def close(self):
+        """Stop admitting evaluations and cancel the ones in progress"""
+        self._closing = True
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
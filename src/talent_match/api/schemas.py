@@ -0,0 +1,57 @@
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from talent_match.config.settings import get_settings
+from talent_match.models.evaluation import CompleteEvaluation
+
+settings = get_settings()
+
+EvaluationState = Literal["pending", "running", "completed", "failed"]
+
+
+class EvaluationInput(BaseModel):
+    cv_text: str = Field(min_length=1)
+    job_title: str = Field(min_length=1)
+    extraction_mode: Optional[Literal["parallel", "combined"]] = None
+
+
+class EvaluationRequest(EvaluationInput):
+    # "sync" waits for the result (up to API_SYNC_TIMEOUT), "async" returns
+    # the evaluation id right away
+    mode: Literal["sync", "async"] = "sync"
+
+
+class ScreeningOptions(BaseModel):
+    # Only the best top_k CVs per job title and/or those scoring at least
+    # min_score (BM25) are evaluated
+    top_k: Optional[int] = Field(default=None, ge=1)
+    min_score: Optional[float] = Field(default=None, ge=0)
+    synonyms: bool = True
+
+
+class BulkEvaluationRequest(BaseModel):
+    items: List[EvaluationInput] = Field(
+        min_length=1, max_length=settings.API_MAX_BULK_ITEMS)
+    screening: Optional[ScreeningOptions] = None
+
+
+class EvaluationStatus(BaseModel):
+    id: str
+    status: EvaluationState
+    job_title: Optional[str] = None
+    created_at: Optional[str] = None
+    evaluation: Optional[CompleteEvaluation] = None
+    error: Optional[str] = None
+
+
+class ScreenedOutItem(BaseModel):
+    # Position of the item in the request
+    index: int
+    job_title: str
+    score: float
+
+
+class BulkEvaluationResponse(BaseModel):
+    evaluations: List[EvaluationStatus]
+    screened_out: List[ScreenedOutItem] = []
@@ -0,0 +1,337 @@
+import asyncio
+import json
+import platform
+import random
+import statistics
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence
+
+from talent_match.config.settings import get_settings
+from talent_match.fake_llm.client import FakeAsyncOpenAI
+from talent_match.fake_llm.engine import FakeLLMConfig
+from talent_match.fake_llm.payloads import generate_payload
+from talent_match.models.evaluation import CompleteEvaluation
+from talent_match.models.responses import (
+    EducationResponse,
+    ExperienceResponse,
+    SkillsResponse,
+    SummaryResponse,
+)
+from talent_match.services.batch_scoring import CandidateBatch
+from talent_match.services.evaluation_service import EvaluationService
+from talent_match.services.experience_calculator import ExperienceCalculator
+from talent_match.services.log_writer import LogWriter
+from talent_match.services.logging_service import CVLoggingService
+from talent_match.services.openai_service import OpenAIService
+from talent_match.services.rate_limiter import RequestScheduler
+from talent_match.services.result_cache import ResultCache
+from talent_match.services.skills_calculator import SkillsCalculator
+
+settings = get_settings()
+
+GROUPS = ("calculators", "parsing", "logging", "pipeline")
+
+SAMPLE_CV = """
+Jane Doe - Data Scientist
+Experience: 6 years building machine learning models in Python and SQL,
+deploying them with Docker on AWS. Led a team of 4 analysts.
+Education: MSc in Statistics.
+""".strip()
+
+
+@dataclass
+class BenchmarkResult:
+    """Timings of one benchmark: `times` holds one wall time per repeat"""
+    name: str
+    group: str
+    items: int
+    times: List[float]
+    params: Dict[str, Any] = field(default_factory=dict)
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        median = statistics.median(self.times)
+        return {
+            "name": self.name,
+            "group": self.group,
+            "params": self.params,
+            "items": self.items,
+            "repeat": len(self.times),
+            "seconds": {
+                "min": min(self.times),
+                "median": median,
+                "mean": statistics.fmean(self.times),
+                "max": max(self.times),
+                "stdev": statistics.stdev(self.times) if len(self.times) > 1 else 0.0,
+            },
+            "items_per_second": self.items / median if median > 0 else None,
+            **self.extra,
+        }
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> List[float]:
+    fn()  # warm-up
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return times
+
+
+def _percentile(values: Sequence[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def synthetic_evaluations(count: int, seed: int = 0) -> List[CompleteEvaluation]:
+    """Random but schema-valid evaluations, reproducible for a given seed"""
+    rng = random.Random(seed)
+    evaluations = []
+    for _ in range(count):
+        data = {}
+        for model in (ExperienceResponse, SkillsResponse, EducationResponse, SummaryResponse):
+            data.update(generate_payload(model, rng, explanation_words=12))
+        evaluations.append(CompleteEvaluation.model_validate(data))
+    return evaluations
+
+
+def bench_calculators(sizes: Sequence[int], repeat: int) -> List[BenchmarkResult]:
+    results = []
+    for size in sizes:
+        evaluations = synthetic_evaluations(size, seed=size)
+        evaluation_service = EvaluationService()
+        cases = {
+            "experience_calculator": lambda: [
+                ExperienceCalculator.calculate_experience_score(e.experiences)
+                for e in evaluations
+            ],
+            "skills_calculator": lambda: [
+                SkillsCalculator.calculate_skills_score(e.skills) for e in evaluations
+            ],
+            # Uses each evaluation's cached timeline after the warm-up
+            "final_score": lambda: [
+                evaluation_service.calculate_final_score(e) for e in evaluations
+            ],
+            "batch_kernel": lambda: CandidateBatch.from_evaluations(evaluations).score(),
+        }
+        for name, fn in cases.items():
+            results.append(BenchmarkResult(
+                name=f"{name}[{size}]",
+                group="calculators",
+                items=size,
+                times=_time(fn, repeat),
+                params={"candidates": size},
+            ))
+    return results
+
+
+def bench_parsing(count: int, repeat: int) -> List[BenchmarkResult]:
+    rng = random.Random(1)
+    results = []
+    for model in (ExperienceResponse, SkillsResponse, EducationResponse, SummaryResponse):
+        documents = [json.dumps(generate_payload(model, rng)) for _ in range(count)]
+        results.append(BenchmarkResult(
+            name=f"parse_{model.__name__}",
+            group="parsing",
+            items=count,
+            times=_time(lambda: [model.model_validate_json(d) for d in documents], repeat),
+            params={"documents": count},
+        ))
+    return results
+
+
+def bench_logging(sessions: int, repeat: int, workdir: Path) -> List[BenchmarkResult]:
+    evaluation = synthetic_evaluations(1)[0]
+    responses = {
+        "experience": {"experiences": [e.model_dump() for e in evaluation.experiences]},
+        "skills": {"skills": [s.model_dump() for s in evaluation.skills]},
+        "education": {"education": evaluation.education.model_dump()},
+        "summary": {"summary": evaluation.summary.model_dump()},
+    }
+    final = evaluation.model_dump()
+    # Every write run goes to a fresh directory; load reads the last one
+    state = {"runs": 0, "base_dir": None, "session_ids": []}
+
+    def write(background: bool):
+        state["runs"] += 1
+        # Inline writes, or a writer of our own that is drained before the
+        # run ends, so both cases time the files being stored. The writer is
+        # set after construction: None would fall back to the shared writer
+        # when settings.LOG_ASYNC_WRITES is on
+        writer = LogWriter() if background else None
+        service = CVLoggingService(str(workdir / f"logs_{state['runs']}"), writer=writer)
+        service.writer = writer
+        session_ids = []
+        for _ in range(sessions):
+            session_id = service.start_session("Data Scientist", SAMPLE_CV)
+            for prompt_type, response in responses.items():
+                service.log_prompt_result(
+                    prompt_type, "prompt", response,
+                    messages=[{"role": "user", "content": SAMPLE_CV}],
+                    session_id=session_id)
+            service.log_final_evaluation(final, session_id=session_id)
+            session_ids.append(session_id)
+        if writer is not None:
+            writer.close()
+        state["base_dir"], state["session_ids"] = str(service.base_log_dir), session_ids
+
+    def load():
+        for session_id in state["session_ids"]:
+            CVLoggingService.load_session(session_id, state["base_dir"])
+
+    return [
+        BenchmarkResult(
+            name="log_session_write[sync]", group="logging", items=sessions,
+            times=_time(lambda: write(background=False), repeat),
+            params={"sessions": sessions, "writes": "sync"}),
+        BenchmarkResult(
+            name="log_session_write[async]", group="logging", items=sessions,
+            times=_time(lambda: write(background=True), repeat),
+            params={"sessions": sessions, "writes": "async"}),
+        BenchmarkResult(
+            name="log_session_load", group="logging", items=sessions,
+            times=_time(load, repeat), params={"sessions": sessions}),
+    ]
+
+
+async def _run_pipeline(evaluations: int, concurrency: int, latency: float,
+                        workdir: Path) -> Dict[str, Any]:
+    client = FakeAsyncOpenAI(FakeLLMConfig(latency_median=latency, latency_sigma=0.25, seed=0))
+    service = OpenAIService(
+        client=client,
+        cache=ResultCache(path=str(workdir / f"cache_{concurrency}.sqlite3")),
+        # Generous limits: measure the pipeline, not our own throttling
+        scheduler=RequestScheduler(
+            requests_per_minute=1e9,
+            tokens_per_minute=1e12,
+            max_concurrency=concurrency * 4,
+            initial_concurrency=concurrency * 4
+        )
+    )
+    service.logging_service = CVLoggingService(str(workdir / f"pipeline_{concurrency}"))
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def evaluate(index: int):
+        async with semaphore:
+            started = time.perf_counter()
+            await service.analyze_cv(f"{SAMPLE_CV}\nCandidate #{index}", "Data Scientist")
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(evaluate(i) for i in range(evaluations)))
+    elapsed = time.perf_counter() - started
+    service.cache.close()
+    return {"elapsed": elapsed, "latencies": latencies, "llm": client.llm.stats()}
+
+
+def bench_pipeline(evaluations: int, concurrency_levels: Sequence[int], latency: float,
+                   workdir: Path) -> List[BenchmarkResult]:
+    results = []
+    for concurrency in concurrency_levels:
+        run = asyncio.run(_run_pipeline(evaluations, concurrency, latency, workdir))
+        latencies = run["latencies"]
+        results.append(BenchmarkResult(
+            name=f"analyze_cv[c={concurrency}]",
+            group="pipeline",
+            items=evaluations,
+            times=[run["elapsed"]],
+            params={
+                "evaluations": evaluations,
+                "concurrency": concurrency,
+                "model_latency_median": latency,
+            },
+            extra={
+                "latency": {
+                    "p50": _percentile(latencies, 0.50),
+                    "p95": _percentile(latencies, 0.95),
+                    "p99": _percentile(latencies, 0.99),
+                    "max": max(latencies),
+                },
+                # Sections run in parallel, then the summary: about two
+                # model latencies per evaluation are spent waiting
+                "overhead_p50": _percentile(latencies, 0.50) - 2 * latency,
+                "model": run["llm"],
+            },
+        ))
+    return results
+
+
+def run_suite(groups: Sequence[str] = GROUPS, quick: bool = False) -> Dict[str, Any]:
+    """
+    Run the benchmark suite
+
+    Args:
+        groups: Benchmark groups to run (see GROUPS)
+        quick: Smaller sizes and fewer repeats, for smoke runs
+
+    Returns:
+        JSON-serializable report with environment metadata and results
+    """
+    unknown = set(groups) - set(GROUPS)
+    if unknown:
+        raise ValueError(f"Unknown benchmark groups: {', '.join(sorted(unknown))}")
+
+    repeat = 3 if quick else 7
+    results: List[BenchmarkResult] = []
+    with tempfile.TemporaryDirectory(prefix="talent-match-bench-") as tmp:
+        workdir = Path(tmp)
+        if "calculators" in groups:
+            results += bench_calculators((100, 1000) if quick else (100, 1000, 10000), repeat)
+        if "parsing" in groups:
+            results += bench_parsing(200 if quick else 2000, repeat)
+        if "logging" in groups:
+            results += bench_logging(20 if quick else 200, repeat, workdir)
+        if "pipeline" in groups:
+            results += bench_pipeline(
+                20 if quick else 200, (1, 8) if quick else (1, 8, 32),
+                0.02 if quick else 0.05, workdir)
+
+    try:
+        version = metadata.version("talent-match")
+    except metadata.PackageNotFoundError:
+        version = None
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "version": version,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": quick,
+        },
+        "results": [result.to_dict() for result in results],
+    }
+
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any],
+                    threshold: float = 0.1) -> Dict[str, Any]:
+    """
+    Compare two reports by median time
+
+    Args:
+        baseline: Report of the reference run
+        current: Report of the new run
+        threshold: Relative slowdown above which a benchmark is a regression
+
+    Returns:
+        Dict with one ratio (current / baseline median) per common benchmark
+        and the names of the regressions
+    """
+    before = {r["name"]: r["seconds"]["median"] for r in baseline["results"]}
+    ratios = {
+        r["name"]: r["seconds"]["median"] / before[r["name"]]
+        for r in current["results"]
+        if before.get(r["name"])
+    }
+    return {
+        "threshold": threshold,
+        "ratios": {name: round(ratio, 3) for name, ratio in ratios.items()},
+        "regressions": sorted(name for name, ratio in ratios.items() if ratio > 1 + threshold),
+    }
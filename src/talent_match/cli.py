@@ -0,0 +1,516 @@
+import argparse
+import asyncio
+import json
+from pathlib import Path
+from typing import List, Optional
+
+from talent_match.config.settings import get_settings
+
+settings = get_settings()
+
+
+def _read_job_titles(args) -> List[str]:
+    job_titles = list(args.job_title or [])
+    if args.jobs_file:
+        lines = Path(args.jobs_file).read_text(encoding="utf-8").splitlines()
+        job_titles.extend(line.strip() for line in lines if line.strip())
+    if not job_titles:
+        raise SystemExit("At least one --job-title or --jobs-file is required")
+    return job_titles
+
+
+def _screen_inputs(args, job_titles: List[str]) -> dict:
+    from talent_match.services.batch_service import iter_cv_inputs
+    from talent_match.services.screening_index import ScreeningIndex, load_synonyms
+
+    index = ScreeningIndex.load(args.index) if args.index else ScreeningIndex()
+    cv_ids = set()
+    for item in iter_cv_inputs(args.input):
+        index.add(item.cv_id, item.cv_text)
+        cv_ids.add(item.cv_id)
+    if args.index:
+        index.save(args.index)
+    synonyms = None if args.no_synonyms else load_synonyms()
+    return {
+        job_title: dict(index.search(
+            job_title, args.top_k, args.min_score, synonyms, candidates=cv_ids))
+        for job_title in job_titles
+    }
+
+
+async def _run_batch(args) -> dict:
+    from talent_match.services.batch_service import BatchRunner, iter_cv_inputs
+    from talent_match.services.client_registry import get_client_registry
+    from talent_match.services.openai_service import OpenAIService
+
+    job_titles = _read_job_titles(args)
+    shortlists = None
+    if args.top_k is not None or args.min_score is not None:
+        shortlists = _screen_inputs(args, job_titles)
+    runner = BatchRunner(
+        OpenAIService(api_key=args.api_key, base_url=args.base_url),
+        concurrency=args.concurrency
+    )
+    try:
+        return await runner.run(
+            iter_cv_inputs(args.input),
+            job_titles,
+            args.output,
+            checkpoint_path=args.checkpoint,
+            progress=args.progress,
+            shortlists=shortlists
+        )
+    finally:
+        await get_client_registry().aclose_loop_clients()
+
+
+def _add_screening_arguments(parser):
+    parser.add_argument(
+        "--top-k", type=int, help="Only evaluate the best K CVs per job title (BM25)")
+    parser.add_argument(
+        "--min-score", type=float,
+        help="Only evaluate CVs with at least this BM25 score for the job title")
+    parser.add_argument(
+        "--no-synonyms", action="store_true",
+        help="Do not expand job titles with title/skill synonyms")
+
+
+def _add_batch_parser(subparsers):
+    parser = subparsers.add_parser(
+        "batch",
+        help="Evaluate a directory or JSONL file of CVs headlessly"
+    )
+    parser.add_argument(
+        "input",
+        help="Directory of .txt/.md CVs or JSONL file with id and cv_text")
+    parser.add_argument(
+        "-j", "--job-title", action="append",
+        help="Job title to evaluate against (repeatable)")
+    parser.add_argument(
+        "--jobs-file", help="File with one job title per line")
+    parser.add_argument(
+        "-o", "--output", required=True, help="JSONL file results are appended to")
+    parser.add_argument(
+        "--checkpoint",
+        help="Checkpoint file of completed items (default: <output>.checkpoint)")
+    parser.add_argument(
+        "-c", "--concurrency", type=int, default=settings.BATCH_CONCURRENCY,
+        help="Maximum evaluations in flight")
+    parser.add_argument("--api-key", help="OpenAI API key (default: settings)")
+    parser.add_argument("--base-url", help="OpenAI-compatible base URL")
+    parser.add_argument(
+        "--progress", action="store_true", help="Print progress to stderr")
+    _add_screening_arguments(parser)
+    parser.add_argument(
+        "--index",
+        help="Screening index file to update with the input and rank from "
+             "(default: a throwaway index of the input)")
+    parser.set_defaults(handler=lambda args: asyncio.run(_run_batch(args)))
+
+
+def _run_screen(args) -> dict:
+    from talent_match.services.batch_service import iter_cv_inputs
+    from talent_match.services.screening_index import ScreeningIndex, load_synonyms
+
+    index = ScreeningIndex.load(args.index)
+    result = {"added": 0, "removed": 0}
+    if args.add:
+        for item in iter_cv_inputs(args.add):
+            result["added"] += index.add(item.cv_id, item.cv_text)
+    for cv_id in args.remove or []:
+        result["removed"] += index.remove(cv_id)
+    if result["added"] or result["removed"]:
+        index.save(args.index)
+    result["size"] = len(index)
+
+    synonyms = None if args.no_synonyms else load_synonyms()
+    result["shortlists"] = {
+        job_title: [
+            {"cv_id": cv_id, "score": score}
+            for cv_id, score in index.search(job_title, args.top_k, args.min_score, synonyms)
+        ]
+        for job_title in args.job_title or []
+    }
+    return result
+
+
+def _add_screen_parser(subparsers):
+    parser = subparsers.add_parser(
+        "screen", help="Maintain the BM25 screening index and shortlist CVs for job titles")
+    parser.add_argument(
+        "--index", default=settings.SCREENING_INDEX_PATH, help="Screening index file")
+    parser.add_argument(
+        "--add", help="Directory of .txt/.md CVs or JSONL file to index (by id)")
+    parser.add_argument(
+        "--remove", action="append", help="CV id to drop from the index (repeatable)")
+    parser.add_argument(
+        "-j", "--job-title", action="append", help="Job title to shortlist for (repeatable)")
+    _add_screening_arguments(parser)
+    parser.set_defaults(handler=_run_screen)
+
+
+async def _run_match(args) -> dict:
+    from talent_match.services.batch_service import iter_cv_inputs
+    from talent_match.services.client_registry import get_client_registry
+    from talent_match.services.matching_service import MatchRunner, match_call_stats
+    from talent_match.services.openai_service import OpenAIService
+
+    runner = MatchRunner(
+        OpenAIService(api_key=args.api_key, base_url=args.base_url),
+        concurrency=args.concurrency
+    )
+    try:
+        matrix = await runner.run(
+            iter_cv_inputs(args.input),
+            _read_job_titles(args),
+            summaries=args.summaries,
+            progress=args.progress
+        )
+    finally:
+        await get_client_registry().aclose_loop_clients()
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(matrix.to_dict(include_evaluations=args.evaluations), f,
+                  ensure_ascii=False, indent=2)
+    return {
+        "cvs": len(matrix.cv_ids),
+        "job_titles": len(matrix.job_titles),
+        "failed": sum(1 for row in matrix.scores for score in row if score is None),
+        "calls": match_call_stats(),
+    }
+
+
+def _add_match_parser(subparsers):
+    parser = subparsers.add_parser(
+        "match",
+        help="Score many CVs against many job titles with one extraction per CV"
+    )
+    parser.add_argument(
+        "input",
+        help="Directory of .txt/.md CVs or JSONL file with id and cv_text")
+    parser.add_argument(
+        "-j", "--job-title", action="append",
+        help="Job title to match against (repeatable)")
+    parser.add_argument(
+        "--jobs-file", help="File with one job title per line")
+    parser.add_argument(
+        "-o", "--output", default="matches.json", help="JSON file of the score matrix")
+    parser.add_argument(
+        "--evaluations", action="store_true",
+        help="Include the full evaluations in the output")
+    parser.add_argument(
+        "--summaries", action="store_true", default=None,
+        help="Also generate a summary per match (default: settings)")
+    parser.add_argument(
+        "-c", "--concurrency", type=int, default=settings.BATCH_CONCURRENCY,
+        help="CVs matched concurrently")
+    parser.add_argument("--api-key", help="OpenAI API key (default: settings)")
+    parser.add_argument("--base-url", help="OpenAI-compatible base URL")
+    parser.add_argument(
+        "--progress", action="store_true", help="Print progress to stderr")
+    parser.set_defaults(handler=lambda args: asyncio.run(_run_match(args)))
+
+
+def _run_rescore(args) -> dict:
+    from talent_match.services.rescoring_service import (
+        RescoringService,
+        load_settings_profile,
+    )
+
+    store = None
+    if args.store:
+        from talent_match.services.evaluation_store import get_evaluation_store, store_path
+
+        store = get_evaluation_store(store_path(args.log_dir))
+    report = RescoringService(args.log_dir, store=store).compare(
+        load_settings_profile(args.profile),
+        load_settings_profile(args.baseline)
+    )
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+    return report["summary"]
+
+
+def _add_rescore_parser(subparsers):
+    parser = subparsers.add_parser(
+        "rescore",
+        help="Recompute logged evaluation scores under another settings profile"
+    )
+    parser.add_argument(
+        "profile", help="JSON file of setting overrides or .env-style file")
+    parser.add_argument(
+        "--baseline", help="Profile to compare against (default: active settings)")
+    parser.add_argument(
+        "--log-dir", default="logs/cv_analysis", help="Session log directory")
+    parser.add_argument(
+        "--store", action="store_true",
+        help="Read evaluations from the log directory's evaluation store")
+    parser.add_argument(
+        "-o", "--output", default="rescore_report.json", help="Report file")
+    parser.set_defaults(handler=_run_rescore)
+
+
+def _run_history(args) -> list:
+    from talent_match.services.evaluation_store import get_evaluation_store, store_path
+
+    cv_text = Path(args.cv_file).read_text(encoding="utf-8") if args.cv_file else None
+    return get_evaluation_store(store_path(args.log_dir)).find(
+        job_title=args.job_title,
+        since=args.since,
+        until=args.until,
+        min_score=args.min_score,
+        max_score=args.max_score,
+        cv_text=cv_text,
+        status=args.status,
+        order_by=args.order_by,
+        descending=not args.ascending,
+        limit=args.limit,
+        offset=args.offset
+    )
+
+
+def _add_history_parser(subparsers):
+    parser = subparsers.add_parser(
+        "history", help="Query logged evaluations from the evaluation store")
+    parser.add_argument("-j", "--job-title", help="Job title (case-insensitive)")
+    parser.add_argument("--since", help="Start time (ISO format, inclusive)")
+    parser.add_argument("--until", help="End time (ISO format, exclusive)")
+    parser.add_argument("--min-score", type=float, help="Minimum fit score")
+    parser.add_argument("--max-score", type=float, help="Maximum fit score")
+    parser.add_argument("--cv-file", help="Only evaluations of this CV")
+    parser.add_argument(
+        "--status", choices=("running", "completed", "failed"), help="Session status")
+    parser.add_argument(
+        "--order-by", default="timestamp",
+        choices=("timestamp", "fit_score", "job_title", "session_id"))
+    parser.add_argument("--ascending", action="store_true", help="Ascending order")
+    parser.add_argument("--limit", type=int, default=50, help="Maximum rows")
+    parser.add_argument("--offset", type=int, default=0, help="Rows to skip")
+    parser.add_argument(
+        "--log-dir", default="logs/cv_analysis", help="Session log directory")
+    parser.set_defaults(handler=_run_history)
+
+
+def _run_import_logs(args) -> dict:
+    import sys
+
+    from talent_match.services.evaluation_store import get_evaluation_store, store_path
+
+    store = get_evaluation_store(store_path(args.store_dir or args.log_dir))
+    progress = None
+    if args.progress:
+        def progress(done):
+            print(f"{done} sessions", file=sys.stderr)
+    return store.import_log_dir(args.log_dir, batch_size=args.batch_size, progress=progress)
+
+
+def _add_import_logs_parser(subparsers):
+    parser = subparsers.add_parser(
+        "import-logs", help="Import session log directories into the evaluation store")
+    parser.add_argument(
+        "--log-dir", default="logs/cv_analysis", help="Session log directory to import")
+    parser.add_argument(
+        "--store-dir",
+        help="Log directory whose store receives the sessions (default: --log-dir)")
+    parser.add_argument(
+        "--batch-size", type=int, default=500, help="Sessions per transaction")
+    parser.add_argument(
+        "--progress", action="store_true", help="Print progress to stderr")
+    parser.set_defaults(handler=_run_import_logs)
+
+
+def _run_compact_logs(args) -> dict:
+    from talent_match.services.log_retention import LogMaintenance
+
+    return LogMaintenance(args.log_dir).compact(
+        older_than_days=args.older_than_days,
+        segment_sessions=args.segment_sessions
+    )
+
+
+def _add_compact_logs_parser(subparsers):
+    parser = subparsers.add_parser(
+        "compact-logs", help="Pack old session directories into compressed archive segments")
+    parser.add_argument(
+        "--log-dir", default="logs/cv_analysis", help="Session log directory")
+    parser.add_argument(
+        "--older-than-days", type=float, default=settings.LOG_COMPACT_AFTER_DAYS,
+        help="Only sessions started before this many days ago")
+    parser.add_argument(
+        "--segment-sessions", type=int, default=settings.LOG_ARCHIVE_SEGMENT_SESSIONS,
+        help="Sessions per archive segment")
+    parser.set_defaults(handler=_run_compact_logs)
+
+
+def _run_prune_logs(args) -> dict:
+    from talent_match.services.log_retention import LogMaintenance, RetentionPolicy
+
+    maintenance = LogMaintenance(args.log_dir)
+    report = maintenance.prune(
+        RetentionPolicy(
+            max_age_days=args.max_age_days,
+            max_total_bytes=args.max_bytes,
+            max_sessions_per_job=args.max_per_job
+        ),
+        dry_run=args.dry_run
+    )
+    if args.sweep_blobs and not args.dry_run:
+        report["blobs"] = maintenance.sweep_blobs()
+    return report
+
+
+def _add_prune_logs_parser(subparsers):
+    parser = subparsers.add_parser(
+        "prune-logs", help="Delete logged sessions beyond the retention limits")
+    parser.add_argument(
+        "--log-dir", default="logs/cv_analysis", help="Session log directory")
+    parser.add_argument(
+        "--max-age-days", type=float, default=settings.LOG_RETENTION_MAX_AGE_DAYS,
+        help="Delete sessions older than this")
+    parser.add_argument(
+        "--max-bytes", type=int, default=settings.LOG_RETENTION_MAX_BYTES,
+        help="Delete the oldest sessions beyond this total size")
+    parser.add_argument(
+        "--max-per-job", type=int, default=settings.LOG_RETENTION_MAX_PER_JOB,
+        help="Keep at most this many sessions per job title")
+    parser.add_argument(
+        "--sweep-blobs", action="store_true",
+        help="Also delete blobs no session references anymore")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Only report what would be deleted")
+    parser.set_defaults(handler=_run_prune_logs)
+
+
+def _run_serve(args):
+    import uvicorn
+
+    uvicorn.run(
+        "talent_match.api.app:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers
+    )
+
+
+def _add_serve_parser(subparsers):
+    parser = subparsers.add_parser("serve", help="Run the evaluation HTTP API")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    parser.add_argument("--port", type=int, default=8000, help="Bind port")
+    parser.add_argument(
+        "-w", "--workers", type=int, default=1, help="Number of worker processes")
+    parser.set_defaults(handler=_run_serve)
+
+
+def _run_fake_llm(args):
+    import uvicorn
+
+    from talent_match.fake_llm.engine import FakeLLMConfig
+    from talent_match.fake_llm.server import create_fake_llm_app
+
+    config = FakeLLMConfig(
+        latency_median=args.latency,
+        latency_sigma=args.latency_sigma,
+        latency_per_token=args.latency_per_token,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        max_concurrency=args.max_concurrency,
+        seed=args.seed
+    )
+    uvicorn.run(create_fake_llm_app(config), host=args.host, port=args.port)
+
+
+def _add_fake_llm_parser(subparsers):
+    parser = subparsers.add_parser(
+        "fake-llm",
+        help="Run a local fake chat-completions server for load testing"
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    parser.add_argument("--port", type=int, default=8089, help="Bind port")
+    parser.add_argument(
+        "--latency", type=float, default=0.5, help="Median latency in seconds")
+    parser.add_argument(
+        "--latency-sigma", type=float, default=0.4,
+        help="Log-normal sigma of the latency (0 for a fixed latency)")
+    parser.add_argument(
+        "--latency-per-token", type=float, default=0.0,
+        help="Extra seconds per completion token")
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fraction of 500 responses")
+    parser.add_argument(
+        "--rate-limit-rate", type=float, default=0.0, help="Fraction of 429 responses")
+    parser.add_argument(
+        "--retry-after", type=float, default=1.0, help="Retry-After of 429 responses")
+    parser.add_argument(
+        "--max-concurrency", type=int,
+        help="Requests in flight beyond which 429 is returned")
+    parser.add_argument("--seed", type=int, help="Seed for reproducible runs")
+    parser.set_defaults(handler=_run_fake_llm)
+
+
+def _run_bench(args) -> dict:
+    from talent_match.bench.suite import compare_reports, run_suite
+
+    groups = args.only.split(",") if args.only else None
+    report = run_suite(groups, quick=args.quick) if groups else run_suite(quick=args.quick)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            report["comparison"] = compare_reports(json.load(f), report, args.threshold)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    summary = {
+        r["name"]: {
+            "median_seconds": round(r["seconds"]["median"], 6),
+            "items_per_second": round(r["items_per_second"] or 0, 1),
+        }
+        for r in report["results"]
+    }
+    if "comparison" in report:
+        summary["regressions"] = report["comparison"]["regressions"]
+    return summary
+
+
+def _add_bench_parser(subparsers):
+    parser = subparsers.add_parser(
+        "bench", help="Run the benchmark suite and write a JSON report")
+    parser.add_argument(
+        "-o", "--output", default="bench.json", help="JSON report file")
+    parser.add_argument(
+        "--only", help="Comma-separated groups: calculators,parsing,logging,pipeline")
+    parser.add_argument(
+        "--quick", action="store_true", help="Smaller sizes and fewer repeats")
+    parser.add_argument(
+        "--baseline", help="Previous report to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1,
+        help="Relative slowdown reported as a regression")
+    parser.set_defaults(handler=_run_bench)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="talent-match", description="Talent Match command line tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    _add_batch_parser(subparsers)
+    _add_match_parser(subparsers)
+    _add_screen_parser(subparsers)
+    _add_rescore_parser(subparsers)
+    _add_history_parser(subparsers)
+    _add_import_logs_parser(subparsers)
+    _add_compact_logs_parser(subparsers)
+    _add_prune_logs_parser(subparsers)
+    _add_serve_parser(subparsers)
+    _add_fake_llm_parser(subparsers)
+    _add_bench_parser(subparsers)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None):
+    args = build_parser().parse_args(argv)
+    result = args.handler(args)
+    if result is not None:
+        print(json.dumps(result, ensure_ascii=False, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
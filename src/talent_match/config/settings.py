@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Dict, Optional
 
 from pydantic_settings import BaseSettings
 
@@ -10,6 +11,119 @@ class Settings(BaseSettings):
     OPENAI_MODEL: str = "gpt-4-turbo-preview"
     OPENAI_TEMPERATURE: float = 0.1
     OPENAI_SEED: int = 42
+    OPENAI_BASE_URL: Optional[str] = None
+
+    # Client Pool
+    CLIENT_POOL_MAX_SIZE: int = 16
+    CLIENT_POOL_IDLE_TIMEOUT: float = 600.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+
+    # Result Cache
+    RESULT_CACHE_ENABLED: bool = True
+    RESULT_CACHE_PATH: str = "cache/results.sqlite3"
+    RESULT_CACHE_MEMORY_ITEMS: int = 1024
+    RESULT_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    RESULT_CACHE_TTL_SECONDS: float = 30 * 24 * 3600
+
+    # Rate Limiting and Retries
+    RATE_LIMIT_RPM: int = 500
+    RATE_LIMIT_TPM: int = 200_000
+    RATE_LIMIT_LOW_WATERMARK: float = 0.05
+    MAX_CONCURRENT_REQUESTS: int = 64
+    INITIAL_CONCURRENT_REQUESTS: int = 8
+    EXPECTED_COMPLETION_TOKENS: int = 800
+    REQUEST_TIMEOUT: float = 60.0
+    REQUEST_DEADLINE: float = 180.0
+    MAX_RETRIES: int = 5
+    RETRY_BASE_DELAY: float = 0.5
+    RETRY_MAX_DELAY: float = 20.0
+
+    # Batch
+    BATCH_CONCURRENCY: int = 8
+
+    # Screening: BM25 index that shortlists CVs before any model call
+    SCREENING_INDEX_PATH: str = "cache/screening_index.json.gz"
+    SCREENING_BM25_K1: float = 1.5
+    SCREENING_BM25_B: float = 0.75
+    # JSON file of title/skill synonym groups (default: built-in groups)
+    SCREENING_SYNONYMS_PATH: Optional[str] = None
+    SCREENING_SYNONYM_WEIGHT: float = 0.5
+
+    # Extraction: "parallel" (one call per section) or "combined" (single call)
+    EXTRACTION_MODE: str = "parallel"
+
+    # Multi-job matching: also generate the summary of every CV × job match
+    MATCH_SUMMARIES: bool = False
+
+    # Share one in-flight evaluation between identical concurrent requests
+    COALESCE_EVALUATIONS: bool = True
+
+    # Near-duplicate CVs (MinHash + LSH over word shingles): reuse the sections
+    # of a CV at least DEDUP_THRESHOLD similar, evaluated with the same model,
+    # backend, prompts and scoring within DEDUP_MAX_AGE_DAYS, re-running only
+    # edited sections and the summary; DEDUP_REUSE_EVALUATIONS also reuses the
+    # whole evaluation when no section changed
+    DEDUP_ENABLED: bool = True
+    DEDUP_THRESHOLD: float = 0.9
+    DEDUP_NUM_PERM: int = 128
+    DEDUP_SHINGLE_SIZE: int = 3
+    DEDUP_MAX_AGE_DAYS: int = 30
+    DEDUP_REUSE_EVALUATIONS: bool = False
+
+    # Summary: also send the raw CV, or only the compact analysis digest
+    SUMMARY_INCLUDE_CV: bool = True
+
+    # Section message layout: "instructions_first" (system prompt, then CV) or
+    # "cv_first" (shared CV block first, so provider prompt caching can reuse it)
+    PROMPT_LAYOUT: str = "instructions_first"
+
+    # HTTP API
+    API_MAX_CONCURRENT_EVALUATIONS: int = 16
+    API_MAX_PENDING_EVALUATIONS: int = 256
+    API_MAX_BULK_ITEMS: int = 100
+    API_SYNC_TIMEOUT: float = 120.0
+
+    # Session logs: written by a background thread unless LOG_ASYNC_WRITES is off
+    LOG_ASYNC_WRITES: bool = True
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_BATCH_SIZE: int = 256
+    # fsync: "never", "essential" (session info, final evaluation, error) or "always"
+    LOG_FSYNC: str = "essential"
+    # Non-essential writes when the queue is full: "block", "drop" or "sample"
+    LOG_OVERFLOW: str = "drop"
+    LOG_SAMPLE_RATE: float = 0.1
+
+    # Content-addressed blobs for CV and prompt text in session logs: "auto"
+    # (zstd if the zstandard package is installed, else gzip), "zstd" or "gzip"
+    LOG_BLOBS_ENABLED: bool = True
+    LOG_BLOB_CODEC: str = "auto"
+    LOG_BLOB_MIN_SIZE: int = 512
+
+    # Log retention (limits left unset are not applied) and compaction of old
+    # session directories into archive segments
+    LOG_RETENTION_MAX_AGE_DAYS: Optional[float] = None
+    LOG_RETENTION_MAX_BYTES: Optional[int] = None
+    LOG_RETENTION_MAX_PER_JOB: Optional[int] = None
+    LOG_COMPACT_AFTER_DAYS: float = 7.0
+    LOG_ARCHIVE_SEGMENT_SESSIONS: int = 5000
+
+    # Evaluation store: sessions are also recorded in SQLite for indexed queries,
+    # in this file inside each log directory
+    EVALUATION_STORE_ENABLED: bool = True
+    EVALUATION_STORE_FILENAME: str = "evaluations.sqlite3"
+
+    # Observability
+    TRACE_SESSIONS: bool = False
+    # USD per million tokens; dated snapshots match by prefix
+    MODEL_PRICES: Dict[str, Dict[str, float]] = {
+        "gpt-4-turbo": {"input": 10.0, "output": 30.0},
+        "gpt-4o": {"input": 2.5, "cached_input": 1.25, "output": 10.0},
+        "gpt-4o-mini": {"input": 0.15, "cached_input": 0.075, "output": 0.6},
+        "gpt-4.1": {"input": 2.0, "cached_input": 0.5, "output": 8.0},
+        "gpt-4.1-mini": {"input": 0.4, "cached_input": 0.1, "output": 1.6},
+    }
     
     # App Config
     APP_NAME: str = "Talent Match"
@@ -0,0 +1,87 @@
+import json
+from typing import Any, Dict, List, Optional, Type
+
+import httpx
+import openai
+from openai.types.chat import ParsedChatCompletion
+from pydantic import BaseModel
+
+from talent_match.fake_llm.engine import FakeLLM, FakeLLMConfig
+
+FAKE_URL = "http://fake-llm.local/v1/chat/completions"
+
+
+class FakeRawResponse:
+    """Mirror of the object returned by `with_raw_response` calls"""
+
+    def __init__(self, headers: Dict[str, str], completion: ParsedChatCompletion):
+        self.headers = httpx.Headers(headers)
+        self._completion = completion
+
+    def parse(self) -> ParsedChatCompletion:
+        return self._completion
+
+
+class _RawCompletions:
+    def __init__(self, completions: "_Completions"):
+        self._completions = completions
+
+    async def parse(self, **kwargs) -> FakeRawResponse:
+        return await self._completions._request(**kwargs)
+
+
+class _Completions:
+    def __init__(self, llm: FakeLLM):
+        self._llm = llm
+        self.with_raw_response = _RawCompletions(self)
+
+    async def parse(self, **kwargs) -> ParsedChatCompletion:
+        return (await self._request(**kwargs)).parse()
+
+    async def _request(self, model: str, messages: List[Dict[str, str]],
+                       response_format: Type[BaseModel], **kwargs) -> FakeRawResponse:
+        status, headers, body = await self._llm.complete(
+            model, messages, response_format.__name__)
+        if status != 200:
+            raise _api_error(status, headers, body)
+
+        for choice in body["choices"]:
+            choice["message"]["parsed"] = json.loads(choice["message"]["content"])
+        completion = ParsedChatCompletion[response_format].model_validate(body)
+        return FakeRawResponse(headers, completion)
+
+
+class _Namespace:
+    def __init__(self, **attributes):
+        self.__dict__.update(attributes)
+
+
+class FakeAsyncOpenAI:
+    """
+    In-process stub of the AsyncOpenAI client for the calls OpenAIService
+    makes (`beta.chat.completions.parse` and its `with_raw_response`).
+
+    Failures are raised as the same openai exceptions the real client
+    raises, so retries and backpressure go through the normal code paths.
+    Pass it as `OpenAIService(client=FakeAsyncOpenAI(...))`.
+    """
+
+    def __init__(self, config: Optional[FakeLLMConfig] = None, llm: Optional[FakeLLM] = None):
+        self.llm = llm or FakeLLM(config)
+        completions = _Completions(self.llm)
+        self.beta = _Namespace(chat=_Namespace(completions=completions))
+        self.chat = _Namespace(completions=completions)
+
+    async def close(self):
+        pass
+
+
+def _api_error(status: int, headers: Dict[str, str], body: Dict[str, Any]) -> openai.APIStatusError:
+    response = httpx.Response(
+        status, headers=headers, json=body, request=httpx.Request("POST", FAKE_URL))
+    error = body.get("error", {})
+    error_class = {
+        400: openai.BadRequestError,
+        429: openai.RateLimitError,
+    }.get(status, openai.InternalServerError)
+    return error_class(error.get("message", ""), response=response, body=error)
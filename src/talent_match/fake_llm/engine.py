@@ -0,0 +1,146 @@
+import asyncio
+import hashlib
+import json
+import math
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from talent_match.fake_llm.payloads import RESPONSE_MODELS, generate_payload
+from talent_match.services.rate_limiter import estimate_message_tokens, estimate_tokens
+
+
+@dataclass
+class FakeLLMConfig:
+    """
+    Behavior of the fake model
+
+    Latency is drawn from a log-normal distribution with the given median
+    and sigma (sigma=0 gives a fixed latency) plus a per-completion-token
+    cost. Failures are injected at random with the given rates, and
+    requests beyond `max_concurrency` get a 429 like an overloaded provider.
+    """
+    latency_median: float = 0.5
+    latency_sigma: float = 0.4
+    latency_per_token: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after: float = 1.0
+    max_concurrency: Optional[int] = None
+    explanation_words: int = 25
+    seed: Optional[int] = None
+
+
+class FakeLLM:
+    """
+    Deterministic stand-in for the chat-completions structured-output API,
+    shared by the stub client and the HTTP server.
+
+    Payloads depend only on the seed and the request messages, so the same
+    request always gets the same answer; latency and injected failures are
+    drawn from a separate random stream.
+    """
+
+    def __init__(self, config: Optional[FakeLLMConfig] = None):
+        self.config = config or FakeLLMConfig()
+        self._rng = random.Random(self.config.seed)
+        self._in_flight = 0
+        self._stats = {
+            "requests": 0,
+            "completed": 0,
+            "rate_limited": 0,
+            "errors": 0,
+            "max_in_flight": 0,
+        }
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._stats, "in_flight": self._in_flight}
+
+    def _latency(self, completion_tokens: int) -> float:
+        config = self.config
+        latency = config.latency_median
+        if config.latency_sigma > 0:
+            latency = self._rng.lognormvariate(math.log(config.latency_median),
+                                               config.latency_sigma)
+        return latency + completion_tokens * config.latency_per_token
+
+    def _payload_rng(self, model: str, messages: List[Dict[str, str]]) -> random.Random:
+        material = json.dumps([self.config.seed, model, messages], sort_keys=True)
+        digest = hashlib.sha256(material.encode("utf-8")).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+
+    async def complete(self, model: str, messages: List[Dict[str, str]],
+                       schema_name: str) -> Tuple[int, Dict[str, str], Dict[str, Any]]:
+        """
+        Answer one chat completion request
+
+        Args:
+            model: Requested model name (echoed back)
+            messages: Chat messages
+            schema_name: Name of the JSON schema in response_format
+
+        Returns:
+            (HTTP status, headers, JSON body) as the real API would send them
+        """
+        self._stats["requests"] += 1
+        config = self.config
+        headers = {"x-request-id": uuid.uuid4().hex}
+
+        response_format = RESPONSE_MODELS.get(schema_name)
+        if response_format is None:
+            return 400, headers, _error_body(
+                f"Unknown response format {schema_name!r}", "invalid_request_error")
+
+        overloaded = (config.max_concurrency is not None
+                      and self._in_flight >= config.max_concurrency)
+        if overloaded or self._rng.random() < config.rate_limit_rate:
+            self._stats["rate_limited"] += 1
+            headers["retry-after"] = str(config.retry_after)
+            return 429, headers, _error_body(
+                "Rate limit reached for requests", "requests", "rate_limit_exceeded")
+
+        content = json.dumps(
+            generate_payload(response_format, self._payload_rng(model, messages),
+                             config.explanation_words),
+            ensure_ascii=False
+        )
+        prompt_tokens = estimate_message_tokens(messages)
+        completion_tokens = estimate_tokens(content)
+        failed = self._rng.random() < config.error_rate
+
+        self._in_flight += 1
+        self._stats["max_in_flight"] = max(self._stats["max_in_flight"], self._in_flight)
+        try:
+            await asyncio.sleep(self._latency(completion_tokens))
+        finally:
+            self._in_flight -= 1
+
+        if failed:
+            self._stats["errors"] += 1
+            return 500, headers, _error_body("The server had an error", "server_error")
+
+        self._stats["completed"] += 1
+        return 200, headers, {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content, "refusal": None},
+                "finish_reason": "stop",
+                "logprobs": None,
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "prompt_tokens_details": {"cached_tokens": 0},
+            },
+        }
+
+
+def _error_body(message: str, error_type: str, code: Optional[str] = None) -> Dict[str, Any]:
+    return {"error": {"message": message, "type": error_type, "param": None, "code": code}}
@@ -0,0 +1,191 @@
+import random
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Type
+
+from pydantic import BaseModel
+
+from talent_match.models.evaluation import DATE_FORMAT
+from talent_match.models.responses import (
+    CVExtractionResponse,
+    EducationResponse,
+    ExperienceResponse,
+    ExtractionResponse,
+    RelevanceResponse,
+    SkillsResponse,
+    SummaryResponse,
+)
+from talent_match.models.types import ExperienceType, RelevanceLevel, SkillLevel
+
+# Response models the fake model can answer, by JSON schema name
+RESPONSE_MODELS: Dict[str, Type[BaseModel]] = {
+    model.__name__: model
+    for model in (
+        ExperienceResponse,
+        SkillsResponse,
+        EducationResponse,
+        SummaryResponse,
+        ExtractionResponse,
+        CVExtractionResponse,
+        RelevanceResponse,
+    )
+}
+
+SKILL_POOL = [
+    "Python", "SQL", "Machine Learning", "Docker", "Kubernetes", "AWS",
+    "TypeScript", "React", "Spark", "Airflow", "Git", "Linux", "Pandas",
+    "PyTorch", "Statistics", "Tableau", "Java", "Go", "Terraform", "CI/CD",
+]
+POSITIONS = [
+    "Data Scientist", "Software Engineer", "Data Analyst", "ML Engineer",
+    "Backend Developer", "DevOps Engineer", "Product Analyst", "Consultant",
+]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne"]
+FILLER = (
+    "The candidate's track record shows hands-on work that maps to the "
+    "responsibilities of the role, with measurable outcomes and ownership."
+)
+
+
+def _text(rng: random.Random, words: int) -> str:
+    pool = FILLER.split()
+    return " ".join(rng.choice(pool) for _ in range(max(1, words)))
+
+
+def _experiences(rng: random.Random, explanation_words: int):
+    experiences = []
+    start = date(2010, 1, 1) + timedelta(days=rng.randrange(0, 365 * 8))
+    for index in range(rng.randint(1, 4)):
+        end = start + timedelta(days=rng.randrange(180, 365 * 4))
+        current = (index > 0 and rng.random() < 0.3) or end >= date.today()
+        experiences.append({
+            "position": rng.choice(POSITIONS),
+            "company": rng.choice(COMPANIES),
+            "dates": {
+                "start_date": start.strftime(DATE_FORMAT),
+                "end_date": None if current else end.strftime(DATE_FORMAT),
+            },
+            "relevance_explanation": _text(rng, explanation_words),
+            "match_type": rng.choices(
+                list(ExperienceType), weights=[5, 3, 2])[0].value,
+            "relevant_skills": rng.sample(SKILL_POOL, rng.randint(0, 4)),
+        })
+        if current:
+            break
+        start = end + timedelta(days=rng.randrange(0, 120))
+    return experiences
+
+
+def _skills(rng: random.Random, explanation_words: int):
+    return [
+        {
+            "skill_name": name,
+            "relevance_explanation": _text(rng, explanation_words),
+            "level": rng.choice(list(SkillLevel)).value,
+            "relevance": rng.choice(list(RelevanceLevel)).value,
+        }
+        for name in rng.sample(SKILL_POOL, rng.randint(2, 8))
+    ]
+
+
+def _education(rng: random.Random, explanation_words: int):
+    return {
+        "relevance_level": rng.choice(list(RelevanceLevel)).value,
+        "relevant_courses": rng.sample(
+            ["Algorithms", "Databases", "Statistics", "Machine Learning", "Networks"],
+            rng.randint(0, 3)),
+        "education_fit": _text(rng, explanation_words),
+    }
+
+
+def _summary(rng: random.Random, explanation_words: int):
+    return {
+        "strengths": [_text(rng, 8) for _ in range(rng.randint(1, 3))],
+        "areas_of_improvement": [_text(rng, 8) for _ in range(rng.randint(1, 3))],
+        "overall_assessment": _text(rng, explanation_words * 2),
+        "fit_score": 0.0,
+    }
+
+
+def _extraction(rng: random.Random, explanation_words: int):
+    experiences = _experiences(rng, explanation_words)
+    return {
+        "experiences": [
+            {
+                "position": exp["position"],
+                "company": exp["company"],
+                "dates": exp["dates"],
+                "skills": exp["relevant_skills"],
+            }
+            for exp in experiences
+        ],
+        "skills": [
+            {"skill_name": skill["skill_name"], "level": skill["level"]}
+            for skill in _skills(rng, explanation_words)
+        ],
+        "education": {
+            "degrees": rng.sample(
+                ["Computer Science", "Mathematics", "Physics"], rng.randint(0, 2)),
+            "courses": rng.sample(
+                ["Algorithms", "Databases", "Statistics", "Machine Learning", "Networks"],
+                rng.randint(0, 3)),
+        },
+    }
+
+
+def _relevance(rng: random.Random, explanation_words: int):
+    # Indexes refer to an extraction the fake model has not seen: rate the
+    # first few, which every extraction of _extraction has at least
+    return {
+        "experiences": [
+            {
+                "index": index,
+                "relevance_explanation": _text(rng, explanation_words),
+                "match_type": rng.choices(list(ExperienceType), weights=[5, 3, 2])[0].value,
+                "relevant_skills": rng.sample(SKILL_POOL, rng.randint(0, 3)),
+            }
+            for index in range(1)
+        ],
+        "skills": [
+            {
+                "index": index,
+                "relevance_explanation": _text(rng, explanation_words),
+                "relevance": rng.choice(list(RelevanceLevel)).value,
+            }
+            for index in range(2)
+        ],
+        "education": _education(rng, explanation_words),
+    }
+
+
+FIELD_GENERATORS: Dict[str, Callable[[random.Random, int], Any]] = {
+    "experiences": _experiences,
+    "skills": _skills,
+    "education": _education,
+    "summary": _summary,
+    "extraction": _extraction,
+    "relevance": _relevance,
+}
+
+
+def generate_payload(response_format: Type[BaseModel], rng: random.Random,
+                     explanation_words: int = 25) -> Dict[str, Any]:
+    """
+    Build a random payload that validates against a response model
+
+    Args:
+        response_format: One of the response models in RESPONSE_MODELS
+        rng: Random source (seed it for reproducible payloads)
+        explanation_words: Length of the free-text fields, to control the
+            completion size
+
+    Returns:
+        JSON-compatible dict
+    """
+    unknown = set(response_format.model_fields) - set(FIELD_GENERATORS)
+    if unknown:
+        raise ValueError(
+            f"Cannot generate {response_format.__name__}: unknown fields {sorted(unknown)}")
+    return {
+        field: FIELD_GENERATORS[field](rng, explanation_words)
+        for field in response_format.model_fields
+    }
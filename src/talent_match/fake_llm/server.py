@@ -0,0 +1,34 @@
+from typing import Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from talent_match.fake_llm.engine import FakeLLM, FakeLLMConfig
+
+
+def create_fake_llm_app(config: Optional[FakeLLMConfig] = None) -> FastAPI:
+    """
+    HTTP server speaking the chat-completions structured-output protocol
+
+    Point the service at it with OPENAI_BASE_URL=http://<host>:<port>/v1.
+    Requests must use a `json_schema` response_format named after one of
+    the response models (as `beta.chat.completions.parse` sends them).
+    """
+    llm = FakeLLM(config)
+    app = FastAPI(title="Fake LLM")
+    app.state.llm = llm
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        payload = await request.json()
+        response_format = payload.get("response_format") or {}
+        schema_name = (response_format.get("json_schema") or {}).get("name", "")
+        status, headers, body = await llm.complete(
+            payload.get("model", ""), payload.get("messages", []), schema_name)
+        return JSONResponse(status_code=status, content=body, headers=headers)
+
+    @app.get("/stats")
+    async def stats():
+        return llm.stats()
+
+    return app
@@ -1,33 +1,60 @@
+import json
 from datetime import date, datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr, model_validator
 
+from .timeline import ExperienceTimeline
 from .types import ExperienceType, RelevanceLevel, SkillLevel
 
+DATE_FORMAT = "%d-%m-%Y"
+
 
 class ExperienceDates(BaseModel):
     start_date: str 
     end_date: Optional[str] = None  
     
+    _start: date = PrivateAttr()
+    _end: Optional[date] = PrivateAttr(default=None)
+    _duration: float = PrivateAttr(default=0.0)
+    
+    @model_validator(mode="after")
+    def _parse_dates(self) -> "ExperienceDates":
+        """Valida y convierte las fechas una sola vez, al construir el modelo"""
+        try:
+            self._start = datetime.strptime(self.start_date, DATE_FORMAT).date()
+            self._end = (
+                datetime.strptime(self.end_date, DATE_FORMAT).date()
+                if self.end_date else None
+            )
+        except ValueError as e:
+            raise ValueError(f"Fechas con formato inválido (se espera DD-MM-YYYY): {e}")
+        self._duration = round((self.end - self._start).days / 365.25, 2)
+        return self
+    
     @property
     def start(self) -> date:
-        """Convierte start_date a objeto date"""
-        return datetime.strptime(self.start_date, "%d-%m-%Y").date()
+        """Fecha de inicio"""
+        return self._start
     
     @property
     def end(self) -> date:
-        """Convierte end_date a objeto date o retorna fecha actual"""
-        if self.end_date:
-            return datetime.strptime(self.end_date, "%d-%m-%Y").date()
-        return date.today()
+        """Fecha de fin o fecha actual si es el trabajo actual"""
+        return self._end or date.today()
+    
+    @property
+    def is_current(self) -> bool:
+        return self._end is None
+    
+    def end_on(self, today: date) -> date:
+        """Fecha de fin, usando `today` como referencia para el trabajo actual"""
+        return self._end or today
     
     def calculate_duration(self) -> float:
-        duration = (self.end - self.start).days / 365.25
-        return round(duration, 2)
+        return self._duration
     
     def format_duration(self) -> str:
-        years = self.calculate_duration()
+        years = self._duration
         if years >= 1:
             return f"{int(years)} año{'s' if years != 1 else ''}"
         months = int(years * 12)
@@ -73,4 +100,71 @@ class CompleteEvaluation(BaseModel):
     experiences: List[RelevantExperience]
     skills: List[SkillEvaluation]
     education: EducationEvaluation
-    summary: Summary
\ No newline at end of file
+    summary: Summary
+    
+    # Línea temporal calculada y la lista de experiencias de la que procede
+    _timeline: Optional[ExperienceTimeline] = PrivateAttr(default=None)
+    _timeline_source: Optional[List[RelevantExperience]] = PrivateAttr(default=None)
+    
+    @property
+    def experience_timeline(self) -> ExperienceTimeline:
+        """
+        Línea temporal de la experiencia, calculada una vez por evaluación
+        
+        Se vuelve a calcular si se asigna otra lista de experiencias (también
+        con model_copy(update=...)), para no usar una línea temporal obsoleta.
+        """
+        if self._timeline is None or self._timeline_source is not self.experiences:
+            self._timeline = ExperienceTimeline.from_experiences(self.experiences)
+            self._timeline_source = self.experiences
+        return self._timeline
+    
+    def analysis_digest(self, fit_score: Optional[float] = None) -> str:
+        """
+        Serializa el análisis en un JSON compacto y determinista para el
+        prompt de resumen.
+        
+        Omite las explicaciones de relevancia y usa claves cortas, de modo
+        que el mismo análisis produce siempre el mismo texto (y la misma
+        clave de caché).
+        
+        Args:
+            fit_score: Puntuación calculada a incluir en el resumen
+            
+        Returns:
+            JSON sin espacios con experiencia, habilidades y formación
+        """
+        timeline = self.experience_timeline
+        digest: Dict[str, Any] = {
+            "experience": {
+                "direct_years": timeline.direct_years,
+                "related_years": timeline.related_years,
+                "roles": [
+                    {
+                        "position": exp.position,
+                        "company": exp.company,
+                        "type": exp.match_type.value,
+                        "from": exp.dates.start_date,
+                        "to": exp.dates.end_date,
+                        "skills": exp.relevant_skills,
+                    }
+                    for exp in self.experiences
+                ],
+            },
+            "skills": [
+                {
+                    "name": skill.skill_name,
+                    "level": skill.level.value,
+                    "relevance": skill.relevance.value,
+                }
+                for skill in self.skills
+            ],
+            "education": {
+                "relevance": self.education.relevance_level.value,
+                "courses": self.education.relevant_courses,
+                "fit": self.education.education_fit,
+            },
+        }
+        if fit_score is not None:
+            digest["fit_score"] = fit_score
+        return json.dumps(digest, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
\ No newline at end of file
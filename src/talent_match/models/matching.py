@@ -0,0 +1,152 @@
+import json
+from typing import Any, Dict, List
+
+from pydantic import BaseModel
+
+from .evaluation import (
+    CompleteEvaluation,
+    EducationEvaluation,
+    ExperienceDates,
+    RelevantExperience,
+    SkillEvaluation,
+    Summary,
+)
+from .types import ExperienceType, RelevanceLevel, SkillLevel
+
+
+class ExtractedExperience(BaseModel):
+    """Experiencia laboral tal como aparece en el CV, sin valorar"""
+    position: str
+    company: str
+    dates: ExperienceDates
+    skills: List[str]
+
+
+class ExtractedSkill(BaseModel):
+    """Habilidad técnica con su nivel, independiente del puesto"""
+    skill_name: str
+    level: SkillLevel
+
+
+class ExtractedEducation(BaseModel):
+    """Titulaciones, cursos y certificaciones del candidato"""
+    degrees: List[str]
+    courses: List[str]
+
+
+class CVExtraction(BaseModel):
+    """
+    Datos del CV que no dependen del puesto: se extraen una vez por CV y se
+    reutilizan para valorar la relevancia frente a cualquier puesto.
+    """
+    experiences: List[ExtractedExperience]
+    skills: List[ExtractedSkill]
+    education: ExtractedEducation
+
+    def digest(self) -> str:
+        """
+        Serializa la extracción en un JSON compacto y determinista para el
+        prompt de relevancia.
+
+        Cada experiencia y habilidad lleva su índice ("i"), que la respuesta
+        de relevancia usa para referirse a ella.
+
+        Returns:
+            JSON sin espacios con experiencia, habilidades y formación
+        """
+        digest: Dict[str, Any] = {
+            "experience": [
+                {
+                    "i": index,
+                    "position": exp.position,
+                    "company": exp.company,
+                    "from": exp.dates.start_date,
+                    "to": exp.dates.end_date,
+                    "skills": exp.skills,
+                }
+                for index, exp in enumerate(self.experiences)
+            ],
+            "skills": [
+                {"i": index, "name": skill.skill_name, "level": skill.level.value}
+                for index, skill in enumerate(self.skills)
+            ],
+            "education": {
+                "degrees": self.education.degrees,
+                "courses": self.education.courses,
+            },
+        }
+        return json.dumps(digest, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+    def to_evaluation(self, relevance: "JobRelevance") -> CompleteEvaluation:
+        """
+        Combina la extracción con la valoración de un puesto en una
+        evaluación completa, sin resumen.
+
+        Las experiencias y habilidades que la valoración no menciona se
+        consideran no relacionadas con el puesto; los índices desconocidos
+        se ignoran.
+
+        Args:
+            relevance: Valoración de la extracción para el puesto
+
+        Returns:
+            Evaluación con la puntuación del resumen a 0
+        """
+        experience_relevance = {r.index: r for r in relevance.experiences}
+        skill_relevance = {r.index: r for r in relevance.skills}
+
+        experiences = []
+        for index, exp in enumerate(self.experiences):
+            rated = experience_relevance.get(index)
+            experiences.append(RelevantExperience(
+                position=exp.position,
+                company=exp.company,
+                dates=exp.dates,
+                relevance_explanation=rated.relevance_explanation if rated else "",
+                match_type=rated.match_type if rated else ExperienceType.UNRELATED,
+                relevant_skills=rated.relevant_skills if rated else [],
+            ))
+
+        skills = []
+        for index, skill in enumerate(self.skills):
+            rated = skill_relevance.get(index)
+            skills.append(SkillEvaluation(
+                skill_name=skill.skill_name,
+                relevance_explanation=rated.relevance_explanation if rated else "",
+                level=skill.level,
+                relevance=rated.relevance if rated else RelevanceLevel.NONE,
+            ))
+
+        return CompleteEvaluation(
+            experiences=experiences,
+            skills=skills,
+            education=relevance.education,
+            summary=Summary(
+                overall_assessment="",
+                strengths=[],
+                areas_of_improvement=[],
+                fit_score=0.0
+            )
+        )
+
+
+class ExperienceRelevance(BaseModel):
+    """Valoración de una experiencia extraída (por índice) para un puesto"""
+    index: int
+    relevance_explanation: str
+    match_type: ExperienceType
+    relevant_skills: List[str]
+
+
+class SkillRelevance(BaseModel):
+    """Valoración de una habilidad extraída (por índice) para un puesto"""
+    index: int
+    relevance_explanation: str
+    relevance: RelevanceLevel
+
+
+class JobRelevance(BaseModel):
+    """Valoración de una extracción de CV para un puesto concreto"""
+    experiences: List[ExperienceRelevance]
+    skills: List[SkillRelevance]
+    education: EducationEvaluation
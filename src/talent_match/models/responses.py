@@ -8,6 +8,7 @@ from .evaluation import (
     SkillEvaluation,
     Summary,
 )
+from .matching import CVExtraction, JobRelevance
 
 
 class ExperienceResponse(BaseModel):
@@ -24,4 +25,15 @@ class EducationResponse(BaseModel):
 
 class SummaryResponse(BaseModel):
     """Modelo de respuesta para el resumen general"""
-    summary: Summary
\ No newline at end of file
+    summary: Summary
+
+class ExtractionResponse(ExperienceResponse, SkillsResponse, EducationResponse):
+    """Modelo de respuesta combinado: experiencia, habilidades y educación en una sola llamada"""
+
+class CVExtractionResponse(BaseModel):
+    """Modelo de respuesta para la extracción de datos del CV, independiente del puesto"""
+    extraction: CVExtraction
+
+class RelevanceResponse(BaseModel):
+    """Modelo de respuesta para la valoración de una extracción frente a un puesto"""
+    relevance: JobRelevance
@@ -0,0 +1,90 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterable, List, Optional, Tuple
+
+from .types import ExperienceType
+
+DAYS_PER_YEAR = 365.25
+
+
+def merged_days(intervals: List[Tuple[date, date]]) -> int:
+    """
+    Suma los días cubiertos por una lista de intervalos, contando una sola
+    vez los tramos solapados (un único barrido sobre los intervalos ordenados)
+    """
+    total = 0
+    current_start: Optional[date] = None
+    current_end: Optional[date] = None
+    for start, end in sorted(intervals):
+        if current_end is not None and start <= current_end:
+            current_end = max(current_end, end)
+            continue
+        if current_end is not None:
+            total += (current_end - current_start).days
+        current_start, current_end = start, end
+    if current_end is not None:
+        total += (current_end - current_start).days
+    return total
+
+
+@dataclass(frozen=True)
+class ExperienceTimeline:
+    """
+    Línea temporal de la experiencia relevante de un candidato.
+
+    Los periodos DIRECT y RELATED se fusionan por separado, de modo que dos
+    trabajos simultáneos del mismo tipo no cuentan el tiempo dos veces.
+    """
+    direct_years: float
+    related_years: float
+    has_relevant: bool
+    has_current: bool
+    days_since_last_end: Optional[int]
+
+    @classmethod
+    def from_experiences(cls, experiences: Iterable, today: date = None) -> "ExperienceTimeline":
+        """
+        Construye la línea temporal a partir de experiencias evaluadas.
+
+        Args:
+            experiences: Experiencias (RelevantExperience) del candidato
+            today: Fecha de referencia para trabajos actuales (por defecto, hoy)
+        """
+        today = today or date.today()
+        intervals = {ExperienceType.DIRECT: [], ExperienceType.RELATED: []}
+        has_relevant = False
+        has_current = False
+        days_since_last_end = None
+
+        for exp in experiences:
+            if exp.match_type not in intervals:
+                continue
+            has_relevant = True
+            start = exp.dates.start
+            end = exp.dates.end_on(today)
+            if end > start:
+                intervals[exp.match_type].append((start, end))
+
+            if exp.dates.is_current:
+                has_current = True
+            else:
+                days = (today - end).days
+                if days_since_last_end is None or days < days_since_last_end:
+                    days_since_last_end = days
+
+        return cls(
+            direct_years=round(merged_days(intervals[ExperienceType.DIRECT]) / DAYS_PER_YEAR, 2),
+            related_years=round(merged_days(intervals[ExperienceType.RELATED]) / DAYS_PER_YEAR, 2),
+            has_relevant=has_relevant,
+            has_current=has_current,
+            days_since_last_end=days_since_last_end,
+        )
+
+    def is_recent(self, recency_years: int) -> bool:
+        """Indica si hay experiencia relevante actual o terminada hace poco"""
+        if self.has_current:
+            return True
+        return (
+            self.days_since_last_end is not None
+            and self.days_since_last_end <= recency_years * 365
+        )
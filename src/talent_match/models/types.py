@@ -1,6 +1,6 @@
 from enum import Enum
 
-from talent_match.config.settings import get_settings
+from talent_match.config.settings import Settings, get_settings
 
 settings = get_settings()
 
@@ -27,33 +27,36 @@ class ScoreCalculator:
     """Utilidad para convertir evaluaciones cualitativas en puntuaciones numéricas"""
     
     @staticmethod
-    def relevance_to_score(level: RelevanceLevel) -> float:
+    def relevance_to_score(level: RelevanceLevel, config: Settings = None) -> float:
         """Convierte un nivel de relevancia en una puntuación de 0 a 100"""
+        config = config or settings
         scores = {
-            RelevanceLevel.NONE: settings.RELEVANCE_NONE,
-            RelevanceLevel.VERY_LOW: settings.RELEVANCE_VERY_LOW,
-            RelevanceLevel.LOW: settings.RELEVANCE_LOW,
-            RelevanceLevel.MEDIUM: settings.RELEVANCE_MEDIUM,
-            RelevanceLevel.HIGH: settings.RELEVANCE_HIGH,
-            RelevanceLevel.VERY_HIGH: settings.RELEVANCE_VERY_HIGH
+            RelevanceLevel.NONE: config.RELEVANCE_NONE,
+            RelevanceLevel.VERY_LOW: config.RELEVANCE_VERY_LOW,
+            RelevanceLevel.LOW: config.RELEVANCE_LOW,
+            RelevanceLevel.MEDIUM: config.RELEVANCE_MEDIUM,
+            RelevanceLevel.HIGH: config.RELEVANCE_HIGH,
+            RelevanceLevel.VERY_HIGH: config.RELEVANCE_VERY_HIGH
         }
         return scores.get(level, 0.0)
 
     @staticmethod
-    def skill_level_to_score(level: SkillLevel) -> float:
+    def skill_level_to_score(level: SkillLevel, config: Settings = None) -> float:
         """Convierte un nivel de habilidad en una puntuación de 0 a 100"""
+        config = config or settings
         scores = {
-            SkillLevel.BASIC: settings.SKILL_BASIC_SCORE,
-            SkillLevel.INTERMEDIATE: settings.SKILL_INTERMEDIATE_SCORE,
-            SkillLevel.ADVANCED: settings.SKILL_ADVANCED_SCORE
+            SkillLevel.BASIC: config.SKILL_BASIC_SCORE,
+            SkillLevel.INTERMEDIATE: config.SKILL_INTERMEDIATE_SCORE,
+            SkillLevel.ADVANCED: config.SKILL_ADVANCED_SCORE
         }
         return scores.get(level, 0.0)
 
     @staticmethod
-    def experience_type_to_score(type: ExperienceType) -> float:
+    def experience_type_to_score(type: ExperienceType, config: Settings = None) -> float:
         """Convierte un tipo de experiencia en una puntuación de 0 a 100"""
+        config = config or settings
         scores = {
-            ExperienceType.DIRECT: settings.DIRECT_SCORE,
-            ExperienceType.RELATED: settings.RELATED_SCORE
+            ExperienceType.DIRECT: config.DIRECT_SCORE,
+            ExperienceType.RELATED: config.RELATED_SCORE
         }
         return scores.get(type, 0.0)
\ No newline at end of file
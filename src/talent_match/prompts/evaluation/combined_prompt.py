@@ -0,0 +1,23 @@
+from ..base import BasePrompt
+from .education_prompt import EducationPrompt
+from .experience_prompt import ExperiencePrompt
+from .skills_prompt import SkillsPrompt
+
+
+class CombinedPrompt(BasePrompt):
+    template = f"""
+    Realiza en una sola respuesta los tres análisis siguientes del candidato
+    para el puesto de <${{job_title}}>.
+
+    ### 1. Experiencia
+    {ExperiencePrompt.template}
+
+    ### 2. Habilidades
+    {SkillsPrompt.template}
+
+    ### 3. Formación
+    {EducationPrompt.template}
+
+    Combina las tres salidas en un único JSON con las claves "experiences",
+    "skills" y "education", cada una con el formato indicado en su sección.
+    """
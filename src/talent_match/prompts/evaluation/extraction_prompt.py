@@ -0,0 +1,49 @@
+from ..base import BasePrompt
+
+
+class CVExtractionPrompt(BasePrompt):
+    template = """
+    Extrae los datos del CV del candidato, sin valorarlos para ningún puesto.
+
+    1. Para cada experiencia laboral identifica:
+       - Cargo/posición
+       - Empresa
+       - Fechas de inicio y fin en formato DD-MM-YYYY (usa null si es trabajo actual)
+       - Habilidades técnicas aplicadas en ella
+
+    2. Para cada habilidad técnica o específica determina el nivel:
+       - BASIC: Conocimientos básicos o poca experiencia
+       - INTERMEDIATE: Buen dominio y experiencia práctica
+       - ADVANCED: Dominio experto y amplia experiencia
+       Ignora habilidades genéricas como "trabajo en equipo" o "comunicación".
+       Si no se especifica el nivel de una habilidad, asignar ADVANCED por defecto.
+
+    3. Enumera las titulaciones académicas y los cursos o certificaciones.
+
+    La salida debe ser un JSON que siga exactamente este esquema:
+    {
+        "extraction": {
+            "experiences": [
+                {
+                    "position": str,
+                    "company": str,
+                    "dates": {
+                        "start_date": "DD-MM-YYYY",
+                        "end_date": "DD-MM-YYYY" | null  # null para trabajo actual
+                    },
+                    "skills": List[str]
+                }
+            ],
+            "skills": [
+                {
+                    "skill_name": str,
+                    "level": "BASIC" | "INTERMEDIATE" | "ADVANCED"
+                }
+            ],
+            "education": {
+                "degrees": List[str],
+                "courses": List[str]
+            }
+        }
+    }
+    """
@@ -0,0 +1,56 @@
+from ..base import BasePrompt
+
+
+class RelevancePrompt(BasePrompt):
+    template = """
+    Valora los datos extraídos del CV de un candidato para el puesto de <${job_title}>.
+
+    Recibirás un JSON con las experiencias ("experience"), las habilidades
+    ("skills") y la formación ("education") del candidato. Cada experiencia y
+    habilidad tiene un índice "i": úsalo para referirte a ella.
+
+    1. Clasifica cada experiencia como:
+       - DIRECT: Mismo puesto o responsabilidades muy similares
+       - RELATED: Diferentes puestos pero con habilidades aplicables
+       - UNRELATED: Experiencia no relacionada con el puesto
+       e indica cuáles de sus habilidades son relevantes para el puesto.
+
+    2. Evalúa la relevancia de cada habilidad para este puesto específico:
+       - VERY_HIGH: Habilidad crucial e imprescindible
+       - HIGH: Muy importante para el puesto
+       - MEDIUM: Útil pero no esencial
+       - LOW: Marginalmente útil
+       - VERY_LOW: Apenas relacionada
+       - NONE: Sin relación con el puesto
+
+    3. Evalúa la relevancia de la formación con los mismos niveles e indica
+       los cursos relevantes para el puesto.
+
+    Las explicaciones deben ser de una sola frase breve.
+
+    La salida debe ser un JSON que siga exactamente este esquema:
+    {
+        "relevance": {
+            "experiences": [
+                {
+                    "index": int,
+                    "relevance_explanation": str,
+                    "match_type": "DIRECT" | "RELATED" | "UNRELATED",
+                    "relevant_skills": List[str]
+                }
+            ],
+            "skills": [
+                {
+                    "index": int,
+                    "relevance_explanation": str,
+                    "relevance": "NONE" | "VERY_LOW" | "LOW" | "MEDIUM" | "HIGH" | "VERY_HIGH"
+                }
+            ],
+            "education": {
+                "education_fit": str,
+                "relevant_courses": List[str],
+                "relevance_level": "NONE" | "VERY_LOW" | "LOW" | "MEDIUM" | "HIGH" | "VERY_HIGH"
+            }
+        }
+    }
+    """
@@ -0,0 +1,199 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from talent_match.config.settings import Settings, get_settings
+from talent_match.models.evaluation import CompleteEvaluation
+from talent_match.models.timeline import ExperienceTimeline
+from talent_match.models.types import RelevanceLevel, SkillLevel
+
+settings = get_settings()
+
+# Códigos enteros para las columnas categóricas
+LEVEL_CODES = {level: code for code, level in enumerate(SkillLevel)}
+RELEVANCE_CODES = {level: code for code, level in enumerate(RelevanceLevel)}
+
+
+def _level_table(config: Settings) -> np.ndarray:
+    table = np.zeros(len(LEVEL_CODES))
+    table[LEVEL_CODES[SkillLevel.BASIC]] = config.SKILL_BASIC_SCORE
+    table[LEVEL_CODES[SkillLevel.INTERMEDIATE]] = config.SKILL_INTERMEDIATE_SCORE
+    table[LEVEL_CODES[SkillLevel.ADVANCED]] = config.SKILL_ADVANCED_SCORE
+    return table
+
+
+def _relevance_table(config: Settings) -> np.ndarray:
+    table = np.zeros(len(RELEVANCE_CODES))
+    table[RELEVANCE_CODES[RelevanceLevel.NONE]] = config.RELEVANCE_NONE
+    table[RELEVANCE_CODES[RelevanceLevel.VERY_LOW]] = config.RELEVANCE_VERY_LOW
+    table[RELEVANCE_CODES[RelevanceLevel.LOW]] = config.RELEVANCE_LOW
+    table[RELEVANCE_CODES[RelevanceLevel.MEDIUM]] = config.RELEVANCE_MEDIUM
+    table[RELEVANCE_CODES[RelevanceLevel.HIGH]] = config.RELEVANCE_HIGH
+    table[RELEVANCE_CODES[RelevanceLevel.VERY_HIGH]] = config.RELEVANCE_VERY_HIGH
+    return table
+
+
+def _round2(values: np.ndarray) -> np.ndarray:
+    """
+    Redondea a 2 decimales con la semántica de round() de Python.
+
+    np.round escala por 100 antes de redondear y puede diferir en los
+    casos límite, así que se redondea elemento a elemento para obtener
+    exactamente los mismos valores que los calculadores escalares.
+    """
+    return np.array([round(value, 2) for value in values.tolist()], dtype=np.float64)
+
+
+@dataclass
+class CandidateBatch:
+    """
+    Evaluaciones de muchos candidatos empaquetadas en arrays columnares.
+
+    Cada habilidad es una fila con el índice del candidato al que pertenece
+    (`skill_owner`); la experiencia se empaqueta por candidato a partir de
+    su línea temporal (años DIRECT/RELATED ya fusionados y recencia), de
+    modo que todas las puntuaciones se calculan en una sola pasada
+    vectorizada. El empaquetado es independiente de la configuración: un
+    mismo lote puede puntuarse con muchos perfiles (p. ej. un barrido de
+    pesos).
+    """
+    size: int
+    skill_owner: np.ndarray
+    skill_level: np.ndarray
+    skill_relevance: np.ndarray
+    direct_years: np.ndarray
+    related_years: np.ndarray
+    has_relevant: np.ndarray
+    has_current: np.ndarray
+    days_since_last_end: np.ndarray
+    education_relevance: np.ndarray
+
+    @classmethod
+    def from_evaluations(cls, evaluations: Sequence[CompleteEvaluation],
+                         today: date = None) -> "CandidateBatch":
+        """
+        Empaqueta una lista de evaluaciones.
+
+        Args:
+            evaluations: Evaluaciones completas de los candidatos
+            today: Fecha de referencia para la recencia (por defecto, hoy)
+        """
+        skill_owner: List[int] = []
+        skill_level: List[int] = []
+        skill_relevance: List[int] = []
+        timelines: List[ExperienceTimeline] = []
+        education_relevance: List[int] = []
+
+        for index, evaluation in enumerate(evaluations):
+            for skill in evaluation.skills:
+                skill_owner.append(index)
+                skill_level.append(LEVEL_CODES[skill.level])
+                skill_relevance.append(RELEVANCE_CODES[skill.relevance])
+
+            timelines.append(
+                evaluation.experience_timeline if today is None
+                else ExperienceTimeline.from_experiences(evaluation.experiences, today)
+            )
+
+            education_relevance.append(
+                RELEVANCE_CODES[evaluation.education.relevance_level])
+
+        return cls(
+            size=len(education_relevance),
+            skill_owner=np.array(skill_owner, dtype=np.int64),
+            skill_level=np.array(skill_level, dtype=np.int8),
+            skill_relevance=np.array(skill_relevance, dtype=np.int8),
+            direct_years=np.array([t.direct_years for t in timelines], dtype=np.float64),
+            related_years=np.array([t.related_years for t in timelines], dtype=np.float64),
+            has_relevant=np.array([t.has_relevant for t in timelines], dtype=bool),
+            has_current=np.array([t.has_current for t in timelines], dtype=bool),
+            # Sin experiencia terminada: infinito, nunca cuenta como reciente
+            days_since_last_end=np.array(
+                [np.inf if t.days_since_last_end is None else t.days_since_last_end
+                 for t in timelines],
+                dtype=np.float64
+            ),
+            education_relevance=np.array(education_relevance, dtype=np.int8),
+        )
+
+    def skills_scores(self, config: Settings = None) -> np.ndarray:
+        """Equivalente vectorizado de SkillsCalculator.calculate_skills_score"""
+        config = config or settings
+        per_skill = (
+            _level_table(config)[self.skill_level]
+            * (_relevance_table(config) / 100)[self.skill_relevance]
+        )
+        # bincount acumula en el orden de entrada, igual que sum()
+        totals = np.bincount(self.skill_owner, weights=per_skill, minlength=self.size)
+        counts = np.bincount(self.skill_owner, minlength=self.size).astype(np.float64)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            averages = totals / counts
+        factors = np.minimum(counts / config.MIN_SKILLS, 1.0)
+        scores = np.where(counts > 0, averages * factors, 0.0)
+        return _round2(scores)
+
+    def experience_scores(self, config: Settings = None) -> np.ndarray:
+        """Equivalente vectorizado de ExperienceCalculator.calculate_experience_score"""
+        config = config or settings
+        recent = self.has_current | (
+            self.days_since_last_end <= config.RECENCY_YEARS * 365)
+
+        combined = (
+            self._type_scores(self.direct_years, config.DIRECT_SCORE, config)
+            * config.DIRECT_EXPERIENCE_WEIGHT
+            + self._type_scores(self.related_years, config.RELATED_SCORE, config)
+            * config.RELATED_EXPERIENCE_WEIGHT
+        )
+        combined = np.where(
+            recent, np.minimum(100, combined * (1 + config.RECENCY_BONUS)), combined)
+        return _round2(np.where(self.has_relevant, combined, 0.0))
+
+    @staticmethod
+    def _type_scores(years: np.ndarray, base_score: float, config: Settings) -> np.ndarray:
+        with np.errstate(invalid="ignore"):
+            factors = np.minimum(
+                np.log(years + 1) / np.log(config.MAX_YEARS_FULL_SCORE + 1), 1.0)
+        return np.where(years > 0, base_score * factors, 0.0)
+
+    def education_scores(self, config: Settings = None) -> np.ndarray:
+        """Equivalente vectorizado de EvaluationService.calculate_education_score"""
+        config = config or settings
+        return _relevance_table(config)[self.education_relevance]
+
+    def score(self, config: Settings = None) -> Dict[str, np.ndarray]:
+        """
+        Calcula todas las puntuaciones del lote.
+
+        Args:
+            config: Perfil de configuración (por defecto, la configuración activa)
+
+        Returns:
+            Dict con arrays experience, skills, education y final
+        """
+        config = config or settings
+        experience = self.experience_scores(config)
+        skills = self.skills_scores(config)
+        education = self.education_scores(config)
+        final = _round2(
+            experience * config.EXPERIENCE_WEIGHT
+            + skills * config.SKILLS_WEIGHT
+            + education * config.EDUCATION_WEIGHT
+        )
+        return {
+            "experience": experience,
+            "skills": skills,
+            "education": education,
+            "final": final,
+        }
+
+    def sweep(self, configs: Sequence[Settings]) -> np.ndarray:
+        """
+        Puntuación final de cada candidato bajo varios perfiles.
+
+        Returns:
+            Matriz (perfiles × candidatos) de puntuaciones finales
+        """
+        return np.vstack([self.score(config)["final"] for config in configs])
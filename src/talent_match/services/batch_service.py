@@ -0,0 +1,180 @@
+import asyncio
+import json
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from talent_match.config.settings import get_settings
+from talent_match.services.openai_service import OpenAIService, gather_or_cancel
+
+settings = get_settings()
+
+CV_FILE_SUFFIXES = {".txt", ".md"}
+
+
+@dataclass
+class BatchItem:
+    """A CV to evaluate in a batch run"""
+    cv_id: str
+    cv_text: str
+
+
+def iter_cv_inputs(path: str) -> Iterator[BatchItem]:
+    """
+    Stream CVs from a directory of text files or a JSONL file
+
+    Directories yield one item per .txt/.md file (id = file stem). JSONL
+    files must contain one object per line with "id" and "cv_text".
+    """
+    source = Path(path)
+    if source.is_dir():
+        for cv_file in sorted(source.iterdir()):
+            if cv_file.is_file() and cv_file.suffix.lower() in CV_FILE_SUFFIXES:
+                yield BatchItem(cv_file.stem, cv_file.read_text(encoding="utf-8"))
+        return
+
+    if not source.exists():
+        raise ValueError(f"Input {path} not found")
+
+    with open(source, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if "cv_text" not in record:
+                raise ValueError(f"Line {line_number} of {path} has no cv_text")
+            yield BatchItem(str(record.get("id", line_number)), record["cv_text"])
+
+
+class BatchCheckpoint:
+    """Append-only record of completed (CV, job title) pairs"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.completed: Set[str] = set()
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                # A torn last line just means that item is redone
+                self.completed = {line.rstrip("\n") for line in f if line.endswith("\n")}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    @staticmethod
+    def key(cv_id: str, job_title: str) -> str:
+        return json.dumps([cv_id, job_title], ensure_ascii=False)
+
+    def is_done(self, key: str) -> bool:
+        return key in self.completed
+
+    def mark_done(self, key: str):
+        self.completed.add(key)
+        self._file.write(key + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class BatchRunner:
+    """
+    Evaluates many CVs against one or more job titles with a bounded
+    number of concurrent evaluations, streaming results as they finish
+    """
+
+    def __init__(self,
+                 service: Optional[OpenAIService] = None,
+                 concurrency: int = settings.BATCH_CONCURRENCY):
+        self.service = service or OpenAIService()
+        self.concurrency = max(1, concurrency)
+
+    async def run(self,
+                  items: Iterable[BatchItem],
+                  job_titles: List[str],
+                  output_path: str,
+                  checkpoint_path: Optional[str] = None,
+                  progress: bool = False,
+                  shortlists: Optional[Dict[str, Dict[str, float]]] = None) -> Dict[str, Any]:
+        """
+        Run the batch, skipping pairs recorded in the checkpoint
+
+        Args:
+            items: CVs to evaluate (consumed lazily)
+            job_titles: Job titles every CV is evaluated against
+            output_path: JSONL file results are appended to
+            checkpoint_path: Checkpoint file (defaults to <output>.checkpoint)
+            progress: Print a progress line to stderr per finished item
+            shortlists: Only evaluate, for each job title, the CV ids in its
+                shortlist (id -> screening score, see screening_index)
+
+        Returns:
+            Run counters (succeeded, failed, skipped, screened_out)
+        """
+        checkpoint = BatchCheckpoint(checkpoint_path or f"{output_path}.checkpoint")
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        counters = {"succeeded": 0, "failed": 0, "skipped": 0, "screened_out": 0}
+
+        # Bounded queue keeps memory flat however large the input is
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+
+        with open(output_path, "a", encoding="utf-8") as output:
+
+            def write(record: Dict[str, Any]):
+                output.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                output.flush()
+
+            async def produce():
+                for item in items:
+                    for job_title in job_titles:
+                        if shortlists is not None and item.cv_id not in shortlists[job_title]:
+                            counters["screened_out"] += 1
+                            continue
+                        key = BatchCheckpoint.key(item.cv_id, job_title)
+                        if checkpoint.is_done(key):
+                            counters["skipped"] += 1
+                            continue
+                        await queue.put((key, item, job_title))
+                for _ in range(self.concurrency):
+                    await queue.put(None)
+
+            async def work():
+                while (job := await queue.get()) is not None:
+                    key, item, job_title = job
+                    record = {"cv_id": item.cv_id, "job_title": job_title}
+                    if shortlists is not None:
+                        record["screening_score"] = shortlists[job_title][item.cv_id]
+                    try:
+                        evaluation = await self.service.analyze_cv(item.cv_text, job_title)
+                    except Exception as e:
+                        counters["failed"] += 1
+                        write({
+                            **record,
+                            "status": "error",
+                            "error": str(e),
+                            "session_id": getattr(e, "session_id", None),
+                        })
+                    else:
+                        counters["succeeded"] += 1
+                        write({
+                            **record,
+                            "status": "ok",
+                            "fit_score": evaluation.summary.fit_score,
+                            "evaluation": evaluation.model_dump(mode="json"),
+                        })
+                        # Only checkpoint once the result line is on disk
+                        checkpoint.mark_done(key)
+                    if progress:
+                        print(
+                            f"[{counters['succeeded']} ok / {counters['failed']} failed] "
+                            f"{item.cv_id} → {job_title}",
+                            file=sys.stderr
+                        )
+
+            try:
+                await gather_or_cancel(
+                    produce(), *(work() for _ in range(self.concurrency)))
+            finally:
+                checkpoint.close()
+
+        return counters
@@ -0,0 +1,205 @@
+import gzip
+import hashlib
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+from talent_match.config.settings import get_settings
+from talent_match.services.log_writer import write_file
+
+try:
+    import zstandard
+except ImportError:  # optional: smaller and faster blobs when installed
+    zstandard = None
+
+settings = get_settings()
+
+CODECS = ("auto", "zstd", "gzip")
+
+# Directory of the blobs inside a log directory; session scans skip it
+BLOB_DIR = ".blobs"
+
+# JSON reference to a blob: {"$blob": "<sha256 of the text>"}
+BLOB_REF = "$blob"
+
+_EXTENSIONS = {"zstd": ".zst", "gzip": ".gz"}
+
+# Blob references in serialized JSON (compact or indented)
+_REF_PATTERN = re.compile(rb'"\$blob":\s*"([0-9a-f]{64})"')
+
+
+def _compress(codec: str, content: bytes) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(content)
+    return gzip.compress(content, compresslevel=6, mtime=0)
+
+
+def _decompress(codec: str, content: bytes) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Reading zstd blobs requires the zstandard package")
+        return zstandard.ZstdDecompressor().decompress(content)
+    return gzip.decompress(content)
+
+
+class BlobStore:
+    """
+    Content-addressed store of compressed text
+
+    Every text is stored once under the SHA-256 of its content, so the same
+    CV or prompt logged by many sessions takes the space of one compressed
+    copy. Blobs are immutable; writing an existing one only refreshes its
+    modification time, which tells sweeps it is still in use.
+    """
+
+    def __init__(self, root: str, codec: str = settings.LOG_BLOB_CODEC):
+        """
+        Args:
+            root: Directory of the blobs
+            codec: "zstd", "gzip" or "auto" (zstd if zstandard is installed)
+        """
+        if codec not in CODECS:
+            raise ValueError(f"Unknown blob codec {codec!r}; expected one of {', '.join(CODECS)}")
+        if codec == "auto":
+            codec = "zstd" if zstandard is not None else "gzip"
+        elif codec == "zstd" and zstandard is None:
+            raise ValueError("The zstd blob codec requires the zstandard package")
+        self.root = Path(root)
+        self.codec = codec
+
+    def _path(self, digest: str, codec: str) -> Path:
+        return self.root / digest[:2] / f"{digest}{_EXTENSIONS[codec]}"
+
+    def put(self, text: str) -> str:
+        """
+        Store a text
+
+        Returns:
+            Its digest, to be referenced with ref()
+        """
+        content = text.encode("utf-8")
+        digest = hashlib.sha256(content).hexdigest()
+        for codec in _EXTENSIONS:
+            try:
+                # Touch it so a concurrent sweep keeps it (see sweep_blobs)
+                os.utime(self._path(digest, codec))
+                return digest
+            except FileNotFoundError:
+                continue
+        write_file(self._path(digest, self.codec), _compress(self.codec, content))
+        return digest
+
+    def get(self, digest: str) -> str:
+        """Text of a blob; raises FileNotFoundError if it is missing"""
+        for codec in (self.codec, *(c for c in _EXTENSIONS if c != self.codec)):
+            try:
+                with open(self._path(digest, codec), "rb") as f:
+                    return _decompress(codec, f.read()).decode("utf-8")
+            except FileNotFoundError:
+                continue
+        raise FileNotFoundError(f"Blob {digest} not found in {self.root}")
+
+    def ref(self, text: str) -> Dict[str, str]:
+        """Store a text and return the JSON reference to it"""
+        return {BLOB_REF: self.put(text)}
+
+    def entries(self) -> Iterator[Tuple[str, float]]:
+        """Digest and modification time of every stored blob"""
+        if not self.root.exists():
+            return
+        for path in self.root.glob("*/*"):
+            if path.name.startswith("."):
+                continue
+            try:
+                yield path.name.split(".", 1)[0], path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+
+    def delete(self, digest: str, unless_touched_since: Optional[float] = None) -> int:
+        """
+        Remove a blob
+
+        Args:
+            digest: Blob to remove
+            unless_touched_since: Keep it if it was written or touched at or
+                after this timestamp
+
+        Returns:
+            The bytes freed
+        """
+        freed = 0
+        for codec in _EXTENSIONS:
+            path = self._path(digest, codec)
+            try:
+                stat = path.stat()
+                if unless_touched_since is not None and stat.st_mtime >= unless_touched_since:
+                    continue
+                path.unlink()
+                freed += stat.st_size
+            except FileNotFoundError:
+                continue
+        return freed
+
+
+def is_blob_ref(value: Any) -> bool:
+    return isinstance(value, dict) and len(value) == 1 and BLOB_REF in value
+
+
+def resolve_blobs(data: Any, blobs: Optional[BlobStore]) -> Any:
+    """
+    Replace blob references by their text, anywhere in a JSON value
+
+    Args:
+        data: Parsed JSON
+        blobs: Store the references point to (None leaves data unchanged)
+    """
+    if blobs is None:
+        return data
+    if is_blob_ref(data):
+        return blobs.get(data[BLOB_REF])
+    if isinstance(data, dict):
+        return {key: resolve_blobs(value, blobs) for key, value in data.items()}
+    if isinstance(data, list):
+        return [resolve_blobs(value, blobs) for value in data]
+    return data
+
+
+def referenced_digests(content: bytes) -> Set[str]:
+    """Digests referenced from a serialized JSON document"""
+    return {match.decode("ascii") for match in _REF_PATTERN.findall(content)}
+
+
+def externalize_text(text: Any, blobs: Optional[BlobStore],
+                     min_size: int = settings.LOG_BLOB_MIN_SIZE) -> Any:
+    """Reference to a blob of the text, or the value itself if short or not text"""
+    if blobs is None or not isinstance(text, str) or len(text) < min_size:
+        return text
+    return blobs.ref(text)
+
+
+def externalize_prompt_result(prompt_result: Dict[str, Any],
+                              blobs: Optional[BlobStore]) -> Dict[str, Any]:
+    """Copy of a prompt result log with its prompt text and messages in blobs"""
+    if blobs is None:
+        return prompt_result
+    result = dict(prompt_result)
+    result["prompt_text"] = externalize_text(result.get("prompt_text"), blobs)
+    if result.get("messages"):
+        result["messages"] = [
+            {**message, "content": externalize_text(message.get("content"), blobs)}
+            for message in result["messages"]
+        ]
+    return result
+
+
+def blob_root(base_log_dir: str) -> str:
+    """Blob directory of a log directory"""
+    return str(Path(base_log_dir).resolve() / BLOB_DIR)
+
+
+@lru_cache()
+def get_blob_store(root: str) -> BlobStore:
+    """Shared store for a blob directory (see blob_root)"""
+    return BlobStore(root)
@@ -0,0 +1,236 @@
+import asyncio
+import atexit
+import concurrent.futures
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+from talent_match.config.settings import get_settings
+
+settings = get_settings()
+
+
+@dataclass(eq=False)
+class _ClientEntry:
+    client: AsyncOpenAI
+    loop: asyncio.AbstractEventLoop
+    last_used: float
+    leases: int = 0
+    retired: bool = False
+
+
+class ClientRegistry:
+    """
+    Process-wide LRU of AsyncOpenAI clients keyed by API key and base URL.
+
+    Each client owns a keep-alive HTTP connection pool, so evaluations that
+    share a key reuse warm connections instead of paying a new TLS handshake.
+    Async clients are bound to the event loop they run on, so entries are
+    also keyed by loop; callers without a long-lived loop of their own (the
+    Streamlit page) should submit their coroutines through `run`, which
+    executes them on a shared background loop.
+    """
+
+    def __init__(self,
+                 max_size: int = settings.CLIENT_POOL_MAX_SIZE,
+                 idle_timeout: float = settings.CLIENT_POOL_IDLE_TIMEOUT):
+        """
+        Initialize the registry
+
+        Args:
+            max_size: Maximum number of pooled clients before LRU eviction
+            idle_timeout: Seconds a client may stay unused before eviction
+        """
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._entries: "OrderedDict[tuple, _ClientEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+
+    @asynccontextmanager
+    async def lease(self, api_key: str, base_url: Optional[str] = None):
+        """
+        Borrow the pooled client for an API key for the duration of a call.
+
+        A client evicted while leased is only closed once its last lease is
+        released, so in-flight requests are never cut off.
+        """
+        entry = self._acquire(api_key, base_url)
+        try:
+            yield entry.client
+        finally:
+            with self._lock:
+                entry.leases -= 1
+                close_now = entry.retired and entry.leases == 0
+            if close_now:
+                await entry.client.close()
+
+    def _acquire(self, api_key: str, base_url: Optional[str]) -> _ClientEntry:
+        loop = asyncio.get_running_loop()
+        key = (api_key, base_url, loop)
+        now = time.monotonic()
+
+        with self._lock:
+            evicted = self._evict_idle_locked(now)
+
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _ClientEntry(
+                    client=self._create_client(api_key, base_url),
+                    loop=loop,
+                    last_used=now
+                )
+                self._entries[key] = entry
+                while len(self._entries) > self.max_size:
+                    _, oldest = self._entries.popitem(last=False)
+                    evicted.append(oldest)
+            else:
+                self._entries.move_to_end(key)
+
+            entry.last_used = now
+            entry.leases += 1
+            for old in evicted:
+                old.retired = True
+            to_close = [old for old in evicted if old.leases == 0]
+
+        for old in to_close:
+            self._schedule_close(old)
+        return entry
+
+    def _create_client(self, api_key: str, base_url: Optional[str]) -> AsyncOpenAI:
+        http_client = DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+            )
+        )
+        # Retries are handled by the request scheduler
+        return AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=http_client,
+            max_retries=0
+        )
+
+    def _evict_idle_locked(self, now: float) -> list:
+        """Remove clients idle for too long or bound to a closed loop"""
+        evicted = []
+        for key, entry in list(self._entries.items()):
+            if entry.loop.is_closed() or now - entry.last_used > self.idle_timeout:
+                del self._entries[key]
+                evicted.append(entry)
+        return evicted
+
+    def evict_idle(self):
+        """Close every client that exceeded the idle timeout"""
+        with self._lock:
+            evicted = self._evict_idle_locked(time.monotonic())
+            for entry in evicted:
+                entry.retired = True
+            to_close = [entry for entry in evicted if entry.leases == 0]
+        for entry in to_close:
+            self._schedule_close(entry)
+
+    def _schedule_close(self, entry: _ClientEntry):
+        """Close a client on the loop that owns its connections"""
+        loop = entry.loop
+        if loop.is_closed():
+            # Its connections died with the loop
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            loop.create_task(entry.client.close())
+        elif loop.is_running():
+            asyncio.run_coroutine_threadsafe(entry.client.close(), loop)
+
+    async def aclose_loop_clients(self):
+        """Close every client bound to the running loop (call before it stops)"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entries = [
+                self._entries.pop(key)
+                for key in list(self._entries)
+                if key[2] is loop
+            ]
+        await asyncio.gather(
+            *(entry.client.close() for entry in entries),
+            return_exceptions=True
+        )
+
+    def run(self, coro, timeout: Optional[float] = None):
+        """
+        Run a coroutine on the registry's background event loop and wait
+        for its result from the calling thread.
+
+        Safe to call concurrently from several threads (e.g. one per
+        Streamlit session); all of them share the same pooled clients.
+        """
+        return self.submit(coro).result(timeout)
+
+    def submit(self, coro) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the registry's background event loop
+        without waiting for it; the returned future can be polled from
+        the calling thread.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="client-registry-loop",
+                    daemon=True
+                )
+                self._loop_thread.start()
+            return self._loop
+
+    def close(self, timeout: float = 5.0):
+        """Close all pooled clients and stop the background loop"""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+            loop, thread = self._loop, self._loop_thread
+            self._loop = self._loop_thread = None
+
+        for entry in entries:
+            if entry.loop is loop:
+                continue
+            self._schedule_close(entry)
+
+        if loop is not None and not loop.is_closed():
+            owned = [entry for entry in entries if entry.loop is loop]
+
+            async def _shutdown():
+                await asyncio.gather(
+                    *(entry.client.close() for entry in owned),
+                    return_exceptions=True
+                )
+
+            try:
+                asyncio.run_coroutine_threadsafe(_shutdown(), loop).result(timeout)
+            finally:
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join(timeout)
+                loop.close()
+
+
+@lru_cache()
+def get_client_registry() -> ClientRegistry:
+    registry = ClientRegistry()
+    atexit.register(registry.close)
+    return registry
@@ -1,6 +1,6 @@
-from typing import List
+from typing import Dict, List
 
-from talent_match.config.settings import get_settings
+from talent_match.config.settings import Settings, get_settings
 from talent_match.models.evaluation import (
     CompleteEvaluation,
     EducationEvaluation,
@@ -13,26 +13,41 @@ from talent_match.services.skills_calculator import SkillsCalculator
 
 settings = get_settings()
 
+# Ajustes de los que depende la puntuación: pesos, escalas y multiplicadores
+SCORING_SETTINGS = (
+    "EXPERIENCE_WEIGHT", "SKILLS_WEIGHT", "EDUCATION_WEIGHT",
+    "MAX_YEARS_FULL_SCORE", "DIRECT_SCORE", "RELATED_SCORE", "RECENCY_BONUS",
+    "RECENCY_YEARS", "DIRECT_EXPERIENCE_WEIGHT", "RELATED_EXPERIENCE_WEIGHT",
+    "MIN_SKILLS", "SKILL_BASIC_SCORE", "SKILL_INTERMEDIATE_SCORE", "SKILL_ADVANCED_SCORE",
+    "RELEVANCE_NONE", "RELEVANCE_VERY_LOW", "RELEVANCE_LOW", "RELEVANCE_MEDIUM",
+    "RELEVANCE_HIGH", "RELEVANCE_VERY_HIGH",
+    "EDUCATION_NONE", "EDUCATION_VERY_LOW", "EDUCATION_LOW", "EDUCATION_MEDIUM",
+    "EDUCATION_HIGH", "EDUCATION_VERY_HIGH",
+)
+
 class EvaluationService:
     """
     Servicio para calcular puntuaciones basadas en evaluaciones cualitativas.
     """
     
     @staticmethod
-    def calculate_experience_score(experiences: List[RelevantExperience]) -> float:
+    def calculate_experience_score(experiences: List[RelevantExperience],
+                                   config: Settings = None) -> float:
         """
         Calcula la puntuación de experiencia usando el nuevo calculador especializado.
         
         Args:
             experiences: Lista de experiencias relevantes evaluadas
+            config: Perfil de configuración (por defecto, la configuración activa)
 
         Returns:
             float: Puntuación entre 0 y 100
         """
-        return ExperienceCalculator.calculate_experience_score(experiences)
+        return ExperienceCalculator.calculate_experience_score(experiences, config)
     
     @staticmethod
-    def calculate_skills_score(skills: List[SkillEvaluation]) -> float:
+    def calculate_skills_score(skills: List[SkillEvaluation],
+                               config: Settings = None) -> float:
         """
         Calcula la puntuación de habilidades basada en los niveles evaluados.
         
@@ -43,15 +58,17 @@ class EvaluationService:
         
         Args:
             skills: Lista de habilidades evaluadas
+            config: Perfil de configuración (por defecto, la configuración activa)
 
         Returns:
             float: Puntuación entre 0 y 100
         """
-        return SkillsCalculator.calculate_skills_score(skills)
+        return SkillsCalculator.calculate_skills_score(skills, config)
 
     
     @staticmethod
-    def calculate_education_score(education: EducationEvaluation) -> float:
+    def calculate_education_score(education: EducationEvaluation,
+                                  config: Settings = None) -> float:
         """
         Calcula la puntuación de educación basada en el nivel de relevancia.
         
@@ -65,32 +82,58 @@ class EvaluationService:
         
         Args:
             education: Evaluación de la formación académica
+            config: Perfil de configuración (por defecto, la configuración activa)
 
         Returns:
             float: Puntuación entre 0 y 100
         """
-        return ScoreCalculator.relevance_to_score(education.relevance_level)
+        return ScoreCalculator.relevance_to_score(education.relevance_level, config)
     
-    def calculate_final_score(self, evaluation: CompleteEvaluation) -> float:
+    def calculate_scores(self, evaluation: CompleteEvaluation,
+                         config: Settings = None) -> Dict[str, float]:
         """
-        Calcula la puntuación final ponderando los diferentes aspectos evaluados.
+        Calcula todas las puntuaciones parciales y la final de una evaluación.
         
         Args:
             evaluation: Evaluación completa del CV
+            config: Perfil de configuración (por defecto, la configuración activa)
 
         Returns:
-            float: Puntuación final entre 0 y 100
+            Dict con las puntuaciones experience, skills, education y final
         """
+        config = config or settings
+        
         # Calcular puntuaciones individuales
-        exp_score = self.calculate_experience_score(evaluation.experiences)
-        skills_score = self.calculate_skills_score(evaluation.skills)
-        edu_score = self.calculate_education_score(evaluation.education)
+        # La línea temporal se calcula una sola vez por evaluación
+        exp_score = ExperienceCalculator.score_timeline(
+            evaluation.experience_timeline, config)
+        skills_score = self.calculate_skills_score(evaluation.skills, config)
+        edu_score = self.calculate_education_score(evaluation.education, config)
         
         # Calcular puntuación final ponderada
         final_score = (
-            exp_score * settings.EXPERIENCE_WEIGHT +
-            skills_score * settings.SKILLS_WEIGHT +
-            edu_score * settings.EDUCATION_WEIGHT
+            exp_score * config.EXPERIENCE_WEIGHT +
+            skills_score * config.SKILLS_WEIGHT +
+            edu_score * config.EDUCATION_WEIGHT
         )
         
-        return round(final_score, 2)
\ No newline at end of file
+        return {
+            "experience": exp_score,
+            "skills": skills_score,
+            "education": edu_score,
+            "final": round(final_score, 2)
+        }
+    
+    def calculate_final_score(self, evaluation: CompleteEvaluation,
+                              config: Settings = None) -> float:
+        """
+        Calcula la puntuación final ponderando los diferentes aspectos evaluados.
+        
+        Args:
+            evaluation: Evaluación completa del CV
+            config: Perfil de configuración (por defecto, la configuración activa)
+
+        Returns:
+            float: Puntuación final entre 0 y 100
+        """
+        return self.calculate_scores(evaluation, config)["final"]
\ No newline at end of file
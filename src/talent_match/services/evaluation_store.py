@@ -0,0 +1,584 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from talent_match.config.settings import get_settings
+from talent_match.services.blob_store import (
+    BlobStore,
+    blob_root,
+    externalize_prompt_result,
+    externalize_text,
+    get_blob_store,
+    referenced_digests,
+    resolve_blobs,
+)
+from talent_match.services.result_cache import normalize_cv_text
+
+settings = get_settings()
+
+Timestamp = Union[str, datetime]
+
+SESSION_COLUMNS = ("session_id", "job_title", "timestamp", "status", "fit_score", "cv_hash")
+ORDER_COLUMNS = ("timestamp", "fit_score", "job_title", "session_id")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    job_title TEXT NOT NULL,
+    job_key TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    cv_hash TEXT NOT NULL,
+    cv_text TEXT NOT NULL,  -- JSON: the text or a blob reference
+    status TEXT NOT NULL,
+    fit_score REAL,
+    final_evaluation TEXT,
+    error TEXT,
+    fingerprint TEXT  -- model, backend, prompts and scoring of the evaluation
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_job ON sessions (job_key, timestamp);
+CREATE INDEX IF NOT EXISTS idx_sessions_timestamp ON sessions (timestamp);
+CREATE INDEX IF NOT EXISTS idx_sessions_fit_score ON sessions (fit_score);
+CREATE INDEX IF NOT EXISTS idx_sessions_cv_hash ON sessions (cv_hash);
+CREATE TABLE IF NOT EXISTS prompt_results (
+    session_id TEXT NOT NULL,
+    prompt_type TEXT NOT NULL,
+    timestamp TEXT,
+    prompt_text TEXT,
+    messages TEXT,
+    response TEXT NOT NULL,
+    metadata TEXT,
+    PRIMARY KEY (session_id, prompt_type)
+);
+"""
+
+
+def cv_hash(cv_text: str) -> str:
+    """Hash of the normalized CV text, shared by cosmetically different copies"""
+    return hashlib.sha256(normalize_cv_text(cv_text).encode("utf-8")).hexdigest()
+
+
+def job_key(job_title: str) -> str:
+    """Job title as indexed: case and surrounding whitespace are ignored"""
+    return job_title.strip().casefold()
+
+
+def _iso(value: Optional[Timestamp]) -> Optional[str]:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _dumps(data: Any) -> Optional[str]:
+    if data is None:
+        return None
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _loads(text: Optional[str]) -> Any:
+    return None if text is None else json.loads(text)
+
+
+class EvaluationStore:
+    """
+    SQLite store of logging sessions, prompt results and final evaluations
+
+    Sessions are indexed by id, job title, timestamp, fit score and CV hash
+    so history queries do not walk the log directory. Statuses follow the
+    file logs: a final evaluation wins over an error of an earlier attempt.
+    Prompt texts and messages may be blob references, as in the file logs.
+    """
+
+    def __init__(self, path: str, blobs: Optional[BlobStore] = None):
+        """
+        Initialize the store
+
+        Args:
+            path: SQLite database file
+            blobs: Store blob references are resolved from (and imported
+                sessions are externalized to)
+        """
+        self.path = Path(path)
+        self.blobs = blobs
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(sessions)")}
+        if "fingerprint" not in columns:
+            # Stores created before evaluation fingerprints were recorded
+            self._db.execute("ALTER TABLE sessions ADD COLUMN fingerprint TEXT")
+        self._db.commit()
+
+    # Writes
+
+    def add_session(self, session_id: str, job_title: str, timestamp: Timestamp,
+                    cv_text: str):
+        """Record a new session (replaces a session with the same id)"""
+        with self._lock:
+            self._add_session_locked(session_id, job_title, _iso(timestamp), cv_text)
+            self._db.commit()
+
+    def add_prompt_result(self, session_id: str, prompt_result: Dict[str, Any]):
+        """
+        Record a prompt result
+
+        Args:
+            session_id: Session the result belongs to
+            prompt_result: Entry as logged by CVLoggingService.log_prompt_result
+        """
+        with self._lock:
+            self._add_prompt_result_locked(session_id, prompt_result)
+            self._db.commit()
+
+    def set_final_evaluation(self, session_id: str, evaluation: Dict[str, Any],
+                             fingerprint: Optional[str] = None):
+        """
+        Record the final evaluation of a session and mark it completed
+
+        Args:
+            session_id: Session the evaluation belongs to
+            evaluation: Complete evaluation
+            fingerprint: Hash of the model, backend, prompts and scoring
+                settings it was produced with, if known (a recorded one is
+                kept otherwise)
+        """
+        with self._lock:
+            self._set_final_evaluation_locked(session_id, evaluation, fingerprint)
+            self._db.commit()
+
+    def set_error(self, session_id: str, error: Dict[str, Any]):
+        """Record the failure of an attempt; completed sessions stay completed"""
+        with self._lock:
+            self._set_error_locked(session_id, error)
+            self._db.commit()
+
+    def _add_session_locked(self, session_id: str, job_title: str, timestamp: str,
+                            cv_text: str):
+        self._db.execute(
+            "INSERT OR REPLACE INTO sessions "
+            "(session_id, job_title, job_key, timestamp, cv_hash, cv_text, status) "
+            "VALUES (?, ?, ?, ?, ?, ?, 'running')",
+            (session_id, job_title, job_key(job_title), timestamp, cv_hash(cv_text),
+             _dumps(self._externalize(cv_text)))
+        )
+
+    def _add_prompt_result_locked(self, session_id: str, prompt_result: Dict[str, Any]):
+        self._db.execute(
+            "INSERT OR REPLACE INTO prompt_results "
+            "(session_id, prompt_type, timestamp, prompt_text, messages, response, metadata) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                session_id,
+                prompt_result["prompt_type"],
+                prompt_result.get("timestamp"),
+                _dumps(prompt_result.get("prompt_text")),
+                _dumps(prompt_result.get("messages")),
+                _dumps(prompt_result["response"]),
+                _dumps(prompt_result.get("metadata")),
+            )
+        )
+
+    def _set_final_evaluation_locked(self, session_id: str, evaluation: Dict[str, Any],
+                                     fingerprint: Optional[str] = None):
+        fit_score = (evaluation.get("summary") or {}).get("fit_score")
+        self._db.execute(
+            "UPDATE sessions SET status = 'completed', fit_score = ?, final_evaluation = ?, "
+            "fingerprint = COALESCE(?, fingerprint) WHERE session_id = ?",
+            (fit_score, _dumps(evaluation), fingerprint, session_id)
+        )
+
+    def _set_error_locked(self, session_id: str, error: Dict[str, Any]):
+        self._db.execute(
+            "UPDATE sessions SET error = ?, "
+            "status = CASE WHEN status = 'completed' THEN status ELSE 'failed' END "
+            "WHERE session_id = ?",
+            (_dumps(error), session_id)
+        )
+
+    def _externalize(self, value: Any) -> Any:
+        """CV text or prompt result with its long texts moved to blobs"""
+        if not settings.LOG_BLOBS_ENABLED:
+            return value
+        if isinstance(value, dict):
+            return externalize_prompt_result(value, self.blobs)
+        return externalize_text(value, self.blobs)
+
+    # Reads
+
+    def session_info(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Session info as stored in session_info.json, or None if unknown"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT job_title, timestamp, cv_text FROM sessions WHERE session_id = ?",
+                (session_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"session_id": session_id, "job_title": row[0], "timestamp": row[1],
+                "cv_text": resolve_blobs(json.loads(row[2]), self.blobs)}
+
+    def prompt_responses(self, session_id: str) -> Dict[str, Dict[str, Any]]:
+        """Logged model responses of a session, by prompt type"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT prompt_type, response FROM prompt_results WHERE session_id = ?",
+                (session_id,)
+            ).fetchall()
+        return {prompt_type: json.loads(response) for prompt_type, response in rows}
+
+    def session_status(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        State of a session, shaped like CVLoggingService.load_session_status
+
+        Returns:
+            Status dict, or None if the session is not in the store
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT job_title, timestamp, status, final_evaluation, error "
+                "FROM sessions WHERE session_id = ?",
+                (session_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job_title, timestamp, status, final_evaluation, error = row
+        result = {
+            "session_id": session_id,
+            "job_title": job_title,
+            "timestamp": timestamp,
+            "status": status,
+        }
+        if status == "completed":
+            result["final_evaluation"] = _loads(final_evaluation)
+        elif status == "failed":
+            result["error"] = _loads(error)
+        return result
+
+    def load_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Complete session data, shaped like CVLoggingService.load_session
+
+        Returns:
+            Session dict, or None if the session is not in the store
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT job_title, timestamp, cv_text, final_evaluation, error "
+                "FROM sessions WHERE session_id = ?",
+                (session_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            prompt_rows = self._db.execute(
+                "SELECT prompt_type, timestamp, prompt_text, messages, response, metadata "
+                "FROM prompt_results WHERE session_id = ?",
+                (session_id,)
+            ).fetchall()
+
+        job_title, timestamp, cv_text, final_evaluation, error = row
+        session = {
+            "session_id": session_id,
+            "job_title": job_title,
+            "timestamp": timestamp,
+            "cv_text": json.loads(cv_text),
+        }
+        if prompt_rows:
+            session["prompt_results"] = {}
+            for prompt_type, logged_at, prompt_text, messages, response, metadata in prompt_rows:
+                result = {
+                    "timestamp": logged_at,
+                    "prompt_type": prompt_type,
+                    "prompt_text": _loads(prompt_text),
+                    "messages": _loads(messages),
+                    "response": json.loads(response),
+                }
+                if metadata is not None:
+                    result["metadata"] = json.loads(metadata)
+                session["prompt_results"][prompt_type] = result
+        if final_evaluation is not None:
+            session["final_evaluation"] = json.loads(final_evaluation)
+        if error is not None:
+            session["error"] = json.loads(error)
+        return resolve_blobs(session, self.blobs)
+
+    def _where(self, job_title: Optional[str] = None,
+               since: Optional[Timestamp] = None,
+               until: Optional[Timestamp] = None,
+               min_score: Optional[float] = None,
+               max_score: Optional[float] = None,
+               cv_text: Optional[str] = None,
+               cv_hash_value: Optional[str] = None,
+               status: Optional[str] = None,
+               fingerprint: Optional[str] = None) -> Tuple[str, List[Any]]:
+        clauses, params = [], []
+        for clause, value in (
+            ("job_key = ?", job_key(job_title) if job_title is not None else None),
+            ("timestamp >= ?", _iso(since)),
+            ("timestamp < ?", _iso(until)),
+            ("fit_score >= ?", min_score),
+            ("fit_score <= ?", max_score),
+            ("cv_hash = ?", cv_hash(cv_text) if cv_text is not None else cv_hash_value),
+            ("status = ?", status),
+            ("fingerprint = ?", fingerprint),
+        ):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def find(self,
+             job_title: Optional[str] = None,
+             since: Optional[Timestamp] = None,
+             until: Optional[Timestamp] = None,
+             min_score: Optional[float] = None,
+             max_score: Optional[float] = None,
+             cv_text: Optional[str] = None,
+             cv_hash: Optional[str] = None,
+             status: Optional[str] = None,
+             fingerprint: Optional[str] = None,
+             order_by: str = "timestamp",
+             descending: bool = True,
+             limit: Optional[int] = 100,
+             offset: int = 0,
+             include_evaluation: bool = False) -> List[Dict[str, Any]]:
+        """
+        Query sessions
+
+        Args:
+            job_title: Sessions for this job title (case-insensitive)
+            since: Sessions started at or after this time
+            until: Sessions started before this time
+            min_score: Minimum fit score (only completed sessions have one)
+            max_score: Maximum fit score
+            cv_text: Sessions for this CV (compared by normalized hash)
+            cv_hash: Sessions for this CV hash
+            status: "running", "completed" or "failed"
+            fingerprint: Completed sessions evaluated with this fingerprint
+                (see set_final_evaluation)
+            order_by: One of ORDER_COLUMNS
+            descending: Sort order
+            limit: Maximum number of rows (None for all)
+            offset: Rows to skip, for paging
+            include_evaluation: Add the parsed final evaluation to each row
+
+        Returns:
+            Rows with SESSION_COLUMNS (plus "final_evaluation" if requested)
+        """
+        if order_by not in ORDER_COLUMNS:
+            raise ValueError(
+                f"Unknown order column {order_by!r}; expected one of {', '.join(ORDER_COLUMNS)}")
+        where, params = self._where(
+            job_title, since, until, min_score, max_score, cv_text, cv_hash, status,
+            fingerprint)
+        columns = SESSION_COLUMNS + (("final_evaluation",) if include_evaluation else ())
+        query = (
+            f"SELECT {', '.join(columns)} FROM sessions{where} "
+            f"ORDER BY {order_by} {'DESC' if descending else 'ASC'}, session_id"
+        )
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+
+        results = []
+        for row in rows:
+            result = dict(zip(columns, row))
+            if include_evaluation:
+                result["final_evaluation"] = _loads(result["final_evaluation"])
+            results.append(result)
+        return results
+
+    def count(self, job_title: Optional[str] = None,
+              since: Optional[Timestamp] = None,
+              until: Optional[Timestamp] = None,
+              min_score: Optional[float] = None,
+              max_score: Optional[float] = None,
+              cv_text: Optional[str] = None,
+              cv_hash: Optional[str] = None,
+              status: Optional[str] = None) -> int:
+        """Number of sessions matching the filters of find"""
+        where, params = self._where(
+            job_title, since, until, min_score, max_score, cv_text, cv_hash, status)
+        with self._lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM sessions{where}", params).fetchone()[0]
+
+    def iter_final_evaluations(self, chunk_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Stream completed sessions in id order
+
+        Yields:
+            Dicts with session_id, job_title, timestamp and the evaluation dict
+        """
+        last = ""
+        while True:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT session_id, job_title, timestamp, final_evaluation FROM sessions "
+                    "WHERE status = 'completed' AND session_id > ? "
+                    "ORDER BY session_id LIMIT ?",
+                    (last, chunk_size)
+                ).fetchall()
+            if not rows:
+                return
+            for session_id, job_title, timestamp, final_evaluation in rows:
+                yield {
+                    "session_id": session_id,
+                    "job_title": job_title,
+                    "timestamp": timestamp,
+                    "evaluation": json.loads(final_evaluation),
+                }
+            last = rows[-1][0]
+
+    def iter_completed_cvs(self, chunk_size: int = 1000) -> Iterator[Tuple[str, str]]:
+        """
+        Stream one CV text per hash among the completed sessions
+
+        Yields:
+            (cv_hash, cv_text) in hash order
+        """
+        last = ""
+        while True:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT cv_hash, MIN(cv_text) FROM sessions "
+                    "WHERE status = 'completed' AND cv_hash > ? "
+                    "GROUP BY cv_hash ORDER BY cv_hash LIMIT ?",
+                    (last, chunk_size)
+                ).fetchall()
+            if not rows:
+                return
+            for hash_value, cv_text in rows:
+                yield hash_value, resolve_blobs(json.loads(cv_text), self.blobs)
+            last = rows[-1][0]
+
+    # Import
+
+    def import_session(self, session: Dict[str, Any]):
+        """Insert or replace a whole session as returned by load_session"""
+        with self._lock:
+            self._import_session_locked(session)
+            self._db.commit()
+
+    def _import_session_locked(self, session: Dict[str, Any]):
+        session_id = session["session_id"]
+        self._db.execute("DELETE FROM prompt_results WHERE session_id = ?", (session_id,))
+        self._add_session_locked(
+            session_id, session.get("job_title") or "", session.get("timestamp") or "",
+            session.get("cv_text") or "")
+        for prompt_type, result in (session.get("prompt_results") or {}).items():
+            if "response" in result:
+                self._add_prompt_result_locked(
+                    session_id, self._externalize({"prompt_type": prompt_type, **result}))
+        if "error" in session:
+            self._set_error_locked(session_id, session["error"])
+        if "final_evaluation" in session:
+            self._set_final_evaluation_locked(
+                session_id, session["final_evaluation"], session.get("fingerprint"))
+
+    def import_log_dir(self, base_log_dir: str = "logs/cv_analysis",
+                       batch_size: int = 500,
+                       progress: Optional[Callable[[int], None]] = None) -> Dict[str, int]:
+        """
+        Import the sessions of a log directory (usually the one the store
+        indexes, but any session tree can be merged in)
+
+        Sessions are replaced if already present, so the import can be run
+        again to pick up sessions logged since. Sessions compacted into the
+        archive are imported too.
+
+        Args:
+            base_log_dir: Log directory written by CVLoggingService
+            batch_size: Sessions committed per transaction
+            progress: Called with the number of sessions processed so far
+
+        Returns:
+            Counts of imported and skipped (unreadable) sessions
+        """
+        from talent_match.services.log_archive import get_log_archive
+        from talent_match.services.logging_service import CVLoggingService, session_from_files
+
+        counts = {"imported": 0, "skipped": 0}
+        pending: List[Dict[str, Any]] = []
+
+        def commit():
+            with self._lock:
+                for session in pending:
+                    self._import_session_locked(session)
+                self._db.commit()
+            counts["imported"] += len(pending)
+            pending.clear()
+
+        def add(load):
+            try:
+                pending.append(load())
+            except (OSError, ValueError):
+                # No session info or unreadable files (ValueError covers bad JSON)
+                counts["skipped"] += 1
+                return
+            if len(pending) >= batch_size:
+                commit()
+                if progress is not None:
+                    progress(counts["imported"] + counts["skipped"])
+
+        with os.scandir(base_log_dir) as entries:
+            for entry in entries:
+                # Skip files, the blob directory and the archive
+                if not entry.is_dir() or entry.name.startswith("."):
+                    continue
+                add(lambda: CVLoggingService.load_session(entry.name, base_log_dir))
+
+        blobs = get_blob_store(blob_root(base_log_dir))
+        archive = get_log_archive(os.path.abspath(base_log_dir))
+        for session_id, files in archive.iter_sessions():
+            add(lambda: session_from_files(session_id, files, blobs))
+        if pending:
+            commit()
+        return counts
+
+    # Maintenance
+
+    def delete_sessions(self, session_ids: List[str]) -> int:
+        """Remove sessions and their prompt results; returns the sessions removed"""
+        params = [(session_id,) for session_id in session_ids]
+        with self._lock:
+            self._db.executemany("DELETE FROM prompt_results WHERE session_id = ?", params)
+            before = self._db.total_changes
+            self._db.executemany("DELETE FROM sessions WHERE session_id = ?", params)
+            removed = self._db.total_changes - before
+            self._db.commit()
+        return removed
+
+    def blob_digests(self) -> Set[str]:
+        """Digests of the blobs referenced by stored sessions"""
+        digests: Set[str] = set()
+        with self._lock:
+            for (cv_text,) in self._db.execute("SELECT cv_text FROM sessions"):
+                digests |= referenced_digests(cv_text.encode("utf-8"))
+            for prompt_text, messages in self._db.execute(
+                    "SELECT prompt_text, messages FROM prompt_results"):
+                for value in (prompt_text, messages):
+                    if value:
+                        digests |= referenced_digests(value.encode("utf-8"))
+        return digests
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def store_path(base_log_dir: str = "logs/cv_analysis") -> str:
+    """Path of the store indexing a log directory"""
+    return os.path.abspath(Path(base_log_dir) / settings.EVALUATION_STORE_FILENAME)
+
+
+@lru_cache()
+def get_evaluation_store(path: str) -> EvaluationStore:
+    """Shared store for a database file (see store_path)"""
+    return EvaluationStore(path, blobs=get_blob_store(blob_root(os.path.dirname(path))))
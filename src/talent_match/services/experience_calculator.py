@@ -1,9 +1,9 @@
 import math
-from datetime import date
 from typing import List
 
-from talent_match.config.settings import get_settings
+from talent_match.config.settings import Settings, get_settings
 from talent_match.models.evaluation import RelevantExperience
+from talent_match.models.timeline import ExperienceTimeline
 
 settings = get_settings()
 
@@ -13,96 +13,96 @@ class ExperienceCalculator:
     Servicio para calcular puntuaciones de experiencia con una lógica mejorada
     que considera:
     - Tipo de experiencia (DIRECT/RELATED)
-    - Duración acumulada por tipo
+    - Duración acumulada por tipo (fusionando periodos solapados)
     - Bonus por experiencia reciente
     - Penalización por gaps
     - Ignora experiencias UNRELATED
     """
 
     @classmethod
-    def calculate_experience_score(cls, experiences: List[RelevantExperience]) -> float:
+    def calculate_experience_score(cls, experiences: List[RelevantExperience],
+                                   config: Settings = None) -> float:
         """
         Calcula la puntuación de experiencia con una lógica mejorada.
 
         La puntuación se calcula:
-        1. Separando y acumulando años por tipo de experiencia
+        1. Separando y acumulando años por tipo de experiencia, sin contar
+           dos veces los periodos solapados
         2. Aplicando una curva logarítmica más suave
         3. Añadiendo bonus por experiencia reciente
         4. Combinando los resultados con pesos apropiados
 
+        Args:
+            experiences: Lista de experiencias evaluadas
+            config: Perfil de configuración (por defecto, la configuración activa)
+
         Returns:
             float: Puntuación entre 0 y 100
         """
-        if not experiences:
-            return 0.0
-
-        relevant_experiences = [
-            exp for exp in experiences
-            if exp.match_type in ["DIRECT", "RELATED"]
-        ]
-
-        if not relevant_experiences:
-            return 0.0
-
-        # Acumular años por tipo
-        direct_years = 0.0
-        related_years = 0.0
-        recent_experience = False
-
-        current_date = date.today()
+        return cls.score_timeline(
+            ExperienceTimeline.from_experiences(experiences),
+            config
+        )
 
-        for exp in relevant_experiences:
-            duration = exp.duration_years
+    @classmethod
+    def score_timeline(cls, timeline: ExperienceTimeline,
+                       config: Settings = None) -> float:
+        """
+        Calcula la puntuación de experiencia a partir de una línea temporal
+        ya construida (los periodos solapados del mismo tipo cuentan una vez).
 
-            # Verificar si es experiencia reciente
-            if not exp.dates.end_date:  # Trabajo actual
-                recent_experience = True
-            elif (current_date - exp.dates.end).days <= settings.RECENCY_YEARS * 365:
-                recent_experience = True
+        Args:
+            timeline: Línea temporal de la experiencia relevante
+            config: Perfil de configuración (por defecto, la configuración activa)
 
-            # Acumular años por tipo
-            if exp.match_type == "DIRECT":
-                direct_years += duration
-            elif exp.match_type == "RELATED":
-                related_years += duration
+        Returns:
+            float: Puntuación entre 0 y 100
+        """
+        config = config or settings
+        if not timeline.has_relevant:
+            return 0.0
 
         # Calcular puntuación base por tipo usando curva logarítmica suave
         direct_score = cls._calculate_type_score(
-            direct_years,
-            settings.DIRECT_SCORE
+            timeline.direct_years,
+            config.DIRECT_SCORE,
+            config
         )
 
         related_score = cls._calculate_type_score(
-            related_years,
-            settings.RELATED_SCORE
+            timeline.related_years,
+            config.RELATED_SCORE,
+            config
         )
 
         # Combinar puntuaciones con pesos
         combined_score = (
-            direct_score * settings.DIRECT_EXPERIENCE_WEIGHT +
-            related_score * settings.RELATED_EXPERIENCE_WEIGHT
+            direct_score * config.DIRECT_EXPERIENCE_WEIGHT +
+            related_score * config.RELATED_EXPERIENCE_WEIGHT
         )
 
         # Aplicar bonus por experiencia reciente
-        if recent_experience:
+        if timeline.is_recent(config.RECENCY_YEARS):
             combined_score = min(100, combined_score *
-                                 (1 + settings.RECENCY_BONUS))
+                                 (1 + config.RECENCY_BONUS))
 
         return round(combined_score, 2)
 
     @classmethod
-    def _calculate_type_score(cls, years: float, base_score: float) -> float:
+    def _calculate_type_score(cls, years: float, base_score: float,
+                              config: Settings = None) -> float:
         """
         Calcula la puntuación para un tipo específico de experiencia
         usando una curva logarítmica más suave.
         """
+        config = config or settings
         if years <= 0:
             return 0.0
 
         # Usar log(x + 1) para una curva más suave
         # y normalizar a MAX_YEARS_FOR_FULL_SCORE
         factor = min(
-            math.log(years + 1) / math.log(settings.MAX_YEARS_FULL_SCORE + 1),
+            math.log(years + 1) / math.log(config.MAX_YEARS_FULL_SCORE + 1),
             1.0
         )
 
@@ -0,0 +1,256 @@
+import json
+import os
+import sqlite3
+import threading
+import zipfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Directory of the archive inside a log directory; session scans skip it
+ARCHIVE_DIR = ".archive"
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS archived (
+    session_id TEXT PRIMARY KEY,
+    segment TEXT NOT NULL,
+    job_title TEXT,
+    job_key TEXT,
+    timestamp TEXT,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_archived_segment ON archived (segment);
+CREATE INDEX IF NOT EXISTS idx_archived_job ON archived (job_key, timestamp);
+CREATE INDEX IF NOT EXISTS idx_archived_timestamp ON archived (timestamp);
+"""
+
+
+def read_session_dir(session_dir: Path) -> Dict[str, bytes]:
+    """
+    Files of a session directory
+
+    Returns:
+        Contents by path relative to the session directory ("/"-separated)
+    """
+    files = {}
+    for path in session_dir.rglob("*"):
+        if path.is_file() and not path.name.startswith("."):
+            files[path.relative_to(session_dir).as_posix()] = path.read_bytes()
+    return files
+
+
+class LogArchive:
+    """
+    Compressed archive segments of old session directories
+
+    A segment is a zip file holding the files of many sessions under
+    `<session_id>/`; an SQLite index maps each session to its segment so a
+    session is read without scanning. Segments are written and rewritten by
+    a single maintenance process (see log_retention); readers can run
+    concurrently, as segments are replaced atomically.
+    """
+
+    def __init__(self, base_log_dir: str):
+        """
+        Args:
+            base_log_dir: Log directory the archive belongs to
+        """
+        self.root = Path(base_log_dir) / ARCHIVE_DIR
+        self._index_path = self.root / "index.sqlite3"
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    def _connect(self, create: bool = False) -> Optional[sqlite3.Connection]:
+        """Index connection, or None if there is no archive yet and create is False"""
+        if self._db is None:
+            if not create and not self._index_path.exists():
+                return None
+            self.root.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self._index_path), check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(INDEX_SCHEMA)
+            self._db.commit()
+        return self._db
+
+    def __contains__(self, session_id: str) -> bool:
+        return self._segment_of(session_id) is not None
+
+    def _segment_of(self, session_id: str) -> Optional[str]:
+        with self._lock:
+            db = self._connect()
+            if db is None:
+                return None
+            row = db.execute(
+                "SELECT segment FROM archived WHERE session_id = ?", (session_id,)).fetchone()
+        return row[0] if row else None
+
+    def read_session(self, session_id: str) -> Optional[Dict[str, bytes]]:
+        """
+        Files of an archived session
+
+        Returns:
+            Contents by path relative to the session directory, or None if
+            the session is not archived
+        """
+        segment = self._segment_of(session_id)
+        if segment is None:
+            return None
+        prefix = f"{session_id}/"
+        with zipfile.ZipFile(self.root / segment) as archive:
+            return {
+                name[len(prefix):]: archive.read(name)
+                for name in archive.namelist()
+                if name.startswith(prefix)
+            }
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Index rows: session_id, segment, job_title, timestamp and compressed size"""
+        with self._lock:
+            db = self._connect()
+            if db is None:
+                return []
+            rows = db.execute(
+                "SELECT session_id, segment, job_title, timestamp, size FROM archived "
+                "ORDER BY session_id"
+            ).fetchall()
+        return [
+            dict(zip(("session_id", "segment", "job_title", "timestamp", "size"), row))
+            for row in rows
+        ]
+
+    def iter_sessions(self) -> Iterator[Tuple[str, Dict[str, bytes]]]:
+        """Stream every archived session, one segment open at a time"""
+        by_segment: Dict[str, List[str]] = {}
+        for entry in self.entries():
+            by_segment.setdefault(entry["segment"], []).append(entry["session_id"])
+        for segment, session_ids in sorted(by_segment.items()):
+            with zipfile.ZipFile(self.root / segment) as archive:
+                members: Dict[str, Dict[str, bytes]] = {}
+                for name in archive.namelist():
+                    session_id, _, relative = name.partition("/")
+                    members.setdefault(session_id, {})[relative] = archive.read(name)
+            for session_id in session_ids:
+                if session_id in members:
+                    yield session_id, members.pop(session_id)
+
+    def add_segment(self, session_dirs: Iterable[Path]) -> Optional[str]:
+        """
+        Pack session directories into a new segment
+
+        The directories are left in place: remove them once this returns.
+
+        Returns:
+            Segment file name, or None if there was nothing to pack
+        """
+        session_dirs = list(session_dirs)
+        if not session_dirs:
+            return None
+        with self._lock:
+            db = self._connect(create=True)
+            number = db.execute("SELECT COUNT(DISTINCT segment) FROM archived").fetchone()[0]
+        segment = self._new_segment_name(number)
+
+        rows = []
+        tmp_path = self.root / f".{segment}.tmp"
+        with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED,
+                             compresslevel=6) as archive:
+            for session_dir in session_dirs:
+                files = read_session_dir(session_dir)
+                size = 0
+                for relative, content in sorted(files.items()):
+                    archive.writestr(f"{session_dir.name}/{relative}", content)
+                    size += archive.getinfo(f"{session_dir.name}/{relative}").compress_size
+                info = _session_info(files)
+                job_title = info.get("job_title")
+                rows.append((
+                    session_dir.name, segment, job_title,
+                    job_title.strip().casefold() if job_title else None,
+                    info.get("timestamp"), size
+                ))
+        with open(tmp_path, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.root / segment)
+
+        with self._lock:
+            db.executemany(
+                "INSERT OR REPLACE INTO archived "
+                "(session_id, segment, job_title, job_key, timestamp, size) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            db.commit()
+        return segment
+
+    def remove(self, session_ids: Iterable[str]) -> int:
+        """
+        Delete archived sessions, rewriting the segments that hold them
+
+        Returns:
+            Compressed bytes freed
+        """
+        with self._lock:
+            db = self._connect()
+            if db is None:
+                return 0
+            by_segment: Dict[str, set] = {}
+            for session_id in session_ids:
+                row = db.execute(
+                    "SELECT segment FROM archived WHERE session_id = ?", (session_id,)
+                ).fetchone()
+                if row:
+                    by_segment.setdefault(row[0], set()).add(session_id)
+
+        freed = 0
+        for segment, removed in by_segment.items():
+            path = self.root / segment
+            before = path.stat().st_size
+            with zipfile.ZipFile(path) as archive:
+                kept = [
+                    info for info in archive.infolist()
+                    if info.filename.partition("/")[0] not in removed
+                ]
+                if kept:
+                    tmp_path = self.root / f".{segment}.tmp"
+                    with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED,
+                                         compresslevel=6) as rewritten:
+                        for info in kept:
+                            rewritten.writestr(info, archive.read(info))
+            # Drop the index rows first: a reader never looks for a session
+            # in a segment that no longer has it
+            with self._lock:
+                db.executemany(
+                    "DELETE FROM archived WHERE session_id = ?", [(s,) for s in removed])
+                db.commit()
+            if kept:
+                os.replace(tmp_path, path)
+                freed += before - path.stat().st_size
+            else:
+                path.unlink()
+                freed += before
+        return freed
+
+    def _new_segment_name(self, number: int) -> str:
+        while True:
+            number += 1
+            name = f"segment-{number:06d}.zip"
+            if not (self.root / name).exists():
+                return name
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+def _session_info(files: Dict[str, bytes]) -> Dict[str, Any]:
+    try:
+        return json.loads(files["session_info.json"])
+    except (KeyError, ValueError):
+        return {}
+
+
+@lru_cache()
+def get_log_archive(base_log_dir: str) -> LogArchive:
+    """Shared archive of a log directory (pass an absolute path)"""
+    return LogArchive(base_log_dir)
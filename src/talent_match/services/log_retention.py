@@ -0,0 +1,267 @@
+import json
+import os
+import shutil
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from talent_match.config.settings import get_settings
+from talent_match.services.blob_store import blob_root, get_blob_store, referenced_digests
+from talent_match.services.evaluation_store import get_evaluation_store, store_path
+from talent_match.services.log_archive import get_log_archive, read_session_dir
+
+settings = get_settings()
+
+# Sessions started this recently are never pruned, compacted or swept:
+# they may still be running
+ACTIVE_SESSION_GRACE = timedelta(hours=1)
+
+
+@dataclass
+class RetentionPolicy:
+    """Limits on the logged sessions; None disables a limit"""
+    max_age_days: Optional[float] = settings.LOG_RETENTION_MAX_AGE_DAYS
+    max_total_bytes: Optional[int] = settings.LOG_RETENTION_MAX_BYTES
+    max_sessions_per_job: Optional[int] = settings.LOG_RETENTION_MAX_PER_JOB
+
+
+@dataclass
+class SessionEntry:
+    """A logged session, loose or archived, as seen by the maintenance jobs"""
+    session_id: str
+    job_title: Optional[str]
+    started_at: datetime
+    size: int
+    archived: bool
+
+
+def session_started_at(session_id: str, fallback: datetime) -> datetime:
+    """Start time encoded in a session id (YYYYMMDD_HHMMSS_<hex>)"""
+    try:
+        return datetime.strptime(session_id[:15], "%Y%m%d_%H%M%S")
+    except ValueError:
+        return fallback
+
+
+def select_expired(entries: List[SessionEntry], policy: RetentionPolicy,
+                   now: Optional[datetime] = None) -> List[SessionEntry]:
+    """
+    Sessions to delete under a retention policy
+
+    Limits are applied in order: age, then sessions per job title (the
+    newest are kept), then total size (the oldest go first). Sessions
+    started within ACTIVE_SESSION_GRACE are always kept.
+
+    Args:
+        entries: Every logged session
+        policy: Limits to enforce
+        now: Reference time (default: now)
+
+    Returns:
+        Sessions to delete
+    """
+    now = now or datetime.now()
+    protected = now - ACTIVE_SESSION_GRACE
+    expired = {}
+    kept = [e for e in entries if e.started_at >= protected]
+    candidates = sorted(
+        (e for e in entries if e.started_at < protected),
+        key=lambda e: (e.started_at, e.session_id)
+    )
+
+    if policy.max_age_days is not None:
+        cutoff = now - timedelta(days=policy.max_age_days)
+        for entry in candidates:
+            if entry.started_at < cutoff:
+                expired[entry.session_id] = entry
+        candidates = [e for e in candidates if e.session_id not in expired]
+
+    if policy.max_sessions_per_job is not None:
+        by_job: Dict[str, List[SessionEntry]] = defaultdict(list)
+        for entry in kept + candidates:
+            by_job[(entry.job_title or "").strip().casefold()].append(entry)
+        for job_entries in by_job.values():
+            job_entries.sort(key=lambda e: (e.started_at, e.session_id), reverse=True)
+            for entry in job_entries[policy.max_sessions_per_job:]:
+                if entry.started_at < protected:
+                    expired[entry.session_id] = entry
+        candidates = [e for e in candidates if e.session_id not in expired]
+
+    if policy.max_total_bytes is not None:
+        total = sum(e.size for e in kept + candidates)
+        for entry in candidates:
+            if total <= policy.max_total_bytes:
+                break
+            expired[entry.session_id] = entry
+            total -= entry.size
+
+    return sorted(expired.values(), key=lambda e: (e.started_at, e.session_id))
+
+
+class LogMaintenance:
+    """
+    Retention, compaction and blob garbage collection of a log directory
+
+    Meant to run periodically from a single process (e.g. a cron job
+    calling `talent-match prune-logs` and `compact-logs`); the services
+    writing and reading sessions can keep running meanwhile.
+    """
+
+    def __init__(self, base_log_dir: str = "logs/cv_analysis"):
+        self.base_log_dir = Path(base_log_dir)
+        self.archive = get_log_archive(os.path.abspath(self.base_log_dir))
+
+    def _loose_sessions(self) -> List[Path]:
+        with os.scandir(self.base_log_dir) as entries:
+            # Skip files, the blob directory and the archive
+            return [
+                Path(entry.path) for entry in entries
+                if entry.is_dir() and not entry.name.startswith(".")
+            ]
+
+    def scan(self) -> List[SessionEntry]:
+        """Every session of the log directory, loose and archived"""
+        entries = []
+        for session_dir in self._loose_sessions():
+            size, job_title = 0, None
+            for path in session_dir.rglob("*"):
+                if path.is_file():
+                    size += path.stat().st_size
+            try:
+                with open(session_dir / "session_info.json", "r", encoding="utf-8") as f:
+                    job_title = json.load(f).get("job_title")
+            except (OSError, ValueError):
+                pass
+            mtime = datetime.fromtimestamp(session_dir.stat().st_mtime)
+            entries.append(SessionEntry(
+                session_id=session_dir.name,
+                job_title=job_title,
+                started_at=session_started_at(session_dir.name, mtime),
+                size=size,
+                archived=False,
+            ))
+        for row in self.archive.entries():
+            entries.append(SessionEntry(
+                session_id=row["session_id"],
+                job_title=row["job_title"],
+                started_at=session_started_at(row["session_id"], datetime.min),
+                size=row["size"],
+                archived=True,
+            ))
+        return entries
+
+    def prune(self, policy: Optional[RetentionPolicy] = None,
+              dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Delete the sessions beyond the retention limits
+
+        Sessions are removed from the log directory, the archive and the
+        evaluation store.
+
+        Args:
+            policy: Limits (default: from settings)
+            dry_run: Only report what would be deleted
+
+        Returns:
+            Report with the sessions scanned and the sessions and bytes expired
+        """
+        policy = policy or RetentionPolicy()
+        entries = self.scan()
+        expired = select_expired(entries, policy)
+        report = {
+            "sessions": len(entries),
+            "expired": len(expired),
+            "expired_bytes": sum(e.size for e in expired),
+            "dry_run": dry_run,
+        }
+        if dry_run or not expired:
+            return report
+
+        for entry in expired:
+            if not entry.archived:
+                shutil.rmtree(self.base_log_dir / entry.session_id, ignore_errors=True)
+        report["archive_bytes_freed"] = self.archive.remove(
+            [e.session_id for e in expired if e.archived])
+
+        db_path = store_path(str(self.base_log_dir))
+        if os.path.exists(db_path):
+            report["store_deleted"] = get_evaluation_store(db_path).delete_sessions(
+                [e.session_id for e in expired])
+        return report
+
+    def compact(self, older_than_days: float = settings.LOG_COMPACT_AFTER_DAYS,
+                segment_sessions: int = settings.LOG_ARCHIVE_SEGMENT_SESSIONS) -> Dict[str, Any]:
+        """
+        Pack old session directories into archive segments
+
+        Args:
+            older_than_days: Only sessions started before this many days ago
+            segment_sessions: Sessions per segment
+
+        Returns:
+            Report with the sessions packed, segments written and bytes saved
+        """
+        cutoff = datetime.now() - max(timedelta(days=older_than_days), ACTIVE_SESSION_GRACE)
+        old = sorted(
+            (d for d in self._loose_sessions()
+             if session_started_at(d.name, datetime.max) < cutoff),
+            key=lambda d: d.name
+        )
+        report = {"sessions": 0, "segments": [], "bytes_before": 0, "bytes_after": 0}
+        for start in range(0, len(old), segment_sessions):
+            chunk = old[start:start + segment_sessions]
+            # Disk usage, as small files take a whole filesystem block each
+            report["bytes_before"] += sum(
+                path.stat().st_blocks * 512
+                for d in chunk for path in d.rglob("*") if path.is_file())
+            segment = self.archive.add_segment(chunk)
+            # The index now points at the segment: the directories can go
+            for session_dir in chunk:
+                shutil.rmtree(session_dir, ignore_errors=True)
+            report["sessions"] += len(chunk)
+            report["segments"].append(segment)
+            report["bytes_after"] += (self.archive.root / segment).stat().st_size
+        return report
+
+    def sweep_blobs(self, grace_seconds: float = ACTIVE_SESSION_GRACE.total_seconds()
+                    ) -> Dict[str, Any]:
+        """
+        Delete blobs no session references anymore
+
+        Blobs written or touched within grace_seconds before the sweep
+        started, or at any time since, are kept: a session may be about to
+        reference them (BlobStore.put touches blobs it reuses).
+
+        Returns:
+            Report with the blobs kept, deleted and bytes freed
+        """
+        started = time.time()
+        referenced = set()
+        for session_dir in self._loose_sessions():
+            for content in read_session_dir(session_dir).values():
+                referenced |= referenced_digests(content)
+        for _, files in self.archive.iter_sessions():
+            for content in files.values():
+                referenced |= referenced_digests(content)
+        db_path = store_path(str(self.base_log_dir))
+        if os.path.exists(db_path):
+            referenced |= get_evaluation_store(db_path).blob_digests()
+
+        blobs = get_blob_store(blob_root(str(self.base_log_dir)))
+        report = {"kept": 0, "deleted": 0, "bytes_freed": 0}
+        cutoff = started - grace_seconds
+        for digest, mtime in list(blobs.entries()):
+            if digest in referenced or mtime >= cutoff:
+                report["kept"] += 1
+                continue
+            # Checked again at deletion: the blob may have been reused meanwhile
+            freed = blobs.delete(digest, unless_touched_since=cutoff)
+            if not freed:
+                report["kept"] += 1
+                continue
+            report["bytes_freed"] += freed
+            report["deleted"] += 1
+        return report
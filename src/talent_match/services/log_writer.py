@@ -0,0 +1,244 @@
+import atexit
+import json
+import os
+import queue
+import random
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from talent_match.config.settings import get_settings
+
+try:
+    import orjson
+except ImportError:  # optional: faster encoding when installed
+    orjson = None
+
+settings = get_settings()
+
+FSYNC_POLICIES = ("never", "essential", "always")
+OVERFLOW_POLICIES = ("block", "drop", "sample")
+
+# Fraction of the queue above which the "sample" policy starts shedding
+SAMPLE_HIGH_WATER = 0.75
+
+_STOP = object()
+
+
+def encode_json(data: Any) -> bytes:
+    """Compact UTF-8 JSON; non-serializable values are written with str()"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # e.g. integers beyond 64 bits: let the standard encoder handle them
+            pass
+    return json.dumps(
+        data, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def write_file(path: Path, content: bytes, fsync: bool = False):
+    """
+    Replace a file atomically: readers see the old or the new content,
+    never a partial write
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class LogWriter:
+    """
+    Background writer for session logs
+
+    Writes are queued and a single thread stores them in batches, so
+    logging costs a queue put on the request path. Within a batch only the
+    last write to each path is stored, and directories are created once.
+
+    Essential writes (session info, final evaluation, error) are never
+    dropped: when the queue is full they wait for room. Other writes follow
+    the overflow policy:
+        "block": wait for room like essential writes
+        "drop": discarded while the queue is full
+        "sample": once the queue passes SAMPLE_HIGH_WATER, kept with
+            probability `sample_rate`; discarded while it is full
+
+    The fsync policy sets what is flushed to stable storage before a write
+    counts as done: "never", "essential" writes only, or "always".
+    """
+
+    def __init__(self,
+                 queue_size: int = settings.LOG_QUEUE_SIZE,
+                 batch_size: int = settings.LOG_BATCH_SIZE,
+                 fsync: str = settings.LOG_FSYNC,
+                 overflow: str = settings.LOG_OVERFLOW,
+                 sample_rate: float = settings.LOG_SAMPLE_RATE):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(
+                f"Unknown fsync policy {fsync!r}; expected one of {', '.join(FSYNC_POLICIES)}")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown overflow policy {overflow!r}; "
+                f"expected one of {', '.join(OVERFLOW_POLICIES)}")
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.fsync = fsync
+        self.overflow = overflow
+        self.sample_rate = sample_rate
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._condition = threading.Condition()
+        # Writes queued and not yet stored, per key (session directory)
+        self._pending: Dict[str, int] = {}
+        self._stats = {"queued": 0, "written": 0, "dropped": 0, "failed": 0, "batches": 0}
+        self._last_error: Optional[str] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, path: Path, data: Any, key: str, essential: bool = False) -> bool:
+        """
+        Queue a JSON write
+
+        Args:
+            path: File to (re)write
+            data: JSON-serializable content
+            key: Group the write belongs to (see wait)
+            essential: Never drop this write under overload
+
+        Returns:
+            False if the write was dropped by the overflow policy
+        """
+        if self._closed:
+            # Late writes after shutdown are stored synchronously
+            write_file(path, encode_json(data), fsync=self._should_fsync(essential))
+            return True
+
+        item = (path, data, key, essential)
+        with self._condition:
+            self._pending[key] = self._pending.get(key, 0) + 1
+        if essential or self.overflow == "block":
+            self._queue.put(item)
+            self._count("queued")
+            return True
+
+        if (self.overflow == "sample"
+                and self._queue.qsize() >= SAMPLE_HIGH_WATER * self.queue_size
+                and random.random() >= self.sample_rate):
+            self._discard(key)
+            return False
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self._discard(key)
+            return False
+        self._count("queued")
+        return True
+
+    def wait(self, key: str, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the queued writes of a group are stored
+
+        Returns:
+            False if the timeout expired first
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending.get(key), timeout=timeout)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued write is stored"""
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending, timeout=timeout)
+
+    def close(self, timeout: Optional[float] = None):
+        """Store the queued writes and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                **self._stats,
+                "queue_depth": self._queue.qsize(),
+                "last_error": self._last_error,
+            }
+
+    def _count(self, name: str, amount: int = 1):
+        with self._condition:
+            self._stats[name] += amount
+
+    def _discard(self, key: str):
+        with self._condition:
+            self._stats["dropped"] += 1
+            self._release([key])
+
+    def _release(self, keys: List[str]):
+        # Called with the condition held
+        for key in keys:
+            self._pending[key] -= 1
+            if not self._pending[key]:
+                del self._pending[key]
+        self._condition.notify_all()
+
+    def _should_fsync(self, essential: bool) -> bool:
+        return self.fsync == "always" or (self.fsync == "essential" and essential)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            # Whatever queued up while the last batch was written forms the next
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if any(item is _STOP for item in batch):
+                stopping = True
+                batch = [item for item in batch if item is not _STOP]
+                # Drain what was queued before close
+                while True:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: List[Tuple[Path, Any, str, bool]]):
+        # Last write to a path wins; an essential write keeps its fsync
+        latest: Dict[Path, Tuple[Any, bool]] = {}
+        for path, data, _, essential in batch:
+            essential = essential or latest.get(path, (None, False))[1]
+            latest[path] = (data, essential)
+
+        written = failed = 0
+        for path, (data, essential) in latest.items():
+            try:
+                write_file(path, encode_json(data), fsync=self._should_fsync(essential))
+                written += 1
+            except (OSError, TypeError, ValueError) as e:
+                failed += 1
+                self._last_error = f"{path}: {e}"
+
+        with self._condition:
+            self._stats["written"] += written
+            self._stats["failed"] += failed
+            self._stats["batches"] += 1
+            self._release([key for _, _, key, _ in batch])
+
+
+@lru_cache()
+def get_log_writer() -> LogWriter:
+    writer = LogWriter()
+    # Store everything queued before the interpreter exits
+    atexit.register(writer.close)
+    return writer
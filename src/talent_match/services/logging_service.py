@@ -1,23 +1,105 @@
 import json
+import os
+import sqlite3
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 from uuid import uuid4
 
+from talent_match.config.settings import get_settings
+from talent_match.services.blob_store import (
+    BlobStore,
+    blob_root,
+    externalize_prompt_result,
+    externalize_text,
+    get_blob_store,
+    resolve_blobs,
+)
+from talent_match.services.evaluation_store import (
+    EvaluationStore,
+    get_evaluation_store,
+    store_path,
+)
+from talent_match.services.log_archive import get_log_archive, read_session_dir
+from talent_match.services.log_writer import (
+    LogWriter,
+    encode_json,
+    get_log_writer,
+    write_file,
+)
+from talent_match.services.metrics import get_metrics
+
+settings = get_settings()
+
+
+def _session_key(base_log_dir: Path, session_id: str) -> str:
+    """Key grouping the queued writes of a session"""
+    return os.path.abspath(base_log_dir / session_id)
+
+
+def session_from_files(session_id: str, files: Dict[str, bytes],
+                        blobs: Optional[BlobStore]) -> Dict[str, Any]:
+    """
+    Assemble the session data from its files (of a directory or an archive
+    segment), resolving blob references
+    """
+    if "session_info.json" not in files:
+        raise ValueError(f"Session {session_id} has no session info")
+    session_data = json.loads(files["session_info.json"])
+    
+    prompt_results = {
+        name[len("prompts/"):-len("_result.json")]: json.loads(content)
+        for name, content in files.items()
+        if name.startswith("prompts/") and name.endswith("_result.json")
+    }
+    if prompt_results:
+        session_data["prompt_results"] = prompt_results
+    
+    # Final evaluation, error of the last failed attempt and trace if present
+    for filename, key in (("final_evaluation.json", "final_evaluation"),
+                          ("error.json", "error"),
+                          ("trace.json", "trace")):
+        if filename in files:
+            session_data[key] = json.loads(files[filename])
+    if "fingerprint.json" in files:
+        session_data["fingerprint"] = json.loads(files["fingerprint.json"]).get("fingerprint")
+    
+    return resolve_blobs(session_data, blobs)
+
 
 class CVLoggingService:
     """Service for logging CV analysis results"""
     
-    def __init__(self, base_log_dir: str = "logs/cv_analysis"):
+    def __init__(self, base_log_dir: str = "logs/cv_analysis",
+                 writer: Optional[LogWriter] = None,
+                 store: Optional[EvaluationStore] = None,
+                 blobs: Optional[BlobStore] = None):
         """
         Initialize the logging service
         
         Args:
             base_log_dir: Base directory for storing logs
+            writer: Background writer for the log files (default: the shared
+                one if settings.LOG_ASYNC_WRITES, else files are written inline)
+            store: Store sessions are also recorded in (default: the one in
+                base_log_dir if settings.EVALUATION_STORE_ENABLED)
+            blobs: Store for CV and prompt text, referenced from the logs by
+                hash (default: the one in base_log_dir if settings.LOG_BLOBS_ENABLED)
         """
         self.base_log_dir = Path(base_log_dir)
         self.current_session: Optional[str] = None
+        if writer is None and settings.LOG_ASYNC_WRITES:
+            writer = get_log_writer()
+        self.writer = writer
         self._ensure_base_dir()
+        if store is None and settings.EVALUATION_STORE_ENABLED:
+            store = get_evaluation_store(store_path(base_log_dir))
+        self.store = store
+        # Sessions with a failed store write: read them from the files
+        self._unsynced: Set[str] = set()
+        if blobs is None and settings.LOG_BLOBS_ENABLED:
+            blobs = get_blob_store(blob_root(base_log_dir))
+        self.blobs = blobs
     
     def _ensure_base_dir(self):
         """Ensure the base log directory exists"""
@@ -37,32 +119,97 @@ class CVLoggingService:
         # Generate unique session ID
         session_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid4().hex[:8]}"
         self.current_session = session_id
-        
-        # Create session directory
         session_dir = self.base_log_dir / session_id
-        session_dir.mkdir(parents=True, exist_ok=True)
         
-        # Save initial session info
+        # Save initial session info (creates the session directory)
         session_info = {
             "session_id": session_id,
             "job_title": job_title,
             "timestamp": datetime.now().isoformat(),
-            "cv_text": cv_text
+            "cv_text": externalize_text(cv_text, self.blobs)
         }
         
         self._save_json(
             session_dir / "session_info.json",
-            session_info
+            session_info,
+            session_id,
+            essential=True
         )
+        self._record("add_session", session_id, job_title, session_info["timestamp"], cv_text)
         
         return session_id
     
+    def resume_session(self, session_id: str) -> Dict[str, Any]:
+        """
+        Make an existing session the current one so a failed analysis can
+        continue writing to it
+        
+        Args:
+            session_id: ID of the session to resume
+            
+        Returns:
+            The stored session info
+        """
+        session_info = (self.store.session_info(session_id)
+                        if self._store_readable(session_id) else None)
+        if session_info is None:
+            self._wait_for_writes(session_id)
+            info_path = self.base_log_dir / session_id / "session_info.json"
+            if info_path.exists():
+                with open(info_path, 'r', encoding='utf-8') as f:
+                    session_info = resolve_blobs(json.load(f), self._reader_blobs())
+            else:
+                archived = self._load_archived(session_id)
+                if archived is None:
+                    raise ValueError(f"Session {session_id} not found")
+                session_info = {
+                    key: archived.get(key)
+                    for key in ("session_id", "job_title", "timestamp", "cv_text")
+                }
+        
+        self.current_session = session_id
+        return session_info
+    
+    def load_prompt_responses(self, session_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Load the model responses already persisted for a session
+        
+        Args:
+            session_id: ID of the session
+            
+        Returns:
+            Dict mapping prompt type to its logged response
+        """
+        if self._store_readable(session_id) and self.store.session_info(session_id) is not None:
+            return self.store.prompt_responses(session_id)
+        
+        self._wait_for_writes(session_id)
+        prompt_dir = self.base_log_dir / session_id / "prompts"
+        responses = {}
+        if not (self.base_log_dir / session_id).exists():
+            archived = self._load_archived(session_id) or {}
+            return {
+                prompt_type: result["response"]
+                for prompt_type, result in archived.get("prompt_results", {}).items()
+            }
+        if prompt_dir.exists():
+            for prompt_file in prompt_dir.glob("*_result.json"):
+                prompt_type = prompt_file.stem.replace("_result", "")
+                try:
+                    with open(prompt_file, 'r', encoding='utf-8') as f:
+                        responses[prompt_type] = json.load(f)["response"]
+                except (json.JSONDecodeError, KeyError):
+                    # A torn write is treated as a missing result
+                    continue
+        return responses
+    
     def log_prompt_result(self, 
                          prompt_type: str,
                          prompt_text: str,
                          response: Dict[str, Any],
                          messages: List[Dict[str, str]] = None,
-                         session_id: Optional[str] = None):
+                         session_id: Optional[str] = None,
+                         metadata: Optional[Dict[str, Any]] = None):
         """
         Log the result of a prompt analysis
         
@@ -71,13 +218,13 @@ class CVLoggingService:
             prompt_text: The actual prompt text used
             response: The response received from the model
             session_id: Optional session ID (uses current session if not provided)
+            metadata: Optional call details (cache hits, token usage...)
         """
         if not session_id and not self.current_session:
             raise ValueError("No active session and no session_id provided")
         
         session_id = session_id or self.current_session
         prompt_dir = self.base_log_dir / session_id / "prompts"
-        prompt_dir.mkdir(exist_ok=True)
         
         # Create prompt result log
         prompt_result = {
@@ -87,21 +234,32 @@ class CVLoggingService:
             "messages": messages, 
             "response": response
         }
+        if metadata:
+            prompt_result["metadata"] = metadata
+        # The CV and prompts repeat across sections and sessions: store them once
+        prompt_result = externalize_prompt_result(prompt_result, self.blobs)
         
         self._save_json(
             prompt_dir / f"{prompt_type}_result.json",
-            prompt_result
+            prompt_result,
+            session_id
         )
+        self._record("add_prompt_result", session_id, prompt_result)
     
     def log_final_evaluation(self, 
                            evaluation: Dict[str, Any],
-                           session_id: Optional[str] = None):
+                           session_id: Optional[str] = None,
+                           fingerprint: Optional[str] = None):
         """
         Log the final complete evaluation
         
         Args:
             evaluation: The complete evaluation result
             session_id: Optional session ID (uses current session if not provided)
+            fingerprint: Hash of the model, backend, prompts and scoring the
+                evaluation was produced with; saved in fingerprint.json and
+                recorded in the store, where near-duplicate lookups only
+                reuse sessions with the same one
         """
         if not session_id and not self.current_session:
             raise ValueError("No active session and no session_id provided")
@@ -109,25 +267,183 @@ class CVLoggingService:
         session_id = session_id or self.current_session
         session_dir = self.base_log_dir / session_id
         
+        if fingerprint is not None:
+            # Written first: a final evaluation without it is never reused
+            self._save_json(
+                session_dir / "fingerprint.json",
+                {"fingerprint": fingerprint},
+                session_id,
+                essential=True
+            )
         self._save_json(
             session_dir / "final_evaluation.json",
-            evaluation
+            evaluation,
+            session_id,
+            essential=True
+        )
+        self._record("set_final_evaluation", session_id, evaluation, fingerprint)
+    
+    def log_error(self,
+                  error: str,
+                  session_id: Optional[str] = None):
+        """
+        Log the failure of an analysis
+        
+        Args:
+            error: Error message
+            session_id: Optional session ID (uses current session if not provided)
+        """
+        if not session_id and not self.current_session:
+            raise ValueError("No active session and no session_id provided")
+            
+        session_id = session_id or self.current_session
+        error_record = {"timestamp": datetime.now().isoformat(), "error": error}
+        self._save_json(
+            self.base_log_dir / session_id / "error.json",
+            error_record,
+            session_id,
+            essential=True
         )
+        self._record("set_error", session_id, error_record)
     
-    def _save_json(self, path: Path, data: Dict[str, Any]):
-        """Save data as JSON with consistent formatting"""
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(data, 
-                     f,
-                     ensure_ascii=False, 
-                     indent=2,
-                     default=str)
+    def log_trace(self,
+                  trace: Dict[str, Any],
+                  session_id: Optional[str] = None):
+        """
+        Log the timing spans of an analysis
+        
+        Args:
+            trace: Trace as returned by Trace.to_dict
+            session_id: Optional session ID (uses current session if not provided)
+        """
+        if not session_id and not self.current_session:
+            raise ValueError("No active session and no session_id provided")
+            
+        session_id = session_id or self.current_session
+        self._save_json(self.base_log_dir / session_id / "trace.json", trace, session_id)
+    
+    def load_session_status(self, session_id: str) -> Dict[str, Any]:
+        """
+        Load the state of a session without its prompt results
+        
+        Args:
+            session_id: ID of the session
+            
+        Returns:
+            Dict with session_id, job_title, timestamp, status ("completed",
+            "failed" or "running") and the final evaluation or error
+        """
+        if self._store_readable(session_id):
+            status = self.store.session_status(session_id)
+            if status is not None:
+                return status
+        
+        self._wait_for_writes(session_id)
+        session_dir = self.base_log_dir / session_id
+        info_path = session_dir / "session_info.json"
+        if not info_path.exists():
+            archived = self._load_archived(session_id)
+            if archived is None:
+                raise ValueError(f"Session {session_id} not found")
+            status = {
+                "session_id": session_id,
+                "job_title": archived.get("job_title"),
+                "timestamp": archived.get("timestamp"),
+                "status": "running",
+            }
+            if "final_evaluation" in archived:
+                status.update(status="completed", final_evaluation=archived["final_evaluation"])
+            elif "error" in archived:
+                status.update(status="failed", error=archived["error"])
+            return status
+        
+        with open(info_path, 'r', encoding='utf-8') as f:
+            session_info = json.load(f)
+        status = {
+            "session_id": session_id,
+            "job_title": session_info.get("job_title"),
+            "timestamp": session_info.get("timestamp"),
+            "status": "running",
+        }
+        
+        # A final evaluation wins over an error from an earlier attempt
+        for filename, key, state in (("final_evaluation.json", "final_evaluation", "completed"),
+                                     ("error.json", "error", "failed")):
+            try:
+                with open(session_dir / filename, 'r', encoding='utf-8') as f:
+                    status[key] = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+            status["status"] = state
+            break
+        return status
+    
+    def _save_json(self, path: Path, data: Dict[str, Any], session_id: str,
+                   essential: bool = False):
+        """
+        Save data as compact JSON, through the background writer if any
+        
+        Args:
+            path: File to write
+            data: Content
+            session_id: Session the file belongs to
+            essential: Needed to resume or report the session; never dropped
+                under overload
+        """
+        if self.writer is not None:
+            self.writer.submit(
+                path, data, _session_key(self.base_log_dir, session_id), essential=essential)
+        else:
+            write_file(path, encode_json(data))
+    
+    def _record(self, operation: str, session_id: str, *args):
+        """
+        Mirror a log write into the evaluation store, best effort like the
+        file writes: a failure (e.g. the database is locked by an import)
+        is counted and the session is read from its files from then on
+        
+        Args:
+            operation: EvaluationStore write method
+            session_id: Session the write belongs to
+            args: Remaining arguments of the method
+        """
+        if self.store is None:
+            return
+        try:
+            getattr(self.store, operation)(session_id, *args)
+        except sqlite3.Error:
+            get_metrics().store_errors.inc(operation=operation)
+            self._unsynced.add(session_id)
+    
+    def _store_readable(self, session_id: str) -> bool:
+        """Whether the store has every write of the session"""
+        return self.store is not None and session_id not in self._unsynced
+    
+    def _reader_blobs(self) -> BlobStore:
+        """Blob store to resolve references with, even if new logs don't use it"""
+        return self.blobs or get_blob_store(blob_root(self.base_log_dir))
+    
+    def _load_archived(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Data of a session compacted into the archive, or None"""
+        files = get_log_archive(os.path.abspath(self.base_log_dir)).read_session(session_id)
+        if files is None:
+            return None
+        return session_from_files(session_id, files, self._reader_blobs())
+    
+    def _wait_for_writes(self, session_id: str):
+        """Make the queued writes of a session visible before reading it"""
+        if self.writer is not None:
+            self.writer.wait(_session_key(self.base_log_dir, session_id))
     
     @classmethod
     def load_session(cls, session_id: str, base_log_dir: str = "logs/cv_analysis") -> Dict[str, Any]:
         """
         Load a complete session's data
         
+        Blob references are replaced by their text, so the result has the
+        same shape whether the session was logged with blobs or not, and
+        sessions compacted into the archive are read from their segment.
+        
         Args:
             session_id: ID of the session to load
             base_log_dir: Base directory where logs are stored
@@ -137,28 +453,14 @@ class CVLoggingService:
         """
         base_dir = Path(base_log_dir)
         session_dir = base_dir / session_id
+        if settings.LOG_ASYNC_WRITES:
+            get_log_writer().wait(_session_key(base_dir, session_id))
         
-        if not session_dir.exists():
-            raise ValueError(f"Session {session_id} not found")
-        
-        # Load session info
-        with open(session_dir / "session_info.json", 'r', encoding='utf-8') as f:
-            session_data = json.load(f)
+        if session_dir.exists():
+            files = read_session_dir(session_dir)
+        else:
+            files = get_log_archive(os.path.abspath(base_dir)).read_session(session_id)
+            if files is None:
+                raise ValueError(f"Session {session_id} not found")
         
-        # Load prompt results
-        prompt_dir = session_dir / "prompts"
-        if prompt_dir.exists():
-            prompt_results = {}
-            for prompt_file in prompt_dir.glob("*_result.json"):
-                with open(prompt_file, 'r', encoding='utf-8') as f:
-                    prompt_type = prompt_file.stem.replace("_result", "")
-                    prompt_results[prompt_type] = json.load(f)
-            session_data["prompt_results"] = prompt_results
-        
-        # Load final evaluation if exists
-        final_eval_path = session_dir / "final_evaluation.json"
-        if final_eval_path.exists():
-            with open(final_eval_path, 'r', encoding='utf-8') as f:
-                session_data["final_evaluation"] = json.load(f)
-        
-        return session_data
\ No newline at end of file
+        return session_from_files(session_id, files, get_blob_store(blob_root(base_log_dir)))
\ No newline at end of file
@@ -0,0 +1,127 @@
+import asyncio
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from talent_match.config.settings import get_settings
+from talent_match.services.batch_service import BatchItem
+from talent_match.services.openai_service import JobMatch, OpenAIService, gather_or_cancel
+from talent_match.services.usage_stats import get_usage_stats
+
+settings = get_settings()
+
+
+@dataclass
+class MatchMatrix:
+    """Fit scores of CVs (rows) against job titles (columns)"""
+    job_titles: List[str]
+    cv_ids: List[str] = field(default_factory=list)
+    matches: List[List[JobMatch]] = field(default_factory=list)
+
+    def add(self, cv_id: str, matches: List[JobMatch]):
+        self.cv_ids.append(cv_id)
+        self.matches.append(matches)
+
+    @property
+    def scores(self) -> List[List[Optional[float]]]:
+        """Score matrix; None where the match failed"""
+        return [[match.fit_score for match in row] for row in self.matches]
+
+    def ranking(self, job_title: str) -> List[Dict[str, Any]]:
+        """CVs for a job title from best to worst fit, failed matches last"""
+        column = self.job_titles.index(job_title)
+        rows = [
+            {"cv_id": cv_id, "fit_score": row[column].fit_score}
+            for cv_id, row in zip(self.cv_ids, self.matches)
+        ]
+        return sorted(
+            rows, key=lambda row: (row["fit_score"] is None, -(row["fit_score"] or 0.0)))
+
+    def to_dict(self, include_evaluations: bool = False) -> Dict[str, Any]:
+        rows = []
+        for cv_id, row in zip(self.cv_ids, self.matches):
+            record: Dict[str, Any] = {
+                "cv_id": cv_id,
+                "scores": [match.fit_score for match in row],
+                "session_ids": [match.session_id for match in row],
+            }
+            errors = {match.job_title: match.error for match in row if match.error}
+            if errors:
+                record["errors"] = errors
+            if include_evaluations:
+                record["evaluations"] = [
+                    match.evaluation.model_dump(mode="json") if match.evaluation else None
+                    for match in row
+                ]
+            rows.append(record)
+        return {"job_titles": self.job_titles, "cvs": rows}
+
+
+class MatchRunner:
+    """
+    Matches many CVs against many job titles with one extraction per CV
+    and one relevance call per CV and job title (see OpenAIService.match_jobs)
+    """
+
+    def __init__(self,
+                 service: Optional[OpenAIService] = None,
+                 concurrency: int = settings.BATCH_CONCURRENCY):
+        self.service = service or OpenAIService()
+        self.concurrency = max(1, concurrency)
+
+    async def run(self,
+                  items: Iterable[BatchItem],
+                  job_titles: List[str],
+                  summaries: Optional[bool] = None,
+                  progress: bool = False) -> MatchMatrix:
+        """
+        Build the score matrix
+
+        Args:
+            items: CVs to match (consumed lazily)
+            job_titles: Columns of the matrix
+            summaries: Also generate summaries (default settings.MATCH_SUMMARIES)
+            progress: Print a progress line to stderr per finished CV
+
+        Returns:
+            Matrix with the CVs in input order
+        """
+        rows: Dict[int, tuple] = {}
+        # Bounded queue keeps memory flat however large the input is
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+
+        async def produce():
+            for index, item in enumerate(items):
+                await queue.put((index, item))
+            for _ in range(self.concurrency):
+                await queue.put(None)
+
+        async def work():
+            while (job := await queue.get()) is not None:
+                index, item = job
+                matches = await self.service.match_jobs(item.cv_text, job_titles, summaries)
+                rows[index] = (item.cv_id, matches)
+                if progress:
+                    failed = sum(1 for match in matches if match.error)
+                    print(
+                        f"[{len(rows)} CVs] {item.cv_id}: "
+                        f"{len(matches) - failed} matched, {failed} failed",
+                        file=sys.stderr
+                    )
+
+        await gather_or_cancel(produce(), *(work() for _ in range(self.concurrency)))
+
+        matrix = MatchMatrix(job_titles=list(job_titles))
+        for index in sorted(rows):
+            matrix.add(*rows[index])
+        return matrix
+
+
+def match_call_stats() -> Dict[str, Any]:
+    """Calls and tokens of the extraction and relevance phases so far"""
+    snapshot = get_usage_stats().snapshot()
+    return {
+        label: snapshot[label]
+        for label in ("call:extraction", "call:relevance", "call:summary:digest")
+        if label in snapshot
+    }
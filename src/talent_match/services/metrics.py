@@ -0,0 +1,241 @@
+import bisect
+import threading
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from talent_match.config.settings import get_settings
+
+settings = get_settings()
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter with labels"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # Per label set: (bucket counts, sum, count)
+        self._values: Dict[LabelValues, Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total, count = self._values.get(
+                key, ([0] * (len(self.buckets) + 1), 0.0, 0))
+            counts[index] += 1
+            self._values[key] = (counts, total + value, count + 1)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(
+                        f"{self.name}_bucket{_labels(self.labelnames, key, ('le', le))} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {total}")
+                lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Process-wide metrics of the evaluation pipeline, rendered in the
+    Prometheus text exposition format.
+
+    Besides its own counters and histograms, the registry renders values
+    from collectors: callables returning (name, help, value) tuples read
+    at scrape time (e.g. scheduler or cache statistics). Values named
+    *_total are counters; the others are gauges.
+    """
+
+    def __init__(self):
+        self.stage_duration = Histogram(
+            "talent_match_stage_duration_seconds",
+            "Duration of evaluation stages",
+            ("stage",)
+        )
+        self.llm_calls = Counter(
+            "talent_match_llm_calls_total",
+            "Model calls by prompt type; cache hits did not reach the model",
+            ("prompt_type", "cache_hit")
+        )
+        self.llm_tokens = Counter(
+            "talent_match_llm_tokens_total",
+            "Tokens used by model calls (cached is a subset of prompt)",
+            ("model", "prompt_type", "kind")
+        )
+        self.llm_cost = Counter(
+            "talent_match_llm_cost_usd_total",
+            "Estimated cost of model calls from the model price table",
+            ("model", "prompt_type")
+        )
+        self.evaluations = Counter(
+            "talent_match_evaluations_total",
+            "Finished evaluations by outcome",
+            ("status",)
+        )
+        self.store_errors = Counter(
+            "talent_match_store_errors_total",
+            "Evaluation store writes that failed; the file logs still have the data",
+            ("operation",)
+        )
+        self.near_duplicates = Counter(
+            "talent_match_near_duplicates_total",
+            "Near-duplicate CV lookups: evaluation reused whole, partially re-run, or error",
+            ("outcome",)
+        )
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, float]]]] = []
+
+    def add_collector(self, collector: Callable[[], Iterable[Tuple[str, str, float]]]):
+        self._collectors.append(collector)
+
+    def record_llm_call(self, prompt_type: str, model: str, usage: Dict[str, int],
+                        cache_hit: bool) -> float:
+        """
+        Count a model call and its tokens
+
+        Returns:
+            Estimated cost in USD (0 for cache hits)
+        """
+        self.llm_calls.inc(prompt_type=prompt_type, cache_hit=str(cache_hit).lower())
+        if cache_hit:
+            return 0.0
+        for kind in ("prompt", "completion", "cached"):
+            self.llm_tokens.inc(
+                usage.get(f"{kind}_tokens", 0), model=model, prompt_type=prompt_type, kind=kind)
+        cost = estimate_cost(model, usage)
+        self.llm_cost.inc(cost, model=model, prompt_type=prompt_type)
+        return cost
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in (self.stage_duration, self.llm_calls, self.llm_tokens,
+                       self.llm_cost, self.evaluations, self.store_errors,
+                       self.near_duplicates):
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for name, documentation, value in collector():
+                kind = "counter" if name.endswith("_total") else "gauge"
+                lines.extend([
+                    f"# HELP {name} {documentation}",
+                    f"# TYPE {name} {kind}",
+                    f"{name} {value}",
+                ])
+        return "\n".join(lines) + "\n"
+
+
+def model_prices(model: str) -> Optional[Dict[str, float]]:
+    """Prices of a model, matching dated snapshots by their longest known prefix"""
+    for name in sorted(settings.MODEL_PRICES, key=len, reverse=True):
+        if model.startswith(name):
+            return settings.MODEL_PRICES[name]
+    return None
+
+
+def estimate_cost(model: str, usage: Dict[str, int]) -> float:
+    """
+    Estimated cost in USD of a call
+
+    Args:
+        model: Model name
+        usage: Token counts as returned by usage_to_dict
+
+    Returns:
+        Cost from the MODEL_PRICES table (USD per million tokens); 0 for
+        models without a price
+    """
+    prices = model_prices(model)
+    if prices is None:
+        return 0.0
+    cached = usage.get("cached_tokens", 0)
+    uncached = usage.get("prompt_tokens", 0) - cached
+    return (
+        uncached * prices["input"]
+        + cached * prices.get("cached_input", prices["input"])
+        + usage.get("completion_tokens", 0) * prices["output"]
+    ) / 1_000_000
+
+
+def _singleflight_collector():
+    from talent_match.services.singleflight import get_singleflight
+
+    stats = get_singleflight().stats()
+    yield ("talent_match_singleflight_executions_total",
+           "Evaluations started through request coalescing", stats["executions"])
+    yield ("talent_match_singleflight_coalesced_total",
+           "Evaluations served by an identical in-flight evaluation", stats["coalesced"])
+    yield ("talent_match_singleflight_in_flight",
+           "Coalescable evaluations in flight", stats["in_flight"])
+
+
+def _log_writer_collector():
+    from talent_match.services.log_writer import get_log_writer
+
+    if not settings.LOG_ASYNC_WRITES:
+        return
+    stats = get_log_writer().stats()
+    yield ("talent_match_log_writes_queued", "Session log writes queued", stats["queued"])
+    yield ("talent_match_log_writes_written", "Session log files written", stats["written"])
+    yield ("talent_match_log_writes_dropped",
+           "Session log writes dropped by the overflow policy", stats["dropped"])
+    yield ("talent_match_log_writes_failed", "Session log writes that failed", stats["failed"])
+    yield ("talent_match_log_queue_depth", "Session log writes waiting", stats["queue_depth"])
+
+
+@lru_cache()
+def get_metrics() -> MetricsRegistry:
+    registry = MetricsRegistry()
+    registry.add_collector(_singleflight_collector)
+    registry.add_collector(_log_writer_collector)
+    return registry
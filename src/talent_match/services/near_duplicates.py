@@ -0,0 +1,348 @@
+import hashlib
+import logging
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from talent_match.config.settings import get_settings
+from talent_match.services.evaluation_store import EvaluationStore
+from talent_match.services.result_cache import normalize_cv_text
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+# Sections of the analysis a CV change can affect
+SECTIONS = ("experience", "skills", "education")
+
+# Normalized heading lines that start each section of a CV
+SECTION_HEADINGS: Dict[str, Set[str]] = {
+    "experience": {
+        "experiencia", "experiencia laboral", "experiencia profesional",
+        "trayectoria profesional", "experience", "work experience",
+        "professional experience", "employment history",
+    },
+    "skills": {
+        "habilidades", "habilidades tecnicas", "competencias", "conocimientos",
+        "aptitudes", "tecnologias", "skills", "technical skills",
+    },
+    "education": {
+        "formacion", "formacion academica", "educacion", "estudios", "certificaciones",
+        "cursos", "education", "certifications", "courses",
+    },
+}
+
+# Mersenne prime modulus of the MinHash permutations
+_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def _plain(text: str) -> str:
+    text = unicodedata.normalize("NFKD", normalize_cv_text(text))
+    return "".join(c for c in text if not unicodedata.combining(c)).casefold()
+
+
+def shingles(text: str, size: int = settings.DEDUP_SHINGLE_SIZE) -> np.ndarray:
+    """
+    32-bit hashes of the word n-grams of a normalized CV text
+
+    Case, accents, punctuation and whitespace are ignored, so reformatted
+    copies of a CV share all their shingles.
+    """
+    words = _WORD_PATTERN.findall(_plain(text))
+    grams = {
+        " ".join(words[start:start + size])
+        for start in range(max(1, len(words) - size + 1))
+    }
+    return np.array(
+        [int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=4).digest(), "little")
+         for gram in grams],
+        dtype=np.uint64
+    )
+
+
+def lsh_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    Bands and rows per band of the LSH index
+
+    Picks the split whose S-curve midpoint (1/bands)^(1/rows) is closest
+    to, and not above, the threshold, so pairs at the threshold are
+    likely to share a bucket; candidates are then checked on their
+    estimated similarity.
+    """
+    best = (num_perm, 1)
+    best_gap = float("inf")
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        midpoint = (1 / bands) ** (1 / rows)
+        gap = threshold - midpoint
+        if 0 <= gap < best_gap:
+            best, best_gap = (bands, rows), gap
+    return best
+
+
+class NearDuplicateIndex:
+    """
+    MinHash signatures of CV texts with an LSH bucket index
+
+    A query hashes its signature into one bucket per band and only compares
+    the CVs sharing a bucket, so lookups do not scan the whole index. The
+    estimated Jaccard similarity of the shingle sets is the fraction of
+    equal signature values.
+    """
+
+    def __init__(self,
+                 threshold: float = settings.DEDUP_THRESHOLD,
+                 num_perm: int = settings.DEDUP_NUM_PERM,
+                 shingle_size: int = settings.DEDUP_SHINGLE_SIZE,
+                 seed: int = 1):
+        """
+        Args:
+            threshold: Minimum estimated similarity of a near-duplicate
+            num_perm: Signature length (more is more accurate and slower)
+            shingle_size: Words per shingle
+            seed: Seed of the hash permutations
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError("The near-duplicate threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.bands, self.rows = lsh_bands(threshold, num_perm)
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._buckets: List[Dict[bytes, Set[str]]] = [{} for _ in range(self.bands)]
+        self._lock = threading.Lock()
+        # Set once the CVs evaluated so far are indexed (see get_near_duplicate_index)
+        self.loaded = threading.Event()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._signatures
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of a CV text"""
+        hashes = shingles(text, self.shingle_size)
+        # a * x + b stays below 2^64 for 32-bit a, b and x
+        permuted = (np.outer(hashes, self._a) + self._b) % _PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [
+            signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    def add(self, doc_id: str, text: str) -> bool:
+        """
+        Index a CV text; an id is only indexed once
+
+        Returns:
+            False if the id was already indexed
+        """
+        if doc_id in self._signatures:
+            return False
+        signature = self.signature(text)
+        with self._lock:
+            if doc_id in self._signatures:
+                return False
+            self._signatures[doc_id] = signature
+            for buckets, key in zip(self._buckets, self._band_keys(signature)):
+                buckets.setdefault(key, set()).add(doc_id)
+        return True
+
+    def remove(self, doc_id: str) -> bool:
+        """Drop a CV from the index; False if it was not indexed"""
+        with self._lock:
+            signature = self._signatures.pop(doc_id, None)
+            if signature is None:
+                return False
+            for buckets, key in zip(self._buckets, self._band_keys(signature)):
+                bucket = buckets[key]
+                bucket.discard(doc_id)
+                if not bucket:
+                    del buckets[key]
+        return True
+
+    def query(self, text: str,
+              threshold: Optional[float] = None) -> List[Tuple[str, float]]:
+        """
+        Near-duplicates of a CV text
+
+        Args:
+            text: CV text
+            threshold: Minimum estimated similarity (default: the index's)
+
+        Returns:
+            (doc_id, similarity) from most to least similar
+        """
+        threshold = self.threshold if threshold is None else threshold
+        signature = self.signature(text)
+        with self._lock:
+            candidates = set()
+            for buckets, key in zip(self._buckets, self._band_keys(signature)):
+                candidates.update(buckets.get(key, ()))
+            similarities = [
+                (doc_id, float(np.mean(self._signatures[doc_id] == signature)))
+                for doc_id in candidates
+            ]
+        return sorted(
+            ((doc_id, round(similarity, 4)) for doc_id, similarity in similarities
+             if similarity >= threshold),
+            key=lambda item: (-item[1], item[0])
+        )
+
+
+def cv_sections(text: str) -> Dict[str, str]:
+    """
+    Split a CV into its experience, skills and education sections
+
+    A section starts at a heading line from SECTION_HEADINGS and runs until
+    the next one; text before the first heading goes to "header". Unknown
+    headings (languages, interests...) stay in the section above them.
+
+    Returns:
+        Normalized text by section, only for the sections found
+    """
+    headings = {
+        heading: section
+        for section, section_headings in SECTION_HEADINGS.items()
+        for heading in section_headings
+    }
+    sections: Dict[str, List[str]] = {}
+    current = "header"
+    for line in _plain(text).splitlines():
+        heading = " ".join(re.sub(r"[^\w ]+", " ", line).split())
+        if heading in headings:
+            current = headings[heading]
+            sections.setdefault(current, [])
+        elif line:
+            sections.setdefault(current, []).append(line)
+    return {section: "\n".join(lines) for section, lines in sections.items()}
+
+
+def _contact_token(token: str) -> bool:
+    return "@" in token or "://" in token or any(c.isdigit() for c in token)
+
+
+def changed_sections(previous_text: str, text: str) -> Set[str]:
+    """
+    Sections of the analysis that a CV edit can affect
+
+    A section is affected when its text changed. Changes before the first
+    heading only affect the skills (a profile paragraph often lists them),
+    and not even those when they only touch contact details (words with
+    digits, e-mails or links). CVs without recognizable headings are
+    affected everywhere.
+
+    Returns:
+        Subset of SECTIONS
+    """
+    before, after = cv_sections(previous_text), cv_sections(text)
+    if not set(SECTIONS) & (set(before) | set(after)):
+        return set(SECTIONS)
+    changed = {section for section in SECTIONS if before.get(section) != after.get(section)}
+    header_diff = set(before.get("header", "").split()) ^ set(after.get("header", "").split())
+    if any(not _contact_token(token) for token in header_diff):
+        changed.add("skills")
+    return changed
+
+
+@dataclass
+class NearDuplicate:
+    """A completed evaluation of a near-duplicate CV for the same job title"""
+    session_id: str
+    similarity: float
+    evaluation: Dict[str, Any]
+    # Sections the edit can affect, to analyze again
+    changed: Set[str] = field(default_factory=set)
+
+
+def find_near_duplicate(store: EvaluationStore, cv_text: str, job_title: str,
+                        fingerprint: str,
+                        threshold: Optional[float] = None,
+                        max_age_days: int = settings.DEDUP_MAX_AGE_DAYS
+                        ) -> Optional[NearDuplicate]:
+    """
+    Most similar CV already evaluated for a job title
+
+    Args:
+        store: Evaluation store of the log directory
+        cv_text: CV to evaluate
+        job_title: Job title to evaluate it for
+        fingerprint: Only sessions evaluated with this model, backend,
+            prompts and scoring (see OpenAIService.evaluation_fingerprint)
+        threshold: Minimum similarity (default settings.DEDUP_THRESHOLD)
+        max_age_days: Only sessions started this recently
+
+    Returns:
+        The near-duplicate, or None if no similar CV was evaluated for
+        this job title (or the index of the store is still loading)
+    """
+    index = get_near_duplicate_index(store)
+    if not index.loaded.is_set():
+        return None
+    since = datetime.now() - timedelta(days=max_age_days)
+    for hash_value, similarity in index.query(cv_text, threshold):
+        rows = store.find(
+            job_title=job_title, cv_hash=hash_value, status="completed",
+            fingerprint=fingerprint, since=since, limit=1, include_evaluation=True)
+        if not rows:
+            continue
+        session_id = rows[0]["session_id"]
+        previous_text = store.session_info(session_id)["cv_text"]
+        return NearDuplicate(
+            session_id=session_id,
+            similarity=similarity,
+            evaluation=rows[0]["final_evaluation"],
+            changed=changed_sections(previous_text, cv_text),
+        )
+    return None
+
+
+_indexes: Dict[str, NearDuplicateIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_near_duplicate_index(store: EvaluationStore) -> NearDuplicateIndex:
+    """
+    Index of the CVs of a store's completed sessions
+
+    The first call starts loading the completed sessions in a background
+    thread and returns at once; CVs can be added meanwhile, and the index
+    is usable when its `loaded` event is set.
+    """
+    key = str(store.path)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = NearDuplicateIndex()
+            threading.Thread(
+                target=_load_index, args=(index, store, key),
+                name="near-duplicate-index", daemon=True
+            ).start()
+    return index
+
+
+def _load_index(index: NearDuplicateIndex, store: EvaluationStore, key: str):
+    try:
+        for hash_value, cv_text in store.iter_completed_cvs():
+            index.add(hash_value, cv_text)
+    except Exception:
+        logger.exception("Could not load the near-duplicate index of %s", key)
+        # Forget it so the next call tries again
+        with _indexes_lock:
+            if _indexes.get(key) is index:
+                del _indexes[key]
+        return
+    index.loaded.set()
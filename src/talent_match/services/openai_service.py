@@ -1,49 +1,581 @@
-from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import hashlib
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from openai import OpenAI
+from openai import AsyncOpenAI
+from pydantic import ValidationError
 
 from talent_match.config.settings import get_settings
 from talent_match.models.evaluation import CompleteEvaluation, Summary
+from talent_match.models.matching import CVExtraction
 from talent_match.models.responses import (
+    CVExtractionResponse,
     EducationResponse,
     ExperienceResponse,
+    ExtractionResponse,
+    RelevanceResponse,
     SkillsResponse,
     SummaryResponse,
 )
 from talent_match.prompts.cv_prompt import CVPrompt
+from talent_match.prompts.evaluation.combined_prompt import CombinedPrompt
 from talent_match.prompts.evaluation.education_prompt import EducationPrompt
 from talent_match.prompts.evaluation.experience_prompt import ExperiencePrompt
+from talent_match.prompts.evaluation.extraction_prompt import CVExtractionPrompt
+from talent_match.prompts.evaluation.relevance_prompt import RelevancePrompt
 from talent_match.prompts.evaluation.skills_prompt import SkillsPrompt
 from talent_match.prompts.evaluation.summary_prompt import SummaryPrompt
-from talent_match.services.evaluation_service import EvaluationService
+from talent_match.services.client_registry import get_client_registry
+from talent_match.services.evaluation_service import SCORING_SETTINGS, EvaluationService
+from talent_match.services.evaluation_store import cv_hash
 from talent_match.services.logging_service import CVLoggingService
+from talent_match.services.metrics import get_metrics
+from talent_match.services.near_duplicates import (
+    NearDuplicate,
+    find_near_duplicate,
+    get_near_duplicate_index,
+)
+from talent_match.services.rate_limiter import (
+    RequestScheduler,
+    RetryableError,
+    estimate_message_tokens,
+    estimate_tokens,
+    get_request_scheduler,
+)
+from talent_match.services.result_cache import (
+    ResultCache,
+    get_result_cache,
+    make_cache_key,
+)
+from talent_match.services.singleflight import get_singleflight
+from talent_match.services.tracing import Trace, current_trace, span
+from talent_match.services.usage_stats import (
+    current_call_usage,
+    get_usage_stats,
+    usage_to_dict,
+)
 
 settings = get_settings()
 
+logger = logging.getLogger(__name__)
+
+# Sections that can be restored from a previous session
+SECTION_RESPONSES = {
+    "experience": (ExperienceResponse, "experiences"),
+    "skills": (SkillsResponse, "skills"),
+    "education": (EducationResponse, "education"),
+}
+
+# "parallel": one call per section; "combined": a single call for all three
+EXTRACTION_MODES = ("parallel", "combined")
+
+PROMPT_LAYOUTS = ("instructions_first", "cv_first")
+
+# Called with ("experience" | "skills" | "education", result) as each section
+# is ready, ("score", fit_score) and finally ("summary", CompleteEvaluation)
+ProgressCallback = Callable[[str, Any], None]
+
+
+class EvaluationError(Exception):
+    """An analysis failed; `session_id` can be passed back to resume it"""
+
+    def __init__(self, message: str, session_id: str):
+        super().__init__(message)
+        self.session_id = session_id
+
+
+@dataclass
+class JobMatch:
+    """Result of matching a CV against one job title (see match_jobs)"""
+    job_title: str
+    session_id: str
+    evaluation: Optional[CompleteEvaluation] = None
+    error: Optional[str] = None
+
+    @property
+    def fit_score(self) -> Optional[float]:
+        return self.evaluation.summary.fit_score if self.evaluation is not None else None
+
+
+async def gather_or_cancel(*aws):
+    """
+    Run awaitables concurrently like asyncio.gather, but cancel the
+    remaining ones as soon as one of them fails.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
 
 class OpenAIService:
-    def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
-        self.executor = ThreadPoolExecutor(max_workers=3)
+    def __init__(self,
+                 api_key: Optional[str] = None,
+                 base_url: Optional[str] = None,
+                 client: Optional[AsyncOpenAI] = None,
+                 cache: Optional[ResultCache] = None,
+                 prompt_layout: Optional[str] = None,
+                 scheduler: Optional[RequestScheduler] = None):
+        self.api_key = api_key or settings.OPENAI_API_KEY
+        self.base_url = base_url or settings.OPENAI_BASE_URL
+        # An explicit client bypasses the shared registry
+        self.client = client
+        if cache is None and settings.RESULT_CACHE_ENABLED:
+            cache = get_result_cache()
+        self.cache = cache
+        # An explicit scheduler bypasses the process-wide one for the key
+        self.scheduler = scheduler
+        self.prompt_layout = prompt_layout or settings.PROMPT_LAYOUT
+        if self.prompt_layout not in PROMPT_LAYOUTS:
+            raise ValueError(
+                f"Unknown prompt layout {self.prompt_layout!r}; "
+                f"expected one of {', '.join(PROMPT_LAYOUTS)}")
         self.evaluation_service = EvaluationService()
         self.logging_service = CVLoggingService()
+        if self._dedup_enabled():
+            # Start loading the index now rather than in the first request
+            get_near_duplicate_index(self.logging_service.store)
+
+    async def analyze_cv(self, cv_text: str, job_title: str,
+                         session_id: Optional[str] = None,
+                         extraction_mode: Optional[str] = None,
+                         on_progress: Optional[ProgressCallback] = None,
+                         started_session_id: Optional[str] = None) -> CompleteEvaluation:
+        """
+        Evaluate a CV for a job title.
+
+        Passing the session_id of a failed analysis resumes it: sections
+        already persisted in that session are reused and only the missing
+        ones (plus the summary) are sent to the model.
+
+        started_session_id logs a fresh analysis into a session the caller
+        already started with CVLoggingService.start_session (e.g. to return
+        its id before the analysis runs), instead of starting a new one.
+
+        extraction_mode overrides settings.EXTRACTION_MODE: "parallel" runs
+        one call per section, "combined" extracts the three sections in a
+        single call so the CV is only sent once before the summary.
+
+        on_progress, if given, is called on the event loop with each partial
+        result as soon as it is available, so callers can render sections
+        progressively instead of waiting for the whole evaluation.
+
+        Every stage is timed in the stage histogram of the metrics registry;
+        with settings.TRACE_SESSIONS the spans are also saved as trace.json
+        in the session directory.
+        """
+        extraction_mode = extraction_mode or settings.EXTRACTION_MODE
+        if extraction_mode not in EXTRACTION_MODES:
+            raise ValueError(
+                f"Unknown extraction mode {extraction_mode!r}; "
+                f"expected one of {', '.join(EXTRACTION_MODES)}")
+        if session_id and started_session_id:
+            raise ValueError("Pass either session_id (to resume) or started_session_id")
+
+        trace = Trace() if settings.TRACE_SESSIONS else None
+        token = current_trace.set(trace)
+        try:
+            with span("analysis", extraction_mode=extraction_mode) as attributes:
+                restored = {}
+                if session_id:
+                    with span("log:restore_sections"):
+                        restored = await asyncio.to_thread(
+                            self._restore_sections, session_id, cv_text, job_title)
+                    attributes["restored"] = sorted(restored)
+                elif started_session_id:
+                    session_id = started_session_id
+                else:
+                    # Start logging session (file I/O runs off the event loop)
+                    with span("log:start_session"):
+                        session_id = await asyncio.to_thread(
+                            self.logging_service.start_session, job_title, cv_text)
+
+                try:
+                    reused = None
+                    if not restored and self._dedup_enabled():
+                        restored, reused = await self._near_duplicate(
+                            cv_text, job_title, session_id, extraction_mode)
+
+                    if reused is not None:
+                        evaluation = await self._deliver_copy(
+                            reused, session_id, extraction_mode, on_progress)
+                    elif restored or not settings.COALESCE_EVALUATIONS:
+                        evaluation = await self._run_analysis(
+                            cv_text, job_title, session_id, restored, extraction_mode,
+                            on_progress)
+                    else:
+                        evaluation = await self._coalesced_analysis(
+                            cv_text, job_title, session_id, extraction_mode, on_progress)
+                except Exception as e:
+                    get_metrics().evaluations.inc(status="failed")
+                    raise EvaluationError(str(e), session_id) from e
+                get_metrics().evaluations.inc(status="completed")
+                if self._dedup_enabled():
+                    try:
+                        await asyncio.to_thread(
+                            get_near_duplicate_index(self.logging_service.store).add,
+                            cv_hash(cv_text), cv_text)
+                    except Exception:
+                        logger.exception("Could not index the CV of session %s", session_id)
+                return evaluation
+        finally:
+            current_trace.reset(token)
+            if trace is not None and session_id:
+                await asyncio.to_thread(
+                    self.logging_service.log_trace, trace.to_dict(), session_id)
+
+    async def match_jobs(self, cv_text: str, job_titles: List[str],
+                         summaries: Optional[bool] = None) -> List[JobMatch]:
+        """
+        Match a CV against several job titles in two phases.
+
+        The job-independent data (positions, dates, skills and levels,
+        degrees and courses) is extracted once per CV, cached by CV content
+        and shared with concurrent extractions of the same CV. Each job
+        title then costs one relevance call over the compact extraction,
+        without resending the CV. Every job title gets its own session, as
+        with analyze_cv; the extraction is logged in the first one.
+
+        summaries (default settings.MATCH_SUMMARIES) also generates the
+        summary of every match from the analysis digest.
+
+        Returns:
+            One JobMatch per job title, in order; a failed job title has
+            its error set instead of an evaluation
+        """
+        if summaries is None:
+            summaries = settings.MATCH_SUMMARIES
+        with span("match", jobs=len(job_titles)):
+            with span("log:start_session"):
+                session_ids = await asyncio.gather(*(
+                    asyncio.to_thread(self.logging_service.start_session, job_title, cv_text)
+                    for job_title in job_titles
+                ))
+            if not session_ids:
+                return []
+
+            try:
+                with span("section:extraction"):
+                    extraction = await self.extract_cv(cv_text, session_ids[0])
+            except Exception as e:
+                get_metrics().evaluations.inc(len(job_titles), status="failed")
+                await asyncio.gather(*(
+                    asyncio.to_thread(self.logging_service.log_error, str(e), session_id)
+                    for session_id in session_ids
+                ))
+                return [
+                    JobMatch(job_title, session_id, error=str(e))
+                    for job_title, session_id in zip(job_titles, session_ids)
+                ]
+
+            async def match(job_title: str, session_id: str) -> JobMatch:
+                try:
+                    evaluation = await self._match_job(
+                        cv_text, job_title, extraction, session_id,
+                        summaries, extraction_session=session_ids[0])
+                except Exception as e:
+                    get_metrics().evaluations.inc(status="failed")
+                    await asyncio.to_thread(self.logging_service.log_error, str(e), session_id)
+                    return JobMatch(job_title, session_id, error=str(e))
+                get_metrics().evaluations.inc(status="completed")
+                return JobMatch(job_title, session_id, evaluation=evaluation)
+
+            return await asyncio.gather(*(
+                match(job_title, session_id)
+                for job_title, session_id in zip(job_titles, session_ids)
+            ))
+
+    async def extract_cv(self, cv_text: str, session_id: str) -> CVExtraction:
+        """
+        Extract the job-independent data of a CV.
+
+        The result is cached under the normalized CV text (not the job
+        title), and identical extractions in flight share one model call.
+        """
+        key = self._flight_key(
+            self._cache_key("extraction", cv_text, "", CVExtractionPrompt.template,
+                            always=True))
+        extraction, _ = await get_singleflight().do(
+            key, lambda: self._analyze_extraction(cv_text, session_id))
+        return extraction
+
+    async def _match_job(self, cv_text: str, job_title: str, extraction: CVExtraction,
+                         session_id: str, summary: bool,
+                         extraction_session: Optional[str] = None) -> CompleteEvaluation:
+        with span("section:relevance"):
+            relevance = await self._analyze_relevance(
+                cv_text, job_title, extraction, session_id, extraction_session)
+        evaluation = extraction.to_evaluation(relevance)
+
+        with span("score"):
+            fit_score = self.evaluation_service.calculate_final_score(evaluation)
+        evaluation.summary.fit_score = fit_score
+        if summary:
+            with span("summary"):
+                evaluation.summary = await self._generate_summary(
+                    cv_text, job_title, evaluation, fit_score, session_id,
+                    include_cv=False)
+
+        with span("log:final_evaluation"):
+            await asyncio.to_thread(
+                self.logging_service.log_final_evaluation,
+                evaluation.dict(),
+                session_id=session_id
+            )
+        return evaluation
+
+    async def _coalesced_analysis(self, cv_text: str, job_title: str, session_id: str,
+                                  extraction_mode: str,
+                                  on_progress: Optional[ProgressCallback] = None
+                                  ) -> CompleteEvaluation:
+        """
+        Run a fresh analysis, sharing it with identical analyses in flight.
+
+        Requests for the same normalized CV, job title, model and prompts
+        wait for the evaluation already running instead of repeating its
+        model calls; the shared result is logged in their own session.
+        """
+        key = self._flight_key(self._cache_key(
+            "evaluation", cv_text, job_title,
+            SummaryPrompt.template + CombinedPrompt.template,
+            extra={
+                "extraction_mode": extraction_mode,
+                "summary_include_cv": settings.SUMMARY_INCLUDE_CV,
+            },
+            always=True
+        ))
+        with span("coalesce") as attributes:
+            evaluation, shared = await get_singleflight().do(
+                key,
+                lambda: self._run_analysis(
+                    cv_text, job_title, session_id, {}, extraction_mode, on_progress)
+            )
+            attributes["shared"] = shared
+        if not shared:
+            return evaluation
+
+        # Callers get their own copy of the shared evaluation
+        return await self._deliver_copy(
+            evaluation.model_copy(deep=True), session_id, extraction_mode, on_progress)
+
+    async def _deliver_copy(self, evaluation: CompleteEvaluation, session_id: str,
+                            extraction_mode: str,
+                            on_progress: Optional[ProgressCallback] = None
+                            ) -> CompleteEvaluation:
+        """Report and log an evaluation computed for another session"""
+        if on_progress is not None:
+            on_progress("experience", evaluation.experiences)
+            on_progress("skills", evaluation.skills)
+            on_progress("education", evaluation.education)
+            on_progress("score", evaluation.summary.fit_score)
+            on_progress("summary", evaluation)
+        with span("log:final_evaluation"):
+            await asyncio.to_thread(
+                self.logging_service.log_final_evaluation,
+                evaluation.dict(),
+                session_id=session_id,
+                fingerprint=self.evaluation_fingerprint(extraction_mode)
+            )
+        return evaluation
+
+    def _restore_sections(self, session_id: str, cv_text: str, job_title: str):
+        session_info = self.logging_service.resume_session(session_id)
+        if (session_info.get("cv_text") != cv_text
+                or session_info.get("job_title") != job_title):
+            raise ValueError(
+                f"Session {session_id} was started for a different CV or job title")
+        return self._sections_from_responses(
+            self.logging_service.load_prompt_responses(session_id))
 
-    async def analyze_cv(self, cv_text: str, job_title: str) -> CompleteEvaluation:
-        # Start logging session
-        session_id = self.logging_service.start_session(job_title, cv_text)
+    def evaluation_fingerprint(self, extraction_mode: str) -> str:
+        """
+        Hash of everything besides the CV and job title that an evaluation
+        depends on: model, sampling, backend, prompts, message layout and
+        scoring settings. Near-duplicate reuse requires the same one.
+        """
+        return make_cache_key(
+            "evaluation", "", "",
+            "".join(prompt.template for prompt in (
+                CVPrompt, ExperiencePrompt, SkillsPrompt, EducationPrompt,
+                CombinedPrompt, SummaryPrompt)),
+            extra={
+                "base_url": self.base_url,
+                "prompt_layout": self.prompt_layout,
+                "extraction_mode": extraction_mode,
+                "summary_include_cv": settings.SUMMARY_INCLUDE_CV,
+                "scoring": {name: getattr(settings, name) for name in SCORING_SETTINGS},
+            }
+        )
 
-        # Create futures for parallel execution
-        experience_future = self.executor.submit(
-            self._analyze_experience, cv_text, job_title)
-        skills_future = self.executor.submit(
-            self._analyze_skills, cv_text, job_title)
-        education_future = self.executor.submit(
-            self._analyze_education, cv_text, job_title)
+    def _dedup_enabled(self) -> bool:
+        return settings.DEDUP_ENABLED and self.logging_service.store is not None
 
-        # Wait for all futures to complete
-        experience_result = experience_future.result()
-        skills_result = skills_future.result()
-        education_result = education_future.result()
+    async def _near_duplicate(self, cv_text: str, job_title: str, session_id: str,
+                              extraction_mode: str
+                              ) -> Tuple[Dict[str, Any], Optional[CompleteEvaluation]]:
+        """
+        Reuse what was evaluated for a near-duplicate CV and the same job
+        title with the same evaluation fingerprint. The reused sections are
+        logged in this session, marked with the session they come from.
+        Best effort: if the lookup fails the CV is analyzed in full.
+
+        Returns:
+            The sections the edit cannot have affected, to reuse instead of
+            analyzing them again, and the whole evaluation if none changed
+            and settings.DEDUP_REUSE_EVALUATIONS allows it
+        """
+        with span("dedup") as attributes:
+            try:
+                duplicate, restored, evaluation = await asyncio.to_thread(
+                    self._near_duplicate_sections, cv_text, job_title, session_id,
+                    extraction_mode)
+            except Exception as e:
+                logger.warning("Near-duplicate lookup failed, analyzing in full: %s", e)
+                get_metrics().near_duplicates.inc(outcome="error")
+                attributes["error"] = str(e)
+                return {}, None
+            if duplicate is None or not restored:
+                return {}, None
+            attributes.update(
+                session_id=duplicate.session_id,
+                similarity=duplicate.similarity,
+                rerun=sorted(set(SECTION_RESPONSES) - set(restored)))
+        get_metrics().near_duplicates.inc(
+            outcome="reused" if evaluation is not None else "partial")
+        return restored, evaluation
+
+    def _near_duplicate_sections(self, cv_text: str, job_title: str, session_id: str,
+                                 extraction_mode: str
+                                 ) -> Tuple[Optional[NearDuplicate], Dict[str, Any],
+                                            Optional[CompleteEvaluation]]:
+        store = self.logging_service.store
+        duplicate = find_near_duplicate(
+            store, cv_text, job_title, self.evaluation_fingerprint(extraction_mode))
+        if duplicate is None:
+            return None, {}, None
+        sections = self._sections_from_responses(store.prompt_responses(duplicate.session_id))
+        restored = {
+            prompt_type: result for prompt_type, result in sections.items()
+            if prompt_type not in duplicate.changed
+        }
+        evaluation = None
+        if settings.DEDUP_REUSE_EVALUATIONS and len(restored) == len(SECTION_RESPONSES):
+            evaluation = CompleteEvaluation.model_validate(duplicate.evaluation)
+
+        # So this session can be resumed, audited and reused in turn
+        for prompt_type, result in restored.items():
+            response_format, field = SECTION_RESPONSES[prompt_type]
+            self.logging_service.log_prompt_result(
+                prompt_type=prompt_type,
+                prompt_text="",
+                response=response_format(**{field: result}).dict(),
+                session_id=session_id,
+                metadata={"reused_from": duplicate.session_id,
+                          "similarity": duplicate.similarity}
+            )
+        return duplicate, restored, evaluation
+
+    @staticmethod
+    def _sections_from_responses(responses: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Sections that can be parsed back from the logged responses of a session"""
+        restored = {}
+        for prompt_type, (response_format, field) in SECTION_RESPONSES.items():
+            if prompt_type not in responses:
+                continue
+            try:
+                parsed = response_format.model_validate(responses[prompt_type])
+            except ValidationError:
+                # Unusable log entry: analyze the section again
+                continue
+            restored[prompt_type] = getattr(parsed, field)
+
+        # A combined extraction covers every section still missing
+        if "combined" in responses and len(restored) < len(SECTION_RESPONSES):
+            try:
+                parsed = ExtractionResponse.model_validate(responses["combined"])
+            except ValidationError:
+                return restored
+            for prompt_type, (_, field) in SECTION_RESPONSES.items():
+                restored.setdefault(prompt_type, getattr(parsed, field))
+        return restored
+
+    async def _run_section(self, restored, prompt_type: str, analyze,
+                           cv_text: str, job_title: str, session_id: str,
+                           on_progress: Optional[ProgressCallback] = None):
+        if prompt_type in restored:
+            result = restored[prompt_type]
+        else:
+            with span(f"section:{prompt_type}"):
+                result = await analyze(cv_text, job_title, session_id)
+        if on_progress is not None:
+            on_progress(prompt_type, result)
+        return result
+
+    async def _extract_sections(self, cv_text: str, job_title: str, session_id: str,
+                                restored, extraction_mode: str,
+                                on_progress: Optional[ProgressCallback] = None):
+        if extraction_mode == "combined":
+            if len(restored) < len(SECTION_RESPONSES):
+                with span("section:combined"):
+                    experiences, skills, education = await self._analyze_combined(
+                        cv_text, job_title, session_id)
+                restored = {
+                    "experience": experiences,
+                    "skills": skills,
+                    "education": education,
+                    **restored,
+                }
+            if on_progress is not None:
+                for prompt_type in SECTION_RESPONSES:
+                    on_progress(prompt_type, restored[prompt_type])
+            return restored["experience"], restored["skills"], restored["education"]
+
+        # Run the missing section analyses concurrently
+        return await gather_or_cancel(
+            self._run_section(restored, "experience", self._analyze_experience,
+                              cv_text, job_title, session_id, on_progress),
+            self._run_section(restored, "skills", self._analyze_skills,
+                              cv_text, job_title, session_id, on_progress),
+            self._run_section(restored, "education", self._analyze_education,
+                              cv_text, job_title, session_id, on_progress),
+        )
+
+    async def _run_analysis(self, cv_text: str, job_title: str, session_id: str,
+                            restored, extraction_mode: str,
+                            on_progress: Optional[ProgressCallback] = None
+                            ) -> CompleteEvaluation:
+        # Collect the usage of the extraction calls for the per-mode stats
+        calls = []
+        token = current_call_usage.set(calls)
+        started = time.perf_counter()
+        try:
+            experience_result, skills_result, education_result = (
+                await self._extract_sections(
+                    cv_text, job_title, session_id, restored, extraction_mode,
+                    on_progress)
+            )
+        finally:
+            current_call_usage.reset(token)
+        if calls:
+            get_usage_stats().record(
+                f"extraction:{extraction_mode}",
+                time.perf_counter() - started,
+                {
+                    key: sum(call[key] for call in calls)
+                    for key in ("prompt_tokens", "cached_tokens",
+                                "completion_tokens", "total_tokens")
+                },
+                calls=len(calls),
+                cache_hits=sum(1 for call in calls if call["cache_hit"])
+            )
 
         # Create initial evaluation without summary
         evaluation = CompleteEvaluation(
@@ -59,158 +591,306 @@ class OpenAIService:
         )
 
         # Calculate score using evaluation service
-        fit_score = self.evaluation_service.calculate_final_score(evaluation)
+        with span("score"):
+            fit_score = self.evaluation_service.calculate_final_score(evaluation)
+        if on_progress is not None:
+            on_progress("score", fit_score)
 
         # Generate summary with calculated score
-        summary = self._generate_summary(
-            cv_text,
-            job_title,
-            evaluation,
-            fit_score
-        )
+        with span("summary"):
+            summary = await self._generate_summary(
+                cv_text,
+                job_title,
+                evaluation,
+                fit_score,
+                session_id
+            )
 
         # Update evaluation with summary
         evaluation.summary = summary
+        if on_progress is not None:
+            on_progress("summary", evaluation)
 
         # Log final evaluation
-        self.logging_service.log_final_evaluation(
-            evaluation.dict(),
-            session_id=session_id
-        )
+        with span("log:final_evaluation"):
+            await asyncio.to_thread(
+                self.logging_service.log_final_evaluation,
+                evaluation.dict(),
+                session_id=session_id,
+                fingerprint=self.evaluation_fingerprint(extraction_mode)
+            )
 
         return evaluation
 
-    def _analyze_experience(self, cv_text: str, job_title: str):
-        prompt = ExperiencePrompt.format(job_title=job_title)
+    @asynccontextmanager
+    async def _client(self):
+        if self.client is not None:
+            yield self.client
+            return
+        async with get_client_registry().lease(self.api_key, self.base_url) as client:
+            yield client
+
+    def _cache_key(self, prompt_type: str, cv_text: str, job_title: str,
+                   prompt_template: str, extra=None, always: bool = False) -> Optional[str]:
+        if self.cache is None and not always:
+            return None
+        # Results of another backend (e.g. the fake LLM) or message layout
+        # must not be served for this one
+        return make_cache_key(
+            prompt_type,
+            cv_text,
+            job_title,
+            prompt_template + CVPrompt.template,
+            extra={
+                "base_url": self.base_url,
+                "prompt_layout": self.prompt_layout,
+                "extra": extra,
+            }
+        )
 
-        messages = [
-            {"role": "system", "content": prompt},
-            {"role": "user", "content": CVPrompt.format(cv_text=cv_text)}
-        ]
+    def _flight_key(self, key: str) -> str:
+        """Singleflight key: in-flight calls are only shared within one API key"""
+        account = hashlib.sha256(self.api_key.encode("utf-8")).hexdigest()[:16]
+        return f"{account}:{key}"
 
-        completion = self.client.beta.chat.completions.parse(
-            model=settings.OPENAI_MODEL,
-            messages=messages,
-            response_format=ExperienceResponse,
-            seed=settings.OPENAI_SEED,
-            temperature=settings.OPENAI_TEMPERATURE
-        )
+    def _section_messages(self, prompt: str, cv_text: str):
+        """
+        Build the messages of a section analysis.
 
-        message = completion.choices[0].message
-        if message.parsed:
-            # Log prompt result
-            self.logging_service.log_prompt_result(
-                prompt_type="experience",
+        With the "cv_first" layout every section call starts with the same
+        CV block and only the trailing instructions differ, so the provider
+        can serve the shared prefix from its prompt cache.
+        """
+        cv_message = {"role": "user", "content": CVPrompt.format(cv_text=cv_text)}
+        if self.prompt_layout == "cv_first":
+            return [cv_message, {"role": "system", "content": prompt}]
+        return [{"role": "system", "content": prompt}, cv_message]
+
+    async def _parse(self, prompt_type: str, prompt: str, messages, response_format,
+                     session_id: str, cache_key: Optional[str] = None,
+                     metadata: Optional[Dict[str, Any]] = None,
+                     stats_label: Optional[str] = None,
+                     prepare: Optional[Callable[[Any], None]] = None):
+        """
+        Run a structured-output completion and log its parsed result.
+
+        When a cache key is given the parsed response is served from (and
+        stored in) the result cache, skipping the model call on a hit.
+        Extra metadata is added to the prompt log; latency and usage are
+        recorded under stats_label (default "call:<prompt_type>"), and
+        tokens and estimated cost in the metrics registry. prepare, if
+        given, adjusts the parsed response before it is logged.
+        """
+        started = time.perf_counter()
+        usage = usage_to_dict(None)
+        parsed = None
+        if cache_key:
+            with span("cache:get"):
+                parsed = await asyncio.to_thread(
+                    self.cache.get, cache_key, response_format)
+
+        if parsed is None:
+            def validate(completion):
+                message = completion.choices[0].message
+                if not message.parsed:
+                    raise RetryableError(
+                        f"Failed to parse {prompt_type} response: {message.refusal}")
+
+            async with self._client() as client:
+                scheduler = self.scheduler or get_request_scheduler(self.api_key)
+                with span(f"llm:{prompt_type}", model=settings.OPENAI_MODEL) as attributes:
+                    completion = await scheduler.call(
+                        lambda: client.beta.chat.completions.with_raw_response.parse(
+                            model=settings.OPENAI_MODEL,
+                            messages=messages,
+                            response_format=response_format,
+                            seed=settings.OPENAI_SEED,
+                            temperature=settings.OPENAI_TEMPERATURE
+                        ),
+                        estimated_tokens=(
+                            estimate_message_tokens(messages)
+                            + settings.EXPECTED_COMPLETION_TOKENS
+                        ),
+                        validate=validate
+                    )
+                    usage = usage_to_dict(completion.usage)
+                    attributes["usage"] = usage
+            parsed = completion.choices[0].message.parsed
+            cache_hit = False
+
+            if cache_key:
+                with span("cache:set"):
+                    await asyncio.to_thread(self.cache.set, cache_key, parsed)
+        else:
+            cache_hit = True
+
+        latency = time.perf_counter() - started
+        get_usage_stats().record(
+            stats_label or f"call:{prompt_type}", latency, usage,
+            cache_hits=int(cache_hit))
+        calls = current_call_usage.get()
+        if calls is not None:
+            calls.append({"prompt_type": prompt_type, "cache_hit": cache_hit, **usage})
+        cost = get_metrics().record_llm_call(
+            prompt_type, settings.OPENAI_MODEL, usage, cache_hit)
+        metadata = {
+            **(metadata or {}),
+            "cache_hit": cache_hit,
+            "latency": round(latency, 3),
+            "usage": usage,
+            "model": settings.OPENAI_MODEL,
+            "cost_usd": round(cost, 6),
+        }
+
+        if prepare is not None:
+            prepare(parsed)
+
+        # Log prompt result
+        with span("log:prompt_result", prompt_type=prompt_type):
+            await asyncio.to_thread(
+                self.logging_service.log_prompt_result,
+                prompt_type=prompt_type,
                 prompt_text=prompt,
-                response=message.parsed.dict(),
-                messages=messages
+                response=parsed.dict(),
+                messages=messages,
+                session_id=session_id,
+                metadata=metadata
             )
-            return message.parsed.experiences
-        else:
-            raise ValueError(
-                f"Failed to parse experience response: {message.refusal}")
+        return parsed
 
-    def _analyze_skills(self, cv_text: str, job_title: str):
-        prompt = SkillsPrompt.format(job_title=job_title)
+    async def _analyze_experience(self, cv_text: str, job_title: str, session_id: str):
+        prompt = ExperiencePrompt.format(job_title=job_title)
 
-        messages = [
-            {"role": "system", "content": prompt},
-            {"role": "user", "content": CVPrompt.format(cv_text=cv_text)}
-        ]
+        messages = self._section_messages(prompt, cv_text)
 
-        completion = self.client.beta.chat.completions.parse(
-            model=settings.OPENAI_MODEL,
-            messages=messages,
-            response_format=SkillsResponse,
-            seed=settings.OPENAI_SEED,
-            temperature=settings.OPENAI_TEMPERATURE
-        )
+        cache_key = self._cache_key(
+            "experience", cv_text, job_title, ExperiencePrompt.template)
+        parsed = await self._parse(
+            "experience", prompt, messages, ExperienceResponse, session_id, cache_key)
+        return parsed.experiences
 
-        message = completion.choices[0].message
-        if message.parsed:
-            # Log prompt result
-            self.logging_service.log_prompt_result(
-                prompt_type="skills",
-                prompt_text=prompt,
-                response=message.parsed.dict(),
-                messages=messages
+    async def _analyze_skills(self, cv_text: str, job_title: str, session_id: str):
+        prompt = SkillsPrompt.format(job_title=job_title)
 
-            )
-            return message.parsed.skills
-        else:
-            raise ValueError(
-                f"Failed to parse skills response: {message.refusal}")
+        messages = self._section_messages(prompt, cv_text)
+
+        cache_key = self._cache_key(
+            "skills", cv_text, job_title, SkillsPrompt.template)
+        parsed = await self._parse(
+            "skills", prompt, messages, SkillsResponse, session_id, cache_key)
+        return parsed.skills
 
-    def _analyze_education(self, cv_text: str, job_title: str):
+    async def _analyze_education(self, cv_text: str, job_title: str, session_id: str):
         prompt = EducationPrompt.format(job_title=job_title)
 
-        messages = [
-            {"role": "system", "content": prompt},
-            {"role": "user", "content": CVPrompt.format(cv_text=cv_text)}
-        ]
+        messages = self._section_messages(prompt, cv_text)
 
-        completion = self.client.beta.chat.completions.parse(
-            model=settings.OPENAI_MODEL,
-            messages=messages,
-            response_format=EducationResponse,
-            seed=settings.OPENAI_SEED,
-            temperature=settings.OPENAI_TEMPERATURE
-        )
+        cache_key = self._cache_key(
+            "education", cv_text, job_title, EducationPrompt.template)
+        parsed = await self._parse(
+            "education", prompt, messages, EducationResponse, session_id, cache_key)
+        return parsed.education
 
-        message = completion.choices[0].message
-        if message.parsed:
-            # Log prompt result
-            self.logging_service.log_prompt_result(
-                prompt_type="education",
-                prompt_text=prompt,
-                response=message.parsed.dict(),
-                messages=messages
-            )
-            return message.parsed.education
-        else:
-            raise ValueError(
-                f"Failed to parse education response: {message.refusal}")
+    async def _analyze_combined(self, cv_text: str, job_title: str, session_id: str):
+        prompt = CombinedPrompt.format(job_title=job_title)
 
-    def _generate_summary(self, cv_text: str, job_title: str,
-                          evaluation: CompleteEvaluation,
-                          fit_score: float):
-        prompt = SummaryPrompt.format(job_title=job_title)
-        cv_analysis_text = f"""
-            {CVPrompt.format(cv_text=cv_text)}
-            
-            Análisis previo:
-            Experiencias: {evaluation.experiences}
-            Habilidades: {evaluation.skills}
-            Educación: {evaluation.education}
-            Puntuación calculada: {fit_score}
-        """
+        messages = self._section_messages(prompt, cv_text)
+
+        cache_key = self._cache_key(
+            "combined", cv_text, job_title, CombinedPrompt.template)
+        parsed = await self._parse(
+            "combined", prompt, messages, ExtractionResponse, session_id, cache_key)
+        return parsed.experiences, parsed.skills, parsed.education
+
+    async def _analyze_extraction(self, cv_text: str, session_id: str) -> CVExtraction:
+        prompt = CVExtractionPrompt.format()
+
+        messages = self._section_messages(prompt, cv_text)
+
+        cache_key = self._cache_key(
+            "extraction", cv_text, "", CVExtractionPrompt.template)
+        parsed = await self._parse(
+            "extraction", prompt, messages, CVExtractionResponse, session_id, cache_key)
+        return parsed.extraction
+
+    async def _analyze_relevance(self, cv_text: str, job_title: str,
+                                 extraction: CVExtraction, session_id: str,
+                                 extraction_session: Optional[str] = None):
+        prompt = RelevancePrompt.format(job_title=job_title)
+        digest = extraction.digest()
 
         messages = [
             {"role": "system", "content": prompt},
-            {"role": "user", "content": cv_analysis_text}
+            {"role": "user", "content": f"Datos extraídos del CV (JSON):\n{digest}"}
         ]
 
-        completion = self.client.beta.chat.completions.parse(
-            model=settings.OPENAI_MODEL,
-            messages=messages,
-            response_format=SummaryResponse,
-            seed=settings.OPENAI_SEED,
-            temperature=settings.OPENAI_TEMPERATURE
-        )
-
-        message = completion.choices[0].message
-        if message.parsed:
-            summary = message.parsed.summary
-            summary.fit_score = fit_score
-
-            self.logging_service.log_prompt_result(
-                prompt_type="summary",
-                prompt_text=prompt,
-                response=message.parsed.dict(),
-                messages=messages
-            )
+        # The relevance depends on the extraction, not on the raw CV
+        cache_key = self._cache_key(
+            "relevance", cv_text, job_title, RelevancePrompt.template, extra=digest)
+        parsed = await self._parse(
+            "relevance", prompt, messages, RelevanceResponse, session_id, cache_key,
+            metadata={"extraction_session": extraction_session})
+        return parsed.relevance
+
+    async def _generate_summary(self, cv_text: str, job_title: str,
+                                evaluation: CompleteEvaluation,
+                                fit_score: float,
+                                session_id: str,
+                                include_cv: Optional[bool] = None):
+        """
+        Generate the summary from a compact digest of the prior analysis.
 
-            return summary
+        include_cv (default settings.SUMMARY_INCLUDE_CV) controls whether the
+        raw CV is sent along with the digest. The estimated size of the
+        former repr-based payload and of the one actually sent are logged
+        with the summary result to track the reduction.
+        """
+        if include_cv is None:
+            include_cv = settings.SUMMARY_INCLUDE_CV
+        prompt = SummaryPrompt.format(job_title=job_title)
+        digest = evaluation.analysis_digest(fit_score)
+        cv_analysis_text = f"Análisis previo (JSON):\n{digest}"
+        if include_cv and self.prompt_layout == "cv_first":
+            # Same leading CV block as the section calls
+            messages = self._section_messages(prompt, cv_text) + [
+                {"role": "user", "content": cv_analysis_text}
+            ]
         else:
-            raise ValueError(
-                f"Failed to parse summary response: {message.refusal}")
+            if include_cv:
+                cv_analysis_text = f"{CVPrompt.format(cv_text=cv_text)}\n\n{cv_analysis_text}"
+            messages = [
+                {"role": "system", "content": prompt},
+                {"role": "user", "content": cv_analysis_text}
+            ]
+
+        # Size of the verbose payload this digest replaces, for comparison
+        legacy_text = (
+            f"{CVPrompt.format(cv_text=cv_text)}\n\n"
+            f"Análisis previo:\n"
+            f"Experiencias: {evaluation.experiences}\n"
+            f"Habilidades: {evaluation.skills}\n"
+            f"Educación: {evaluation.education}\n"
+            f"Puntuación calculada: {fit_score}"
+        )
+        payload = {
+            "include_cv": include_cv,
+            "legacy_tokens": estimate_tokens(legacy_text),
+            "digest_tokens": estimate_tokens(digest),
+            "payload_tokens": estimate_message_tokens(
+                [m for m in messages if m["role"] == "user"]),
+        }
+
+        # The summary also depends on the prior analysis and score
+        cache_key = self._cache_key(
+            "summary", cv_text, job_title, SummaryPrompt.template,
+            extra=cv_analysis_text)
+        def set_fit_score(parsed: SummaryResponse):
+            # The calculated score replaces the one the model wrote
+            parsed.summary.fit_score = fit_score
+
+        parsed = await self._parse(
+            "summary", prompt, messages, SummaryResponse, session_id, cache_key,
+            metadata={"summary_payload": payload},
+            stats_label=f"call:summary:{'cv+digest' if include_cv else 'digest'}",
+            prepare=set_fit_score)
+        return parsed.summary
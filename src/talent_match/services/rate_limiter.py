@@ -0,0 +1,332 @@
+import asyncio
+import math
+import random
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional
+
+import openai
+from pydantic import ValidationError
+
+from talent_match.config.settings import get_settings
+
+settings = get_settings()
+
+
+class RetryableError(Exception):
+    """A response that should be retried (e.g. a structured-output refusal)"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) for budgeting"""
+    return max(1, math.ceil(len(text) / 4))
+
+
+def estimate_message_tokens(messages: List[Dict[str, str]]) -> int:
+    # A few tokens of per-message overhead on top of the content
+    return sum(estimate_tokens(m.get("content") or "") + 4 for m in messages)
+
+
+def _parse_duration(value: Optional[str]) -> Optional[float]:
+    """Parse rate limit reset values such as '1s', '6m0s', '250ms' or '2'"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    total = 0.0
+    matched = False
+    for amount, unit in re.findall(r"([\d.]+)(ms|s|m|h)", value):
+        matched = True
+        total += float(amount) * {"ms": 0.001, "s": 1, "m": 60, "h": 3600}[unit]
+    return total if matched else None
+
+
+class TokenBucket:
+    """
+    Token bucket allowing debt: a reservation always succeeds and returns
+    how long the caller must wait before its share is actually available
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.tokens = per_minute
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        self._refill(now)
+        self.tokens -= amount
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def refund(self, amount: float, now: float):
+        self._refill(now)
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    def resize(self, per_minute: float, now: float):
+        self._refill(now)
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.tokens = min(self.tokens, per_minute)
+
+
+class RequestScheduler:
+    """
+    Shared scheduler for model calls against one API key.
+
+    Requests/min and tokens/min are enforced with token buckets, the number
+    of requests in flight follows AIMD (additive increase on success,
+    multiplicative decrease on 429s or when the rate limit headers show the
+    budget running out), and failed attempts are retried with jittered
+    exponential backoff inside a per-call deadline.
+
+    State is guarded by a thread lock and waiters are woken on their own
+    loop, so one scheduler can be shared by every event loop in the process.
+    """
+
+    def __init__(self,
+                 requests_per_minute: float = settings.RATE_LIMIT_RPM,
+                 tokens_per_minute: float = settings.RATE_LIMIT_TPM,
+                 max_concurrency: int = settings.MAX_CONCURRENT_REQUESTS,
+                 initial_concurrency: int = settings.INITIAL_CONCURRENT_REQUESTS):
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max_concurrency
+        self.concurrency_limit = float(min(initial_concurrency, max_concurrency))
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._waiters: deque = deque()
+        self._last_decrease = 0.0
+        self._stats = {
+            "calls": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "timeouts": 0,
+            "failures": 0,
+        }
+
+    # Concurrency (AIMD)
+
+    async def _acquire_slot(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if not self._waiters and self._in_flight < int(self.concurrency_limit):
+                self._in_flight += 1
+                return
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    # The slot was granted while we were being cancelled
+                    self._release_locked()
+            raise
+
+    def _release_locked(self):
+        self._in_flight -= 1
+        self._wake_locked()
+
+    def _wake_locked(self):
+        while self._waiters and self._in_flight < int(self.concurrency_limit):
+            loop, future = self._waiters.popleft()
+            self._in_flight += 1
+            loop.call_soon_threadsafe(_resolve, future)
+
+    def _on_success_locked(self):
+        self.concurrency_limit = min(
+            self.max_concurrency,
+            self.concurrency_limit + 1.0 / max(self.concurrency_limit, 1.0)
+        )
+
+    def _decrease_locked(self, factor: float, now: float):
+        # At most one decrease per second: a burst of 429s from requests
+        # that were already in flight is a single congestion signal
+        if now - self._last_decrease < 1.0:
+            return
+        self._last_decrease = now
+        self.concurrency_limit = max(1.0, self.concurrency_limit * factor)
+
+    def _observe_headers(self, headers: Optional[Mapping[str, str]], now: float):
+        """Align the buckets and the concurrency limit with the provider's view"""
+        if not headers:
+            return
+        with self._lock:
+            for kind, bucket in (("requests", self.request_bucket),
+                                 ("tokens", self.token_bucket)):
+                limit = headers.get(f"x-ratelimit-limit-{kind}")
+                remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+                try:
+                    limit = float(limit) if limit else None
+                    remaining = float(remaining) if remaining else None
+                except ValueError:
+                    continue
+                if limit and limit != bucket.capacity:
+                    bucket.resize(limit, now)
+                if limit and remaining is not None:
+                    bucket.tokens = min(bucket.tokens, remaining)
+                    if remaining < limit * settings.RATE_LIMIT_LOW_WATERMARK:
+                        self._decrease_locked(0.75, now)
+
+    # Calls
+
+    async def call(self,
+                   request: Callable[[], Awaitable[Any]],
+                   estimated_tokens: int,
+                   validate: Optional[Callable[[Any], None]] = None,
+                   deadline: float = settings.REQUEST_DEADLINE,
+                   attempt_timeout: float = settings.REQUEST_TIMEOUT,
+                   max_retries: int = settings.MAX_RETRIES) -> Any:
+        """
+        Run a model call under the rate limits, retrying transient failures
+
+        Args:
+            request: Coroutine factory returning a raw response (an object
+                with `headers` and `parse()`, as given by `with_raw_response`)
+            estimated_tokens: Expected prompt + completion tokens
+            validate: Optional check on the parsed result; raise
+                RetryableError to retry the call
+            deadline: Seconds the whole call, retries included, may take
+            attempt_timeout: Seconds a single attempt may take
+            max_retries: Maximum number of retries after the first attempt
+
+        Returns:
+            The parsed completion
+        """
+        loop = asyncio.get_running_loop()
+        give_up_at = loop.time() + deadline
+        attempt = 0
+
+        while True:
+            retry_after = None
+            try:
+                return await self._attempt(
+                    request, estimated_tokens, validate,
+                    min(attempt_timeout, give_up_at - loop.time())
+                )
+            except openai.RateLimitError as e:
+                if _error_code(e) == "insufficient_quota":
+                    raise
+                with self._lock:
+                    self._stats["rate_limited"] += 1
+                    self._decrease_locked(0.5, time.monotonic())
+                retry_after = _retry_after(e.response.headers)
+                error = e
+            except (TimeoutError, openai.APITimeoutError) as e:
+                with self._lock:
+                    self._stats["timeouts"] += 1
+                error = e
+            except (openai.APIConnectionError, openai.InternalServerError,
+                    RetryableError, ValidationError) as e:
+                # ValidationError: the model returned data our models reject
+                # (e.g. malformed dates)
+                error = e
+
+            delay = min(
+                settings.RETRY_MAX_DELAY,
+                settings.RETRY_BASE_DELAY * (2 ** attempt)
+            )
+            delay = random.uniform(0, delay)
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+
+            if attempt >= max_retries or loop.time() + delay >= give_up_at:
+                with self._lock:
+                    self._stats["failures"] += 1
+                raise error
+
+            attempt += 1
+            with self._lock:
+                self._stats["retries"] += 1
+            await asyncio.sleep(delay)
+
+    async def _attempt(self, request, estimated_tokens, validate, timeout):
+        if timeout <= 0:
+            raise TimeoutError("Request deadline exceeded")
+
+        now = time.monotonic()
+        with self._lock:
+            wait = max(
+                self.request_bucket.reserve(1, now),
+                self.token_bucket.reserve(estimated_tokens, now)
+            )
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        await self._acquire_slot()
+        try:
+            async with asyncio.timeout(timeout):
+                raw = await request()
+            now = time.monotonic()
+            self._observe_headers(getattr(raw, "headers", None), now)
+            completion = raw.parse()
+
+            usage = getattr(completion, "usage", None)
+            with self._lock:
+                self._stats["calls"] += 1
+                self._on_success_locked()
+                if usage is not None and usage.total_tokens:
+                    # Settle the estimate against the real usage
+                    self.token_bucket.refund(estimated_tokens - usage.total_tokens, now)
+
+            if validate is not None:
+                validate(completion)
+            return completion
+        finally:
+            with self._lock:
+                self._release_locked()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "in_flight": self._in_flight,
+                "waiting": len(self._waiters),
+                "concurrency_limit": round(self.concurrency_limit, 2),
+            }
+
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+def _error_code(error: openai.APIStatusError) -> Optional[str]:
+    body = error.body if isinstance(error.body, dict) else {}
+    return body.get("code") or getattr(error, "code", None)
+
+
+def _retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    if not headers:
+        return None
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+    return _parse_duration(headers.get("retry-after"))
+
+
+_schedulers: Dict[str, RequestScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_request_scheduler(api_key: str) -> RequestScheduler:
+    """Return the process-wide scheduler for an API key"""
+    with _schedulers_lock:
+        scheduler = _schedulers.get(api_key)
+        if scheduler is None:
+            scheduler = _schedulers[api_key] = RequestScheduler()
+        return scheduler
@@ -0,0 +1,212 @@
+import json
+import os
+from collections import defaultdict
+from pathlib import Path
+from statistics import mean
+from typing import Any, Dict, Iterator, List, Optional
+
+from pydantic import ValidationError
+
+from talent_match.config.settings import Settings, get_settings
+from talent_match.models.evaluation import CompleteEvaluation
+from talent_match.services.batch_scoring import CandidateBatch
+from talent_match.services.evaluation_store import EvaluationStore
+from talent_match.services.log_archive import get_log_archive
+
+settings = get_settings()
+
+
+def load_settings_profile(path: Optional[str] = None) -> Settings:
+    """
+    Build a settings profile for re-scoring
+
+    Args:
+        path: JSON file with setting overrides (e.g. {"EXPERIENCE_WEIGHT": 0.5})
+            or a .env-style file. None returns the active settings.
+
+    Returns:
+        Validated Settings instance
+    """
+    if path is None:
+        return settings
+    if path.endswith(".json"):
+        with open(path, 'r', encoding='utf-8') as f:
+            overrides = json.load(f)
+        unknown = set(overrides) - set(Settings.model_fields)
+        if unknown:
+            raise ValueError(f"Unknown settings in {path}: {', '.join(sorted(unknown))}")
+        return Settings(**{**settings.model_dump(), **overrides})
+    return Settings(_env_file=path)
+
+
+class RescoringService:
+    """
+    Recomputes scores of logged evaluations under a different settings
+    profile, without calling the model
+    """
+
+    def __init__(self, base_log_dir: str = "logs/cv_analysis",
+                 store: Optional[EvaluationStore] = None):
+        """
+        Args:
+            base_log_dir: Session log directory
+            store: Read the evaluations from this store instead of walking
+                the log directory
+        """
+        self.base_log_dir = Path(base_log_dir)
+        self.store = store
+
+    def iter_evaluations(self) -> Iterator[Dict[str, Any]]:
+        """
+        Stream every logged final evaluation
+
+        Yields:
+            Dicts with session_id, job_title, timestamp and the parsed evaluation
+        """
+        if self.store is not None:
+            for record in self.store.iter_final_evaluations():
+                try:
+                    record["evaluation"] = CompleteEvaluation.model_validate(record["evaluation"])
+                except ValidationError:
+                    continue
+                yield record
+            return
+
+        with os.scandir(self.base_log_dir) as entries:
+            for entry in entries:
+                # Skip files, the blob directory and the archive
+                if not entry.is_dir() or entry.name.startswith("."):
+                    continue
+                session_dir = Path(entry.path)
+                final_path = session_dir / "final_evaluation.json"
+                try:
+                    with open(final_path, 'r', encoding='utf-8') as f:
+                        evaluation = CompleteEvaluation.model_validate_json(f.read())
+                except (FileNotFoundError, ValidationError):
+                    # Unfinished or unreadable session
+                    continue
+
+                job_title, timestamp = None, None
+                try:
+                    with open(session_dir / "session_info.json", 'r', encoding='utf-8') as f:
+                        info = json.load(f)
+                    job_title, timestamp = info.get("job_title"), info.get("timestamp")
+                except (FileNotFoundError, json.JSONDecodeError):
+                    pass
+
+                yield {
+                    "session_id": entry.name,
+                    "job_title": job_title,
+                    "timestamp": timestamp,
+                    "evaluation": evaluation,
+                }
+
+        # Sessions compacted into the archive (see log_retention)
+        for session_id, files in get_log_archive(os.path.abspath(self.base_log_dir)).iter_sessions():
+            try:
+                evaluation = CompleteEvaluation.model_validate_json(files["final_evaluation.json"])
+            except (KeyError, ValidationError):
+                continue
+            try:
+                info = json.loads(files["session_info.json"])
+            except (KeyError, json.JSONDecodeError):
+                info = {}
+            yield {
+                "session_id": session_id,
+                "job_title": info.get("job_title"),
+                "timestamp": info.get("timestamp"),
+                "evaluation": evaluation,
+            }
+
+    def rescore(self, profile: Settings,
+                baseline: Optional[Settings] = None,
+                chunk_size: int = 2000) -> Iterator[Dict[str, Any]]:
+        """
+        Score every logged evaluation under a baseline and a new profile
+
+        Evaluations are packed in chunks and scored with the vectorized
+        kernel, which gives the same values as the scalar calculators.
+
+        Args:
+            profile: Settings profile to evaluate
+            baseline: Profile to compare against (defaults to active settings)
+            chunk_size: Number of evaluations scored per vectorized pass
+
+        Yields:
+            One comparison row per session
+        """
+        baseline = baseline or settings
+        chunk = []
+        for record in self.iter_evaluations():
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                yield from self._rescore_chunk(chunk, profile, baseline)
+                chunk = []
+        if chunk:
+            yield from self._rescore_chunk(chunk, profile, baseline)
+
+    def _rescore_chunk(self, records: List[Dict[str, Any]], profile: Settings,
+                       baseline: Settings) -> Iterator[Dict[str, Any]]:
+        batch = CandidateBatch.from_evaluations([r["evaluation"] for r in records])
+        before = batch.score(baseline)
+        after = batch.score(profile)
+        for index, record in enumerate(records):
+            row_before = {key: float(values[index]) for key, values in before.items()}
+            row_after = {key: float(values[index]) for key, values in after.items()}
+            yield {
+                "session_id": record["session_id"],
+                "job_title": record["job_title"],
+                "timestamp": record["timestamp"],
+                "stored_fit_score": record["evaluation"].summary.fit_score,
+                "baseline": row_before,
+                "profile": row_after,
+                "delta": round(row_after["final"] - row_before["final"], 2),
+            }
+
+    def compare(self, profile: Settings,
+                baseline: Optional[Settings] = None) -> Dict[str, Any]:
+        """
+        Build a comparison report between two settings profiles
+
+        Returns:
+            Dict with aggregate statistics, per-job ranking changes and rows
+        """
+        rows = list(self.rescore(profile, baseline))
+        deltas = [row["delta"] for row in rows]
+
+        by_job: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for row in rows:
+            by_job[row["job_title"] or ""].append(row)
+
+        jobs = {}
+        for job_title, job_rows in by_job.items():
+            baseline_rank = self._ranks(job_rows, "baseline")
+            profile_rank = self._ranks(job_rows, "profile")
+            moved = 0
+            for row in job_rows:
+                row["baseline_rank"] = baseline_rank[row["session_id"]]
+                row["profile_rank"] = profile_rank[row["session_id"]]
+                moved += row["baseline_rank"] != row["profile_rank"]
+            jobs[job_title] = {
+                "sessions": len(job_rows),
+                "mean_delta": round(mean(r["delta"] for r in job_rows), 2),
+                "rank_changes": moved,
+            }
+
+        return {
+            "summary": {
+                "sessions": len(rows),
+                "mean_delta": round(mean(deltas), 2) if deltas else 0.0,
+                "mean_abs_delta": round(mean(abs(d) for d in deltas), 2) if deltas else 0.0,
+                "max_increase": max(deltas, default=0.0),
+                "max_decrease": min(deltas, default=0.0),
+                "changed": sum(1 for d in deltas if d != 0),
+            },
+            "jobs": jobs,
+            "rows": rows,
+        }
+
+    @staticmethod
+    def _ranks(rows: List[Dict[str, Any]], key: str) -> Dict[str, int]:
+        ordered = sorted(rows, key=lambda r: (-r[key]["final"], r["session_id"]))
+        return {row["session_id"]: rank for rank, row in enumerate(ordered, start=1)}
@@ -0,0 +1,263 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Type, TypeVar
+
+from pydantic import BaseModel
+
+from talent_match.config.settings import get_settings
+
+settings = get_settings()
+
+T = TypeVar("T", bound=BaseModel)
+
+
+def normalize_cv_text(cv_text: str) -> str:
+    """
+    Normalize CV text so cosmetic differences (unicode forms, trailing
+    spaces, repeated blank lines) map to the same cache key
+    """
+    text = unicodedata.normalize("NFC", cv_text)
+    lines = [re.sub(r"[ \t]+", " ", line).strip() for line in text.splitlines()]
+    text = "\n".join(lines)
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def make_cache_key(section: str,
+                   cv_text: str,
+                   job_title: str,
+                   prompt_template: str,
+                   model: str = None,
+                   seed: int = None,
+                   temperature: float = None,
+                   extra: Any = None) -> str:
+    """
+    Build a content-addressed key for a section result
+
+    Args:
+        section: Section name (experience, skills, education, summary)
+        cv_text: Raw CV text (normalized before hashing)
+        job_title: Job title the CV is evaluated against
+        prompt_template: Template text of every prompt involved in the call
+        model: Model name (defaults to settings)
+        seed: Sampling seed (defaults to settings)
+        temperature: Sampling temperature (defaults to settings)
+        extra: Any additional JSON-serializable input of the call
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    material = {
+        "section": section,
+        "cv_text": normalize_cv_text(cv_text),
+        "job_title": job_title.strip().casefold(),
+        "prompt_template": prompt_template,
+        "model": model or settings.OPENAI_MODEL,
+        "seed": settings.OPENAI_SEED if seed is None else seed,
+        "temperature": settings.OPENAI_TEMPERATURE if temperature is None else temperature,
+        "extra": extra,
+    }
+    encoded = json.dumps(material, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier cache for parsed model responses: an in-memory LRU in front
+    of a persistent SQLite store, with TTL and size-based eviction
+    """
+
+    def __init__(self,
+                 path: str = settings.RESULT_CACHE_PATH,
+                 memory_items: int = settings.RESULT_CACHE_MEMORY_ITEMS,
+                 max_bytes: int = settings.RESULT_CACHE_MAX_BYTES,
+                 ttl_seconds: float = settings.RESULT_CACHE_TTL_SECONDS):
+        """
+        Initialize the cache
+
+        Args:
+            path: SQLite file for the persistent tier
+            memory_items: Maximum number of entries kept in memory
+            max_bytes: Maximum total payload size of the persistent tier
+            ttl_seconds: Entry lifetime; 0 or less disables expiry
+        """
+        self.path = Path(path)
+        self.memory_items = memory_items
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0,
+            "expired": 0,
+        }
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_results_accessed ON results (accessed_at)")
+        self._db.commit()
+        self._disk_bytes = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    def get(self, key: str, model: Type[T]) -> Optional[T]:
+        """
+        Look up a cached response
+
+        Args:
+            key: Cache key from make_cache_key
+            model: Response model to validate the payload into
+
+        Returns:
+            A fresh model instance, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, payload = entry
+                if self._expired(created_at, now):
+                    del self._memory[key]
+                    self._stats["expired"] += 1
+                else:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return model.model_validate_json(payload)
+
+            row = self._db.execute(
+                "SELECT payload, created_at FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+
+            payload, created_at = row
+            if self._expired(created_at, now):
+                self._delete_locked(key)
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+
+            self._db.execute(
+                "UPDATE results SET accessed_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self._remember_locked(key, created_at, payload)
+            self._stats["disk_hits"] += 1
+        return model.model_validate_json(payload)
+
+    def set(self, key: str, value: BaseModel):
+        """Store a response in both tiers"""
+        payload = value.model_dump_json()
+        size = len(payload.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            self._remember_locked(key, now, payload)
+            old = self._db.execute(
+                "SELECT size FROM results WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (key, payload, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, payload, size, now, now)
+            )
+            self._disk_bytes += size - (old[0] if old else 0)
+            self._stats["writes"] += 1
+            self._enforce_size_locked()
+            self._db.commit()
+
+    def _remember_locked(self, key: str, created_at: float, payload: str):
+        self._memory[key] = (created_at, payload)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _delete_locked(self, key: str):
+        row = self._db.execute(
+            "SELECT size FROM results WHERE key = ?", (key,)).fetchone()
+        if row:
+            self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+            self._db.commit()
+            self._disk_bytes -= row[0]
+
+    def _enforce_size_locked(self):
+        """Evict least recently used entries until the store fits max_bytes"""
+        if self._disk_bytes <= self.max_bytes:
+            return
+        rows = self._db.execute(
+            "SELECT key, size FROM results ORDER BY accessed_at ASC").fetchall()
+        for key, size in rows:
+            if self._disk_bytes <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+            self._memory.pop(key, None)
+            self._disk_bytes -= size
+            self._stats["evictions"] += 1
+
+    def purge_expired(self) -> int:
+        """Delete every expired entry; returns the number removed"""
+        if self.ttl_seconds <= 0:
+            return 0
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            for key in [k for k, (created, _) in self._memory.items() if created < cutoff]:
+                del self._memory[key]
+            removed = self._db.execute(
+                "DELETE FROM results WHERE created_at < ?", (cutoff,)).rowcount
+            self._db.commit()
+            self._disk_bytes = self._db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            self._stats["expired"] += removed
+        return removed
+
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._memory.clear()
+            self._db.execute("DELETE FROM results")
+            self._db.commit()
+            self._disk_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current tier sizes"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_items"] = len(self._memory)
+            stats["disk_bytes"] = self._disk_bytes
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (
+            (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        )
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+@lru_cache()
+def get_result_cache() -> ResultCache:
+    return ResultCache()
@@ -0,0 +1,257 @@
+import gzip
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from talent_match.config.settings import get_settings
+from talent_match.services.log_writer import encode_json, write_file
+
+settings = get_settings()
+
+INDEX_VERSION = 1
+
+# Words too common in CVs and job titles to say anything about a match
+STOPWORDS = frozenset("""
+a al and as at con de del el en for from in la las los o of on or para por
+the to un una y with
+""".split())
+
+# Job title and skill spellings that mean the same thing; extend or replace
+# them with a JSON file of groups (see load_synonyms)
+DEFAULT_SYNONYMS: List[List[str]] = [
+    ["javascript", "js"],
+    ["typescript", "ts"],
+    ["kubernetes", "k8s"],
+    ["postgresql", "postgres"],
+    ["machine learning", "ml", "aprendizaje automatico"],
+    ["artificial intelligence", "ai", "inteligencia artificial", "ia"],
+    ["deep learning", "aprendizaje profundo"],
+    ["frontend", "front-end", "front end"],
+    ["backend", "back-end", "back end"],
+    ["fullstack", "full-stack", "full stack"],
+    ["developer", "engineer", "programmer", "desarrollador", "programador", "ingeniero"],
+    ["data scientist", "cientifico de datos"],
+    ["data analyst", "analista de datos"],
+    ["devops", "sre", "site reliability engineer"],
+    ["ci/cd", "continuous integration", "integracion continua"],
+]
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[./][a-z0-9+#]+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into index terms
+
+    Accents and case are dropped, so "Diseño" and "diseno" match, and
+    technology names keep their symbols ("c++", "c#", "node.js", "ci/cd").
+    """
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c)).casefold()
+    return [token for token in _TOKEN_PATTERN.findall(text) if token not in STOPWORDS]
+
+
+class SynonymExpander:
+    """Expands a query with the synonyms of the terms and phrases in it"""
+
+    def __init__(self, groups: Iterable[Iterable[str]] = (), weight: float = 0.5):
+        """
+        Args:
+            groups: Groups of equivalent terms or phrases
+            weight: Query weight of an added synonym (original terms weigh 1)
+        """
+        self.weight = weight
+        self._synonyms: Dict[Tuple[str, ...], Set[Tuple[str, ...]]] = {}
+        for group in groups:
+            phrases = {tuple(tokenize(phrase)) for phrase in group} - {()}
+            for phrase in phrases:
+                self._synonyms.setdefault(phrase, set()).update(phrases - {phrase})
+        self._max_length = max((len(phrase) for phrase in self._synonyms), default=0)
+
+    def expand(self, tokens: List[str]) -> Dict[str, float]:
+        """Query term weights: the tokens themselves and their synonyms"""
+        weights = {token: 1.0 for token in tokens}
+        for length in range(1, self._max_length + 1):
+            for start in range(len(tokens) - length + 1):
+                for synonym in self._synonyms.get(tuple(tokens[start:start + length]), ()):
+                    for token in synonym:
+                        weights[token] = max(weights.get(token, 0.0), self.weight)
+        return weights
+
+
+def load_synonyms(path: Optional[str] = settings.SCREENING_SYNONYMS_PATH,
+                  weight: float = settings.SCREENING_SYNONYM_WEIGHT) -> SynonymExpander:
+    """
+    Synonym expander from a JSON file, or the built-in groups
+
+    Args:
+        path: JSON list of groups (["kubernetes", "k8s"]) or object mapping
+            a term to its synonyms ({"kubernetes": ["k8s"]}); None uses
+            DEFAULT_SYNONYMS
+        weight: Query weight of an added synonym
+    """
+    if path is None:
+        return SynonymExpander(DEFAULT_SYNONYMS, weight)
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = [[term, *synonyms] for term, synonyms in data.items()]
+    return SynonymExpander(data, weight)
+
+
+class ScreeningIndex:
+    """
+    Inverted index of CV texts ranked with BM25
+
+    Used to shortlist the CVs worth a model evaluation for a job title.
+    Documents can be added and removed one by one; save() and load() keep
+    the term frequencies on disk, not the CV texts.
+    """
+
+    def __init__(self, k1: float = settings.SCREENING_BM25_K1,
+                 b: float = settings.SCREENING_BM25_B):
+        """
+        Args:
+            k1: Term frequency saturation
+            b: Document length normalization (0: none, 1: full)
+        """
+        self.k1 = k1
+        self.b = b
+        self._docs: Dict[str, Dict[str, int]] = {}
+        self._hashes: Dict[str, str] = {}
+        self._lengths: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._docs
+
+    def add(self, doc_id: str, text: str) -> bool:
+        """
+        Index a CV, replacing any previous text with the same id
+
+        Returns:
+            False if the same text was already indexed under this id
+        """
+        content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        if self._hashes.get(doc_id) == content_hash:
+            return False
+        terms = dict(Counter(tokenize(text)))
+        with self._lock:
+            self._remove(doc_id)
+            self._insert(doc_id, terms, content_hash)
+        return True
+
+    def remove(self, doc_id: str) -> bool:
+        """Drop a CV from the index; False if it was not indexed"""
+        with self._lock:
+            return self._remove(doc_id)
+
+    def _insert(self, doc_id: str, terms: Dict[str, int], content_hash: str):
+        self._docs[doc_id] = terms
+        self._hashes[doc_id] = content_hash
+        self._lengths[doc_id] = length = sum(terms.values())
+        self._total_length += length
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+
+    def _remove(self, doc_id: str) -> bool:
+        terms = self._docs.pop(doc_id, None)
+        if terms is None:
+            return False
+        del self._hashes[doc_id]
+        self._total_length -= self._lengths.pop(doc_id)
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+        return True
+
+    def search(self, query: str,
+               top_k: Optional[int] = None,
+               min_score: Optional[float] = None,
+               synonyms: Optional[SynonymExpander] = None,
+               candidates: Optional[Set[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Rank the indexed CVs for a query (usually a job title)
+
+        CVs sharing no term with the query are never returned.
+
+        Args:
+            query: Job title or description
+            top_k: Keep at most this many CVs
+            min_score: Keep only CVs with at least this BM25 score
+            synonyms: Expand the query with these synonyms
+            candidates: Only rank these document ids
+
+        Returns:
+            (doc_id, score) from best to worst match
+        """
+        tokens = tokenize(query)
+        weights = synonyms.expand(tokens) if synonyms is not None else dict.fromkeys(tokens, 1.0)
+
+        scores: Dict[str, float] = {}
+        with self._lock:
+            count = len(self._docs)
+            if not count:
+                return []
+            average_length = self._total_length / count or 1.0
+            for term, weight in weights.items():
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, frequency in postings.items():
+                    if candidates is not None and doc_id not in candidates:
+                        continue
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / average_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + (
+                        weight * idf * frequency * (self.k1 + 1) / (frequency + norm))
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        if min_score is not None:
+            ranked = [(doc_id, score) for doc_id, score in ranked if score >= min_score]
+        if top_k is not None:
+            ranked = ranked[:top_k]
+        return [(doc_id, round(score, 4)) for doc_id, score in ranked]
+
+    def save(self, path: str):
+        """Write the index atomically as gzipped JSON"""
+        with self._lock:
+            data = {
+                "version": INDEX_VERSION,
+                "k1": self.k1,
+                "b": self.b,
+                "docs": {
+                    doc_id: {"hash": self._hashes[doc_id], "terms": terms}
+                    for doc_id, terms in self._docs.items()
+                },
+            }
+        write_file(Path(path), gzip.compress(encode_json(data), compresslevel=6, mtime=0))
+
+    @classmethod
+    def load(cls, path: str) -> "ScreeningIndex":
+        """Index saved with save(), or an empty one if the file does not exist"""
+        if not os.path.exists(path):
+            return cls()
+        with open(path, "rb") as f:
+            data = json.loads(gzip.decompress(f.read()))
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported screening index version in {path}")
+        index = cls(k1=data["k1"], b=data["b"])
+        for doc_id, doc in data["docs"].items():
+            index._insert(doc_id, doc["terms"], doc["hash"])
+        return index
+
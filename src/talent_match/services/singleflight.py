@@ -0,0 +1,81 @@
+import asyncio
+import threading
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+class _Flight:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one execution.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it is in flight wait for the same task and receive its result or
+    exception. The task is only cancelled when every waiter has been
+    cancelled. Flights are tracked per event loop, so one instance can be
+    shared by every loop in the process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Tuple[asyncio.AbstractEventLoop, str], _Flight] = {}
+        self._stats = {
+            "executions": 0,
+            "coalesced": 0,
+        }
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run `fn` unless a call with the same key is already in flight
+
+        Args:
+            key: Identity of the work (equal keys must give equal results)
+            fn: Coroutine factory doing the work
+
+        Returns:
+            (result, shared): shared is True when the result came from a
+            call started by another caller
+        """
+        flight_key = (asyncio.get_running_loop(), key)
+        with self._lock:
+            flight = self._flights.get(flight_key)
+            shared = flight is not None
+            if shared:
+                self._stats["coalesced"] += 1
+            else:
+                flight = self._flights[flight_key] = _Flight(asyncio.ensure_future(fn()))
+                flight.task.add_done_callback(
+                    lambda _: self._forget(flight_key, flight))
+                self._stats["executions"] += 1
+            flight.waiters += 1
+
+        try:
+            return await asyncio.shield(flight.task), shared
+        except asyncio.CancelledError:
+            if not flight.task.done():
+                with self._lock:
+                    flight.waiters -= 1
+                    abandoned = flight.waiters == 0
+                if abandoned:
+                    flight.task.cancel()
+            raise
+
+    def _forget(self, flight_key, flight: _Flight):
+        with self._lock:
+            if self._flights.get(flight_key) is flight:
+                del self._flights[flight_key]
+
+    def stats(self) -> Dict[str, int]:
+        """Executions started, calls served by another call's execution, in flight"""
+        with self._lock:
+            return {**self._stats, "in_flight": len(self._flights)}
+
+
+@lru_cache()
+def get_singleflight() -> SingleFlight:
+    return SingleFlight()
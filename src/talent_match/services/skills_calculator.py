@@ -1,6 +1,6 @@
 from typing import List
 
-from talent_match.config.settings import get_settings
+from talent_match.config.settings import Settings, get_settings
 from talent_match.models.evaluation import SkillEvaluation
 from talent_match.models.types import RelevanceLevel
 
@@ -24,28 +24,60 @@ class SkillsCalculator:
         RelevanceLevel.NONE: settings.RELEVANCE_NONE / 100
     }
     
+    @staticmethod
+    def level_scores(config: Settings) -> dict:
+        """Puntuación base por nivel según un perfil de configuración"""
+        return {
+            "BASIC": config.SKILL_BASIC_SCORE,
+            "INTERMEDIATE": config.SKILL_INTERMEDIATE_SCORE,
+            "ADVANCED": config.SKILL_ADVANCED_SCORE
+        }
+    
+    @staticmethod
+    def relevance_multipliers(config: Settings) -> dict:
+        """Multiplicador por relevancia según un perfil de configuración"""
+        return {
+            RelevanceLevel.VERY_HIGH: config.RELEVANCE_VERY_HIGH / 100,
+            RelevanceLevel.HIGH: config.RELEVANCE_HIGH / 100,
+            RelevanceLevel.MEDIUM: config.RELEVANCE_MEDIUM / 100,
+            RelevanceLevel.LOW: config.RELEVANCE_LOW / 100,
+            RelevanceLevel.VERY_LOW: config.RELEVANCE_VERY_LOW / 100,
+            RelevanceLevel.NONE: config.RELEVANCE_NONE / 100
+        }
+    
     @classmethod
-    def calculate_skills_score(cls, skills: List[SkillEvaluation]) -> float:
+    def calculate_skills_score(cls, skills: List[SkillEvaluation],
+                               config: Settings = None) -> float:
         """
         Calcula la puntuación de habilidades considerando un mínimo necesario.
         
         Args:
             skills: Lista de habilidades evaluadas
+            config: Perfil de configuración (por defecto, la configuración activa)
 
         Returns:
             float: Puntuación entre 0 y 100
         """
         if not skills:
             return 0.0
+        
+        if config is None:
+            min_skills = cls.MIN_SKILLS
+            level_scores = cls.LEVEL_SCORES
+            relevance_multipliers = cls.RELEVANCE_MULTIPLIERS
+        else:
+            min_skills = config.MIN_SKILLS
+            level_scores = cls.level_scores(config)
+            relevance_multipliers = cls.relevance_multipliers(config)
             
         # Factor de penalización por número insuficiente de skills
-        skills_factor = min(len(skills) / cls.MIN_SKILLS, 1.0)
+        skills_factor = min(len(skills) / min_skills, 1.0)
         
         # Calcular puntuación para cada skill
         skill_scores = []
         for skill in skills:
-            base_score = cls.LEVEL_SCORES[skill.level]
-            relevance_multiplier = cls.RELEVANCE_MULTIPLIERS[skill.relevance]
+            base_score = level_scores[skill.level]
+            relevance_multiplier = relevance_multipliers[skill.relevance]
             skill_scores.append(base_score * relevance_multiplier)
         
 
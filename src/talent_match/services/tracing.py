@@ -0,0 +1,76 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from talent_match.services.metrics import get_metrics
+
+
+class Trace:
+    """Spans recorded during one evaluation"""
+
+    def __init__(self):
+        self.started_at = datetime.now().isoformat()
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self.spans: List[Dict[str, Any]] = []
+
+    def _new_id(self) -> int:
+        with self._lock:
+            self._next_id += 1
+            return self._next_id
+
+    def _add(self, span: Dict[str, Any]):
+        with self._lock:
+            self.spans.append(span)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span["start"])
+        return {"started_at": self.started_at, "spans": spans}
+
+
+current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[int]] = ContextVar("current_span", default=None)
+
+
+@contextmanager
+def span(stage: str, **attributes: Any):
+    """
+    Time a stage of the pipeline
+
+    The duration is observed in the stage histogram and, when a trace is
+    active, recorded as a span under the enclosing one. Usable around
+    awaits: child tasks inherit the trace and the parent span.
+
+    Yields:
+        The span attributes, which can be extended before it ends
+    """
+    trace = current_trace.get()
+    span_id = trace._new_id() if trace is not None else None
+    parent = _current_span.get()
+    token = _current_span.set(span_id)
+    started = time.perf_counter()
+    status = "ok"
+    try:
+        yield attributes
+    except BaseException as e:
+        status = type(e).__name__
+        raise
+    finally:
+        duration = time.perf_counter() - started
+        _current_span.reset(token)
+        get_metrics().stage_duration.observe(duration, stage=stage)
+        if trace is not None:
+            trace._add({
+                "id": span_id,
+                "parent": parent,
+                "stage": stage,
+                "start": round(started - trace._origin, 6),
+                "duration": round(duration, 6),
+                "status": status,
+                **({"attributes": attributes} if attributes else {}),
+            })
@@ -0,0 +1,91 @@
+import threading
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+# Usage of the model calls made within the current analysis; tasks created
+# by the analysis inherit the same list
+current_call_usage: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar(
+    "current_call_usage", default=None)
+
+
+def usage_to_dict(usage) -> Dict[str, int]:
+    """Flatten an OpenAI usage object into token counts"""
+    if usage is None:
+        return {
+            "prompt_tokens": 0,
+            "cached_tokens": 0,
+            "completion_tokens": 0,
+            "total_tokens": 0,
+        }
+    # Prompt tokens served from the provider's prompt cache
+    details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "prompt_tokens": usage.prompt_tokens or 0,
+        "cached_tokens": getattr(details, "cached_tokens", None) or 0,
+        "completion_tokens": usage.completion_tokens or 0,
+        "total_tokens": usage.total_tokens or 0,
+    }
+
+
+class UsageStats:
+    """Thread-safe accumulators of calls, tokens and latency per label"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def record(self, label: str, latency: float, usage: Dict[str, int],
+               calls: int = 1, cache_hits: int = 0):
+        """
+        Add one observation
+
+        Args:
+            label: Stat bucket (e.g. "call:experience", "extraction:combined")
+            latency: Wall time in seconds
+            usage: Token counts as returned by usage_to_dict
+            calls: Number of model calls in the observation
+            cache_hits: Number of calls served from the result cache
+        """
+        with self._lock:
+            stats = self._stats.setdefault(label, {
+                "count": 0,
+                "calls": 0,
+                "cache_hits": 0,
+                "prompt_tokens": 0,
+                "cached_tokens": 0,
+                "completion_tokens": 0,
+                "total_tokens": 0,
+                "latency_total": 0.0,
+                "latency_max": 0.0,
+            })
+            stats["count"] += 1
+            stats["calls"] += calls
+            stats["cache_hits"] += cache_hits
+            for key, value in usage.items():
+                stats[key] = stats.get(key, 0) + value
+            stats["latency_total"] += latency
+            stats["latency_max"] = max(stats["latency_max"], latency)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Return a copy of the stats with per-observation averages"""
+        with self._lock:
+            snapshot = {label: dict(stats) for label, stats in self._stats.items()}
+        for stats in snapshot.values():
+            count = stats["count"] or 1
+            stats["latency_avg"] = stats["latency_total"] / count
+            stats["prompt_tokens_avg"] = stats["prompt_tokens"] / count
+            stats["cached_ratio"] = (
+                stats["cached_tokens"] / stats["prompt_tokens"]
+                if stats["prompt_tokens"] else 0.0
+            )
+        return snapshot
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+@lru_cache()
+def get_usage_stats() -> UsageStats:
+    return UsageStats()
@@ -1,23 +1,44 @@
-import asyncio
 import json
+import queue
 
 import streamlit as st
 
 from talent_match.config.settings import get_settings
-from talent_match.services.openai_service import OpenAIService
-from talent_match.ui.components.metrics import display_key_metrics
+from talent_match.services.client_registry import get_client_registry
+from talent_match.services.evaluation_service import EvaluationService
+from talent_match.services.openai_service import EvaluationError, OpenAIService
+from talent_match.ui.components.metrics import (
+    display_education_breakdown,
+    display_experience_breakdown,
+    display_score_metrics,
+    display_skills_breakdown,
+)
 from talent_match.ui.components.sections import display_summary_section
 
 settings = get_settings()
 
+SECTION_LOADING_MESSAGES = {
+    "experience": "⏳ Analizando experiencia...",
+    "skills": "⏳ Analizando habilidades...",
+    "education": "⏳ Analizando educación...",
+}
+
 def initialize_session_state():
     if 'api_key' not in st.session_state:
         st.session_state.api_key = settings.OPENAI_API_KEY
 
-async def analyze_cv(cv_text: str, job_title: str, api_key: str):
-    settings.OPENAI_API_KEY = api_key
-    service = OpenAIService()
-    return await service.analyze_cv(cv_text, job_title)
+async def analyze_cv(cv_text: str, job_title: str, api_key: str, session_id=None,
+                     on_progress=None):
+    service = OpenAIService(api_key=api_key)
+    return await service.analyze_cv(
+        cv_text, job_title, session_id=session_id, on_progress=on_progress)
+
+def get_resumable_session(cv_text: str, job_title: str):
+    """Devuelve la sesión fallida previa para el mismo CV y puesto, si existe"""
+    failed = st.session_state.get('failed_session')
+    if failed and failed['cv_text'] == cv_text and failed['job_title'] == job_title:
+        return failed['session_id']
+    return None
 
 def format_output_json(evaluation):
     """
@@ -61,16 +82,94 @@ def display_json_output(evaluation):
         mime="application/json",
     )
 
-def display_evaluation_results(evaluation):
-    st.write("")  
-    st.divider() 
+def create_result_placeholders():
+    """
+    Crea la estructura de resultados con un marcador por etapa del
+    análisis: puntuación, desglose por sección, resumen y JSON.
+    """
+    st.write("")
+    st.divider()
 
     st.title("📊 Evaluación del CV")
-    display_key_metrics(evaluation)
-    display_summary_section(evaluation)
+    placeholders = {"score": st.empty()}
+    placeholders["score"].info("⏳ Calculando puntuación...")
 
-    st.divider()
-    display_json_output(evaluation)
+    tabs = st.tabs([
+        "💼 Desglose Experiencia",
+        "🛠️ Desglose Habilidades",
+        "📚 Desglose Educación"
+    ])
+    for section, tab in zip(SECTION_LOADING_MESSAGES, tabs):
+        with tab:
+            placeholders[section] = st.empty()
+        placeholders[section].info(SECTION_LOADING_MESSAGES[section])
+
+    placeholders["summary"] = st.empty()
+    placeholders["summary"].info("⏳ Generando resumen...")
+    placeholders["output"] = st.empty()
+    return placeholders
+
+def render_progress(placeholders, results, stage, result):
+    """Pinta un resultado parcial en su marcador en cuanto está disponible"""
+    results[stage] = result
+    if stage == "experience":
+        with placeholders[stage].container():
+            display_experience_breakdown(result)
+    elif stage == "skills":
+        with placeholders[stage].container():
+            display_skills_breakdown(result)
+    elif stage == "education":
+        with placeholders[stage].container():
+            display_education_breakdown(result)
+    elif stage == "score":
+        with placeholders[stage].container():
+            display_score_metrics(
+                EvaluationService.calculate_experience_score(results["experience"]),
+                EvaluationService.calculate_skills_score(results["skills"]),
+                EvaluationService.calculate_education_score(results["education"]),
+                result
+            )
+    elif stage == "summary":
+        with placeholders["summary"].container():
+            display_summary_section(result)
+        with placeholders["output"].container():
+            st.divider()
+            display_json_output(result)
+
+def run_progressive_analysis(cv_text: str, job_title: str, api_key: str, session_id=None):
+    """
+    Lanza el análisis en el bucle compartido y pinta cada sección en cuanto
+    termina su llamada, en lugar de esperar a la evaluación completa.
+    """
+    placeholders = create_result_placeholders()
+    events = queue.Queue()
+    future = get_client_registry().submit(
+        analyze_cv(
+            cv_text,
+            job_title,
+            api_key,
+            session_id=session_id,
+            on_progress=lambda stage, result: events.put((stage, result))
+        )
+    )
+
+    results = {}
+    # Los eventos se encolan antes de que termine el análisis
+    while not (future.done() and events.empty()):
+        try:
+            stage, result = events.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        render_progress(placeholders, results, stage, result)
+
+    try:
+        return future.result()
+    except Exception:
+        # Quita los marcadores de las secciones que no llegaron a completarse
+        for stage, placeholder in placeholders.items():
+            if stage not in results and stage != "output":
+                placeholder.empty()
+        raise
 
 def main():
     initialize_session_state()
@@ -110,10 +209,28 @@ def main():
     if evaluate_button:
         try:
             with st.spinner("Evaluando..."):
-                evaluation = asyncio.run(
-                    analyze_cv(cv_text, job_title, st.session_state.api_key)
+                # Run on the registry's shared loop so pooled clients are
+                # reused across reruns and sessions. A previous failed run
+                # for the same input is resumed instead of started over.
+                # Each section is shown as soon as its call finishes.
+                run_progressive_analysis(
+                    cv_text,
+                    job_title,
+                    st.session_state.api_key,
+                    session_id=get_resumable_session(cv_text, job_title)
                 )
-                display_evaluation_results(evaluation)
+                st.session_state.pop('failed_session', None)
+        except EvaluationError as e:
+            st.session_state.failed_session = {
+                'session_id': e.session_id,
+                'cv_text': cv_text,
+                'job_title': job_title
+            }
+            st.error(
+                f"Error durante la evaluación: {str(e)}. "
+                "Vuelve a pulsar «Evaluar CV» para reintentar sin repetir "
+                "las secciones ya completadas."
+            )
         except Exception as e:
             st.error(f"Error durante la evaluación: {str(e)}")
 